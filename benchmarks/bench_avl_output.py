@@ -0,0 +1,39 @@
+"""
+Compara o parser de passada única (avl_output.read_output) com as funções
+get_value/get_clmax nas saídas de exemplo em tests/.
+
+Uso:
+    python benchmarks/bench_avl_output.py
+"""
+import os
+import timeit
+
+from MDO_UNESP.avl_output import read_output
+from MDO_UNESP.avl_runner import get_clmax, get_value
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FT_FILE = os.path.join(ROOT_DIR, 'tests', 'avl_ft.out')
+FS_FILE = os.path.join(ROOT_DIR, 'tests', 'avl_fs.out')
+
+
+def legacy_point():
+    """Leitura de um ponto como era feita em get_aero_coef."""
+    return (get_clmax(FS_FILE), get_value(FT_FILE, 'CLtot'),
+            get_value(FT_FILE, 'CDtot'), get_value(FT_FILE, 'Cmtot'))
+
+
+def single_pass_point():
+    totals, _ = read_output(FT_FILE)
+    _, strips = read_output(FS_FILE)
+    return strips['cl'].max(), totals['CLtot'], totals['CDtot'], totals['Cmtot']
+
+
+def main(number=2000):
+    for name, function in (('get_value x3 + get_clmax', legacy_point),
+                           ('read_output x2', single_pass_point)):
+        seconds = min(timeit.repeat(function, number=number, repeat=5)) / number
+        print(f'{name:<28s} {seconds * 1e6:8.1f} us/ponto')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Compara set_dimensions (fileinput, reescrita linha a linha) com
+ConfigTemplate (modelo interpretado uma vez, uma escrita por projeto) na
+configuração de duas superfícies em tests/marker_config.avl.
+
+Uso:
+    python benchmarks/bench_avl_template.py
+"""
+import os
+import shutil
+import tempfile
+import timeit
+
+from MDO_UNESP.avl_runner import set_dimensions
+from MDO_UNESP.avl_template import ConfigTemplate
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MARKER_CONFIG = os.path.join(ROOT_DIR, 'tests', 'marker_config.avl')
+
+
+def surface(c1, angle):
+    return dict(airfoil1_file='raiz.dat', airfoil2_file='meio.dat', airfoil3_file='ponta.dat',
+                x=0.0, y1=0.0, y2=0.8, y3=1.6, z=0.0, c1=c1, c2=0.4, c3=0.22,
+                angle_incidence=angle, twist1=0.0, twist2=-1.0, twist3=-2.0)
+
+
+def main(number=500):
+    work_dir = tempfile.mkdtemp(prefix='bench_template_')
+    try:
+        legacy_file = os.path.join(work_dir, 'legacy.avl')
+        template_file = os.path.join(work_dir, 'template.avl')
+        shutil.copy(MARKER_CONFIG, legacy_file)
+        template = ConfigTemplate.from_file(MARKER_CONFIG)
+        designs = [(0.4 + 0.001 * k, 0.1 * k) for k in range(number)]
+
+        def legacy():
+            for c1, angle in designs:
+                set_dimensions(legacy_file, surface_name='asa', **surface(c1, angle))
+                set_dimensions(legacy_file, surface_name='eh', **surface(c1 / 2, -angle))
+
+        def compiled():
+            for c1, angle in designs:
+                template.write(template_file, {'asa': surface(c1, angle), 'eh': surface(c1 / 2, -angle)})
+
+        for name, function in (('set_dimensions x2 (fileinput)', legacy),
+                               ('ConfigTemplate.write', compiled)):
+            seconds = min(timeit.repeat(function, number=1, repeat=3)) / number
+            print(f'{name:<32s} {seconds * 1e6:8.1f} us/projeto')
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
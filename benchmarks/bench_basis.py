@@ -0,0 +1,53 @@
+"""
+Mede o ganho das matrizes de base memorizadas (bernstein_matrix e
+lagrange_matrix) na construção de uma asa e na avaliação de uma curva.
+
+Uso:
+    python benchmarks/bench_basis.py
+"""
+import timeit
+
+import numpy as np
+
+from MDO_UNESP.bezier_airfoil import BezierAirfoil, clear_basis_cache
+
+PROPERTIES = {
+    "semi_span": 1.3,
+    "number_of_panels": 25,
+    "chord_root": 1,
+    "chord_tip": 0.8,
+    "thicks": [0.14, 0.12, 0.11, 0.10],
+    "cambers": [0.02, 0.03, 0.025, 0.02],
+    "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+}
+
+
+def main(number=500):
+    wing = BezierAirfoil(dict(PROPERTIES))
+    span = np.linspace(0, np.pi/2, PROPERTIES["number_of_panels"]) * PROPERTIES["semi_span"]
+    control_points = np.array([[0, 1.0], [0.4, 1.1], [0.9, 0.9], [1.3, 1.1]])
+    nodes = np.array((0, 1/3, 2/3, 1.)) * span[-1]
+    closures = wing.lagrange_polynomials(nodes)
+    thicks = PROPERTIES["thicks"]
+
+    def uncached(function):
+        def run():
+            clear_basis_cache()
+            function()
+        return run
+
+    cases = (
+        ('asa (sem cache)', uncached(lambda: BezierAirfoil(dict(PROPERTIES)))),
+        ('asa (com cache)', lambda: BezierAirfoil(dict(PROPERTIES))),
+        ('bezier_curve (sem cache)', uncached(lambda: wing.bezier_curve(control_points, span))),
+        ('bezier_curve (com cache)', lambda: wing.bezier_curve(control_points, span)),
+        ('lagrange_curve (polinômios)', lambda: wing.lagrange_curve(closures, span, thicks)),
+        ('lagrange_curve (nós, cache)', lambda: wing.lagrange_curve(nodes, span, thicks)),
+    )
+    for name, function in cases:
+        seconds = min(timeit.repeat(function, number=number, repeat=5)) / number
+        print(f'{name:<30s} {seconds * 1e6:8.1f} us')
+
+
+if __name__ == '__main__':
+    main()
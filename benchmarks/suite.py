@@ -0,0 +1,193 @@
+"""
+Benchmarks de cada etapa do fluxo geometria -> arquivos -> AVL -> leitura,
+com referências gravadas em benchmarks/baselines.json.
+
+Cada caso é medido separadamente (menor tempo médio por chamada entre
+várias repetições, como em timeit) e comparado com a sua referência: um
+caso mais lento que ``referência * limite`` é uma regressão, e o script
+termina com código 1. A varredura completa usa o substituto determinístico
+do AVL (tests/fake_avl.py), de modo que nenhum caso depende do executável
+real.
+
+As referências valem para a máquina em que foram gravadas (ver a chave
+'machine' do arquivo); ao trocar de máquina, ou depois de uma otimização
+confirmada, grave-as de novo com --update.
+
+Uso:
+    python benchmarks/suite.py                  # mede e compara
+    python benchmarks/suite.py -k bezier        # só os casos com 'bezier' no nome
+    python benchmarks/suite.py --update         # regrava as referências
+    python benchmarks/suite.py --threshold 2.0  # limite de regressão (padrão: o do arquivo)
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+from MDO_UNESP.avl_generator import create_avl_config_from_bezier
+from MDO_UNESP.avl_runner import get_aero_coef, get_clmax, get_value, set_dimensions
+from MDO_UNESP.bezier_airfoil import BezierAirfoil
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_DIR = os.path.join(ROOT_DIR, 'tests')
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+FAKE_AVL = [sys.executable, os.path.join(TESTS_DIR, 'fake_avl.py')]
+DEFAULT_THRESHOLD = 1.75
+# Módulos importados por um processo de cálculo (pool do DOE/otimizador)
+WORKER_IMPORTS = 'import MDO_UNESP, MDO_UNESP.doe, MDO_UNESP.optimizer, MDO_UNESP.sensitivity, MDO_UNESP.vlm'
+
+PROPERTIES = {
+    "semi_span": 1.3,
+    "number_of_panels": 25,
+    "chord_root": 1,
+    "chord_tip": 0.8,
+    "thicks": [0.14, 0.12, 0.11, 0.10],
+    "cambers": [0.02, 0.03, 0.025, 0.02],
+    "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+}
+
+SURFACE = dict(airfoil1_file='raiz.dat', airfoil2_file='meio.dat', airfoil3_file='ponta.dat',
+               x=0.0, y1=0.0, y2=0.8, y3=1.6, z=0.0, c1=0.45, c2=0.4, c3=0.22,
+               angle_incidence=1.0, twist1=0.0, twist2=-1.0, twist3=-2.0)
+
+
+def wing_properties(number_of_panels):
+    return dict(PROPERTIES, number_of_panels=number_of_panels)
+
+
+def startup(code):
+    """Executa ``code`` num interpretador novo (custo de inicialização de um processo do pool)."""
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def cases(work_dir):
+    """
+    Casos do benchmark: nome -> (função sem argumentos, chamadas por repetição).
+
+    Os casos de escrita alternam entre conteúdos diferentes, para medir a
+    escrita de fato e não o atalho de write_if_changed, e reaproveitam os
+    mesmos arquivos: a criação de milhares de arquivos novos mediria o
+    sistema de arquivos, não o código.
+    """
+    wing = BezierAirfoil(wing_properties(25))
+    wing.properties['airfoil_files'] = wing.write_airfoil_files(os.path.join(work_dir, 'airfoils'))
+    config_file = os.path.join(work_dir, 'legacy.avl')
+    shutil.copy(os.path.join(TESTS_DIR, 'marker_config.avl'), config_file)
+    ft_file = os.path.join(TESTS_DIR, 'avl_ft.out')
+    fs_file = os.path.join(TESTS_DIR, 'avl_fs.out')
+    sweep_config = os.path.join(work_dir, 'sweep.avl')
+    shutil.copy(os.path.join(ROOT_DIR, 'bezier_wing.avl'), sweep_config)
+
+    benchmarks = {}
+    for n in (25, 100, 400):
+        properties = wing_properties(n)
+        benchmarks[f'bezier_airfoil[{n}]'] = (lambda properties=properties: BezierAirfoil(dict(properties)),
+                                              max(10, 2000 // n))
+    # Duas asas alternadas no mesmo diretório: todo arquivo muda a cada chamada
+    other = BezierAirfoil(dict(wing_properties(25), chord_tip=0.7, cambers=[0.03] * 4))
+    other.properties['airfoil_files'] = wing.properties['airfoil_files']
+    wings = itertools.cycle([wing, other])
+    airfoil_dir = os.path.join(work_dir, 'airfoils_bench')
+    wing_config = os.path.join(work_dir, 'wing.avl')
+    benchmarks['write_airfoil_files[25]'] = (lambda: next(wings).write_airfoil_files(airfoil_dir), 20)
+    benchmarks['create_avl_config_from_bezier[25]'] = (
+        lambda: create_avl_config_from_bezier(wing_config, next(wings)), 100)
+    benchmarks['set_dimensions'] = (lambda: set_dimensions(config_file, surface_name='asa', **SURFACE), 50)
+    benchmarks['get_value'] = (lambda: (get_value(ft_file, 'CLtot'), get_value(ft_file, 'CDtot'),
+                                        get_value(ft_file, 'Cmtot')), 200)
+    benchmarks['get_clmax'] = (lambda: get_clmax(fs_file), 200)
+    benchmarks['get_aero_coef[fake_avl]'] = (
+        lambda: get_aero_coef(sweep_config, 1.2, -4, 16, 1.0, avl_path=FAKE_AVL, in_memory=True), 1)
+    # A diferença entre os dois é o custo de 'import MDO_UNESP' num processo
+    # que não plota: matplotlib, scipy e pandas só são importados sob demanda
+    benchmarks['startup[python]'] = (lambda: startup('pass'), 1)
+    benchmarks['startup[worker]'] = (lambda: startup(WORKER_IMPORTS), 1)
+    return benchmarks
+
+
+def measure(function, number, repeat=15) -> float:
+    """Menor tempo médio por chamada, em segundos."""
+    function()  # aquecimento (imports, caches de base, sistema de arquivos)
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+
+def machine() -> dict:
+    return {'python': platform.python_version(), 'numpy': np.__version__,
+            'platform': platform.platform(), 'processor': platform.machine()}
+
+
+def load_baselines(file_name=BASELINES) -> dict:
+    if not os.path.exists(file_name):
+        return {'threshold': DEFAULT_THRESHOLD, 'machine': {}, 'cases': {}}
+    with open(file_name) as f:
+        return json.load(f)
+
+
+def compare(results: dict, baselines: dict, threshold=None) -> list:
+    """
+    Compara tempos medidos com as referências.
+
+    O limite de cada caso é, em ordem de prioridade: ``threshold``, o
+    'threshold' do próprio caso no arquivo e o 'threshold' global do arquivo.
+
+    Returns:
+        Lista de (nome, segundos, referência ou None, razão ou None, regressão?)
+    """
+    rows = []
+    for name, seconds in results.items():
+        reference = baselines['cases'].get(name)
+        if reference is None:
+            rows.append((name, seconds, None, None, False))
+            continue
+        limit = threshold or reference.get('threshold') or baselines.get('threshold', DEFAULT_THRESHOLD)
+        ratio = seconds / reference['seconds']
+        rows.append((name, seconds, reference['seconds'], ratio, ratio > limit))
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-k', dest='pattern', default='', help="só os casos cujo nome contém o texto")
+    parser.add_argument('--update', action='store_true', help='regrava as referências medidas')
+    parser.add_argument('--threshold', type=float, default=None, help='razão máxima tempo / referência')
+    parser.add_argument('--repeat', type=int, default=15)
+    parser.add_argument('--baselines', default=BASELINES)
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix='bench_suite_')
+    try:
+        results = {}
+        for name, (function, number) in cases(work_dir).items():
+            if args.pattern in name:
+                results[name] = measure(function, number, args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    baselines = load_baselines(args.baselines)
+    if args.update:
+        for name, seconds in results.items():
+            baselines['cases'].setdefault(name, {})['seconds'] = seconds
+        baselines['machine'] = machine()
+        with open(args.baselines, 'w') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    regressions = 0
+    for name, seconds, reference, ratio, regression in compare(results, baselines, args.threshold):
+        reference_text = f'{reference * 1e6:10.1f} us  x{ratio:5.2f}' if reference else '         (sem referência)'
+        status = '  REGRESSÃO' if regression else ''
+        print(f'{name:<36s} {seconds * 1e6:10.1f} us {reference_text}{status}')
+        regressions += regression
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from .bezier_airfoil import naca_4digits_batch
+from .bulk_writer import format_coordinates, write_if_changed
+
+
+class AirfoilLibrary():
+    """
+    Biblioteca de perfis NACA compartilhada entre seções e projetos.
+
+    Cada seção é identificada pela chave quantizada (cambra, posição da
+    cambra, espessura, número de pontos, espaçamento); cada chave tem um
+    único arquivo .dat, escrito na primeira vez em que aparece e reutilizado
+    por todas as seções e asas com a mesma chave. O arquivo é gerado a partir
+    dos parâmetros quantizados, de modo que o conteúdo depende só da chave
+    (com o passo padrão, a diferença para o perfil exato é menor que 1e-4
+    da corda).
+
+    Args:
+        directory: Diretório dos arquivos .dat (criado se não existir)
+        step: Passo de quantização dos parâmetros, em frações da corda
+    """
+
+    def __init__(self, directory: str = 'airfoils', step: float = 1e-4):
+        self.directory = directory
+        self.step = step
+        self.hits = 0
+        self.misses = 0
+        self._known = set()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate,
+                'files': len(self._known)}
+
+    def file_name(self, key: tuple) -> str:
+        camber, camber_pos, thickness, npts, spacing = key
+        return os.path.join(self.directory, f'naca_{camber}_{camber_pos}_{thickness}_{npts}{spacing[0]}.dat')
+
+    def airfoil_files(self, camber, camber_pos, thickness, npts: int = 100,
+                      spacing: str = 'uniform') -> List[str]:
+        """
+        Arquivos de perfil de um conjunto de seções, escrevendo só os que faltam.
+
+        Args:
+            camber, camber_pos, thickness: Arrays (n,) com os parâmetros de cada seção
+            npts: Número de pontos em cada superfície
+            spacing: "uniform" ou "cosine"
+
+        Returns:
+            Lista com o caminho do arquivo de cada seção, na mesma ordem
+        """
+        quantized = np.rint(np.stack([np.asarray(camber, dtype=float), np.asarray(camber_pos, dtype=float),
+                                      np.asarray(thickness, dtype=float)], axis=1) / self.step).astype(np.int64)
+        keys = [(*row, npts, spacing) for row in quantized.tolist()]
+
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._known]
+        written = 0
+        if new_keys:
+            # Chaves ainda não vistas por este processo são sempre geradas:
+            # write_if_changed compara com o que houver em disco (escrito por
+            # outro worker) e só substitui o arquivo, de forma atômica, se
+            # ele faltar ou diferir
+            parameters = np.array([key[:3] for key in new_keys], dtype=float) * self.step
+            sections = naca_4digits_batch(parameters[:, 0], parameters[:, 1], parameters[:, 2],
+                                          npts=npts, spacing=spacing)
+            for k, key in enumerate(new_keys):
+                name = os.path.splitext(os.path.basename(self.file_name(key)))[0]
+                written += write_if_changed(self.file_name(key),
+                                            format_coordinates(name, sections[0, k], sections[1, k]))
+                # Só depois da escrita: uma falha é repetida na próxima chamada
+                self._known.add(key)
+        self.misses += written
+        self.hits += len(keys) - written
+
+        return [self.file_name(key) for key in keys]
+
+    def wing_files(self, wing) -> List[str]:
+        """Arquivos de perfil de todas as seções de uma asa (BezierAirfoil ou WingGeometry)."""
+        geometry = getattr(wing, 'geometry', wing)
+        inputs = geometry.inputs
+        return self.airfoil_files(geometry.camber, geometry.camber_pos, geometry.thickness,
+                                  npts=inputs.get('airfoil_points', 100),
+                                  spacing=inputs.get('airfoil_spacing', 'uniform'))
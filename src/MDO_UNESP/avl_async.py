@@ -0,0 +1,282 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .avl_output import parse_output, strip_cl_max
+from .avl_runner import _resolve_avl_path
+from .avl_session import CONTROL, OPER_PROMPT, TOP_PROMPT, AVLSessionError, _as_command, default_avl_path
+
+
+class AVLTimeoutError(AVLSessionError):
+    """O AVL não respondeu dentro do tempo limite."""
+
+
+class AVLEvaluation(NamedTuple):
+    """
+    Resultado de uma varredura assíncrona.
+
+    Em falhas, CL, CD e Cm trazem os pontos resolvidos antes do erro.
+    """
+    config_file: str
+    status: str  # 'ok', 'timeout' ou 'error'
+    CL: Dict[float, float]
+    CD: Dict[float, float]
+    Cm: Dict[float, float]
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+
+
+class AsyncAVLSession():
+    """
+    Versão asyncio de :class:`avl_session.AVLSession`.
+
+    O protocolo é o mesmo (carga única da configuração e comandos no menu
+    OPER, saídas lidas do stdout), mas o processo é criado com
+    ``asyncio.create_subprocess_exec`` e nenhuma espera bloqueia o loop de
+    eventos. Não há reinício automático: uma queda ou um prompt que não
+    chega em ``timeout`` segundos gera AVLSessionError (AVLTimeoutError no
+    caso do tempo esgotado). Ao sair do ``async with`` por uma exceção,
+    inclusive um cancelamento, o processo é encerrado imediatamente.
+
+    Args:
+        config_file: Arquivo .avl a ser carregado
+        avl_path: Executável do AVL, ou lista com o comando completo
+        timeout: Tempo máximo, em segundos, de espera por cada prompt
+        cwd: Diretório de trabalho do processo
+        run_file: Arquivo .run com casos de voo (ver AVLSession)
+    """
+
+    def __init__(self, config_file: str, avl_path: Union[str, Sequence[str], None] = None,
+                 timeout: float = 30.0, cwd: Optional[str] = None, run_file: Optional[str] = None):
+        self.config_file = config_file
+        self.run_file = run_file
+        self.command = _as_command(avl_path if avl_path is not None else default_avl_path())
+        self.timeout = timeout
+        self.cwd = cwd
+
+        self._process = None
+        self._buffer = ''
+        self._controls = set()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.close()
+        else:
+            await self._kill()
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        """Inicia o AVL, carrega a configuração e entra no menu OPER."""
+        env = dict(os.environ)
+        env.setdefault('GFORTRAN_UNBUFFERED_PRECONNECTED', 'y')
+        self._process = await asyncio.create_subprocess_exec(
+            *self.command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL, cwd=self.cwd, env=env)
+        self._buffer = ''
+        self._controls = set()
+
+        try:
+            await self._expect(TOP_PROMPT)
+            await self.send(f'load {self.config_file}', TOP_PROMPT)
+            if self.run_file is not None:
+                await self.send(f'case {self.run_file}', TOP_PROMPT)
+            await self.send('oper', OPER_PROMPT)
+        except BaseException:
+            # __aexit__ não roda se __aenter__ falhar: o processo é encerrado aqui
+            await self._kill()
+            raise
+
+    async def close(self) -> None:
+        """Sai do AVL de forma ordenada, encerrando o processo se necessário."""
+        if self._process is None:
+            return
+        try:
+            if self.is_running:
+                self._process.stdin.write(b'\nquit\n')
+                await self._process.stdin.drain()
+                await asyncio.wait_for(self._process.wait(), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            await self._kill()
+
+    async def send(self, command: str, prompt: 're.Pattern' = OPER_PROMPT) -> str:
+        """
+        Envia um comando (uma ou mais linhas) e espera pelo próximo prompt.
+
+        Returns:
+            Texto impresso pelo AVL entre o envio e o prompt
+        """
+        if not self.is_running:
+            raise AVLSessionError('O processo do AVL não está em execução.')
+        try:
+            self._process.stdin.write(bytes(command + '\n', encoding='utf8'))
+            await self._process.stdin.drain()
+        except OSError as error:
+            raise AVLSessionError(f'Falha ao escrever no AVL: {error}') from error
+        return await self._expect(prompt)
+
+    async def solve_alpha(self, alpha: float) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+        """Resolve um ângulo de ataque; saídas lidas do stdout (ver AVLSession.solve_alpha)."""
+        await self._release_controls()
+        return await self.solve_constraints((f'a a {alpha}',))
+
+    async def solve_constraints(self, constraints: Sequence[str]) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+        """Resolve o ponto definido por comandos de restrição (ver AVLSession.solve_constraints)."""
+        for command in constraints:
+            name = command.split(maxsplit=1)[0] if command.strip() else ''
+            if CONTROL.fullmatch(name):
+                self._controls.add(name.lower())
+            await self.send(command)
+        await self.send('x')
+        totals, _ = parse_output(await self.send('ft\n'))
+        _, strips = parse_output(await self.send('fs\n'))
+        return totals, strips
+
+    async def _release_controls(self) -> None:
+        # Como em AVLSession._release_controls
+        for name in sorted(self._controls):
+            await self.send(f'{name} {name} 0')
+        self._controls.clear()
+
+    async def _expect(self, prompt) -> str:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            match = prompt.search(self._buffer)
+            if match:
+                output = self._buffer[:match.end()]
+                self._buffer = self._buffer[match.end():]
+                return output
+            try:
+                # Lê em blocos (e não por linha): os prompts do AVL não terminam em '\n'.
+                data = await asyncio.wait_for(self._process.stdout.read(65536),
+                                              max(deadline - time.monotonic(), 0.0))
+            except asyncio.TimeoutError:
+                raise AVLTimeoutError(f'Tempo esgotado ({self.timeout} s) esperando o prompt do AVL.')
+            if not data:
+                raise AVLSessionError('O processo do AVL terminou inesperadamente.')
+            self._buffer += data.decode('latin-1')
+
+    async def _kill(self) -> None:
+        process = self._process
+        if process is None:
+            return
+        self._process = None
+        if process.returncode is None:
+            # O sinal é enviado antes de qualquer espera: mesmo que a espera
+            # seja cancelada, o processo não fica órfão.
+            process.kill()
+        await process.wait()
+
+
+class AsyncAVLEvaluator():
+    """
+    Varreduras de alpha do AVL a partir de um loop asyncio.
+
+    Cada avaliação é uma corrotina independente; um semáforo limita a
+    ``max_concurrency`` o número de processos do AVL vivos ao mesmo tempo,
+    de modo que milhares de avaliações podem ser agendadas de uma vez
+    (ex.: com asyncio.gather) sem esgotar processos ou descritores.
+
+    Falhas não interrompem as demais avaliações: queda do processo,
+    saída inesperada e tempos esgotados viram um AVLEvaluation com status
+    'timeout' ou 'error'. Um cancelamento encerra o processo do AVL e é
+    propagado normalmente.
+
+    Args:
+        max_concurrency: Máximo de processos simultâneos (padrão: número de CPUs)
+        avl_path: Executável do AVL (ou comando completo)
+        solve_timeout: Tempo máximo, em segundos, de cada comando do AVL
+        sweep_timeout: Tempo máximo, em segundos, de uma varredura inteira
+            (None para sem limite); a espera na fila do semáforo não conta
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, avl_path=None, solve_timeout: float = 30.0,
+                 sweep_timeout: Optional[float] = None):
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.avl_path = avl_path
+        self.solve_timeout = solve_timeout
+        self.sweep_timeout = sweep_timeout
+        self.n_ok = 0
+        self.n_timeouts = 0
+        self.n_errors = 0
+        self.running = 0
+        self.peak_running = 0
+        # Criado no primeiro uso: no Python 3.8/3.9 o semáforo fica preso
+        # ao loop em que foi criado
+        self._semaphore = None
+
+    def stats(self) -> dict:
+        return {'ok': self.n_ok, 'timeouts': self.n_timeouts, 'errors': self.n_errors,
+                'peak_running': self.peak_running}
+
+    async def evaluate(self, config_file, Cl_max_airfoil, alpha_start, alpha_end, alpha_step) -> AVLEvaluation:
+        """
+        Varre alpha até o estol, como avl_runner.get_aero_coef (saídas em memória).
+
+        Returns:
+            AVLEvaluation com os dicionários CL, CD e Cm indexados por alpha
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        CL_dict, CD_dict, Cm_dict = {}, {}, {}
+
+        async with self._semaphore:
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+            start = time.monotonic()
+            status, message = 'ok', None
+            try:
+                avl_file = _resolve_avl_path(self.avl_path)
+                await asyncio.wait_for(
+                    self._sweep(config_file, avl_file, Cl_max_airfoil, np.arange(alpha_start, alpha_end, alpha_step),
+                                (CL_dict, CD_dict, Cm_dict)),
+                    self.sweep_timeout)
+            except (asyncio.TimeoutError, AVLTimeoutError) as error:
+                status, message = 'timeout', str(error) or f'Varredura excedeu {self.sweep_timeout} s.'
+            except (AVLSessionError, ValueError, OSError) as error:
+                status, message = 'error', str(error)
+            finally:
+                self.running -= 1
+
+        if status == 'ok':
+            self.n_ok += 1
+        elif status == 'timeout':
+            self.n_timeouts += 1
+        else:
+            self.n_errors += 1
+        return AVLEvaluation(config_file, status, CL_dict, CD_dict, Cm_dict, message, time.monotonic() - start)
+
+    async def evaluate_many(self, config_files, Cl_max_airfoil, alpha_start, alpha_end,
+                            alpha_step) -> List[AVLEvaluation]:
+        """Avalia várias configurações de uma vez; resultados na ordem de ``config_files``."""
+        return list(await asyncio.gather(*[
+            self.evaluate(config_file, Cl_max_airfoil, alpha_start, alpha_end, alpha_step)
+            for config_file in config_files]))
+
+    async def _sweep(self, config_file, avl_file, Cl_max_airfoil, alpha_range, dicts):
+        CL_dict, CD_dict, Cm_dict = dicts
+        async with AsyncAVLSession(config_file, avl_path=avl_file, timeout=self.solve_timeout) as session:
+            for alpha in alpha_range:
+                totals, strips = await session.solve_alpha(alpha)
+                if 'cl' not in strips:
+                    raise ValueError(f'Tabela de forças por faixa não encontrada na saída do AVL (alpha={alpha})')
+                if strip_cl_max(strips) > Cl_max_airfoil:
+                    break
+                CL_dict[alpha] = totals.get('CLtot')
+                CD_dict[alpha] = totals.get('CDtot')
+                Cm_dict[alpha] = totals.get('Cmtot')
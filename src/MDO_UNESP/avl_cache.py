@@ -0,0 +1,180 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _normalized_lines(text: str) -> List[str]:
+    """Linhas do .avl sem comentários ('#' ou '!'), espaços extras e linhas vazias."""
+    lines = []
+    for line in text.splitlines():
+        for comment in ('#', '!'):
+            line = line.split(comment, 1)[0]
+        line = ' '.join(line.split())
+        if line:
+            lines.append(line)
+    return lines
+
+
+def _airfoil_path(airfoil_file: str, config_file: str) -> str:
+    """Resolve o caminho de um AFILE como o AVL (relativo ao diretório de trabalho)."""
+    candidates = [airfoil_file, airfoil_file.replace('\\', os.sep)]
+    config_dir = os.path.dirname(os.path.abspath(config_file))
+    candidates += [os.path.join(config_dir, candidate) for candidate in candidates]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return airfoil_file
+
+
+class AVLResultCache():
+    """
+    Cache em disco de resultados do AVL, endereçado pelo conteúdo.
+
+    A chave é o hash do .avl normalizado (sem comentários e espaços), do
+    conteúdo dos arquivos de perfil referenciados em AFILE, do alpha e do
+    Mach. Cada entrada guarda os valores totais e a tabela de faixas num
+    arquivo .npz. As escritas são atômicas (arquivo temporário + os.replace),
+    o que permite compartilhar o diretório entre processos. Quando o tamanho
+    total passa de ``max_bytes``, as entradas usadas há mais tempo são
+    removidas (a data de modificação marca o último uso).
+
+    O tamanho e a ordem de uso das entradas são mantidos em memória; o
+    diretório só é varrido na primeira escrita e a cada ``rescan_every``
+    escritas, para incorporar as entradas gravadas por outros processos.
+
+    Args:
+        directory: Diretório do cache (criado se não existir)
+        max_bytes: Tamanho máximo do cache em bytes
+        rescan_every: Número de escritas entre varreduras do diretório
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 2**20, rescan_every: int = 256):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.rescan_every = rescan_every
+        self.hits = 0
+        self.misses = 0
+        self.scans = 0
+        os.makedirs(directory, exist_ok=True)
+
+        # Chave -> tamanho em bytes, da entrada usada há mais tempo à mais recente
+        self._entries = None
+        self._bytes = 0
+        self._puts = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
+
+    def config_digest(self, config_file: str) -> Tuple[str, float]:
+        """
+        Hash do .avl normalizado e do conteúdo dos perfis referenciados.
+
+        Returns:
+            Tuple com (hash, Mach lido do .avl)
+        """
+        with open(config_file, 'r') as f:
+            lines = _normalized_lines(f.read())
+        digest = hashlib.sha256('\n'.join(lines).encode('utf8'))
+        for previous, line in zip(lines, lines[1:]):
+            if previous.upper().startswith('AFIL'):
+                try:
+                    with open(_airfoil_path(line, config_file), 'rb') as f:
+                        digest.update(f.read())
+                except OSError:
+                    digest.update(line.encode('utf8'))
+
+        mach = float(lines[1].split()[0]) if len(lines) > 1 else 0.0
+        return digest.hexdigest(), mach
+
+    @staticmethod
+    def point_key(config_digest: str, alpha: float, mach: float) -> str:
+        """Chave de um ponto a partir do hash já calculado da configuração."""
+        point = f'{config_digest}|alpha={float(alpha)!r}|mach={float(mach)!r}'
+        return hashlib.sha256(point.encode('utf8')).hexdigest()
+
+    def key(self, config_file: str, alpha: float, mach: Optional[float] = None) -> str:
+        """Chave de uma avaliação (configuração, alpha, Mach)."""
+        digest, config_mach = self.config_digest(config_file)
+        return self.point_key(digest, alpha, config_mach if mach is None else mach)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.npz')
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, float], Dict[str, np.ndarray]]]:
+        """Retorna (totals, strips) ou None, atualizando os contadores."""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                totals = dict(zip(data['total_names'].tolist(), data['total_values'].tolist()))
+                strip_data = data['strip_data']
+                strips = {name: strip_data[:, i].copy() for i, name in enumerate(data['strip_names'].tolist())}
+            os.utime(path)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            # Ausente, removido por outro processo ou incompleto
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self._entries is not None and key in self._entries:
+            self._entries.move_to_end(key)
+        return totals, strips
+
+    def put(self, key: str, totals: Dict[str, float], strips: Dict[str, np.ndarray]) -> None:
+        """Grava uma entrada de forma atômica e aplica o limite de tamanho."""
+        names = list(strips)
+        strip_data = np.column_stack([strips[name] for name in names]) if names else np.zeros((0, 0))
+        fd, temporary = tempfile.mkstemp(prefix='.tmp_', suffix='.npz', dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, total_names=np.array(list(totals), dtype=str),
+                         total_values=np.array(list(totals.values()), dtype=float),
+                         strip_names=np.array(names, dtype=str), strip_data=strip_data)
+                size = f.tell()
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+        self._puts += 1
+        if self._entries is None or self._puts % self.rescan_every == 0:
+            self._scan()
+        else:
+            self._bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+        self._evict()
+
+    def _scan(self) -> None:
+        self.scans += 1
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if not entry.name.endswith('.npz') or entry.name.startswith('.tmp_'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, entry.name[:-len('.npz')], stat.st_size))
+
+        entries.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in entries)
+        self._bytes = sum(self._entries.values())
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._bytes -= size
@@ -0,0 +1,137 @@
+import itertools
+import os
+from contextlib import closing
+from typing import Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+from .avl_runner import _resolve_avl_path, _work_directory
+from .avl_session import AVLSession
+from .bulk_writer import write_if_changed
+
+# O AVL aceita no máximo 25 casos por arquivo .run (NRMAX)
+MAX_CASES = 25
+
+# Valores da saída 'ft' guardados para cada caso
+TOTALS = {'alpha': 'Alpha', 'beta': 'Beta', 'mach': 'Mach', 'CL': 'CLtot', 'CD': 'CDtot', 'CDi': 'CDind',
+          'CY': 'CYtot', 'Cl': 'Cltot', 'Cm': 'Cmtot', 'Cn': 'Cntot', 'e': 'e'}
+
+
+class RunCase(NamedTuple):
+    """Um caso de voo de um arquivo .run (ângulos em graus, taxas adimensionais)."""
+    alpha: float = 0.0
+    beta: float = 0.0
+    mach: float = 0.0
+    pb_2V: float = 0.0
+    qc_2V: float = 0.0
+    rb_2V: float = 0.0
+    name: str = ''
+
+
+def envelope(alphas: Sequence[float], machs: Sequence[float] = (0.0,),
+             betas: Sequence[float] = (0.0,)) -> List[RunCase]:
+    """Casos do produto Mach x beta x alpha (alpha varia mais rápido)."""
+    return [RunCase(alpha=float(alpha), beta=float(beta), mach=float(mach))
+            for mach, beta, alpha in itertools.product(machs, betas, alphas)]
+
+
+def format_run_file(cases: Sequence[RunCase]) -> str:
+    """Texto de um arquivo .run do AVL com um bloco por caso."""
+    parts = []
+    for number, case in enumerate(cases, start=1):
+        name = case.name or f'alpha={case.alpha:g} beta={case.beta:g} Mach={case.mach:g}'
+        parts.append('\n ---------------------------------------------\n')
+        parts.append(f' Run case {number:2d}:  {name}\n\n')
+        for variable, value in (('alpha', case.alpha), ('beta', case.beta), ('pb/2V', case.pb_2V),
+                                ('qc/2V', case.qc_2V), ('rb/2V', case.rb_2V)):
+            parts.append(f' {variable:<12s} ->  {variable:<11s} = {value:10.5f}\n')
+        parts.append('\n')
+        for name, value, unit in (('alpha', case.alpha, 'deg'), ('beta', case.beta, 'deg'),
+                                  ('pb/2V', case.pb_2V, ''), ('qc/2V', case.qc_2V, ''), ('rb/2V', case.rb_2V, ''),
+                                  ('CL', 0.0, ''), ('CDo', 0.0, ''), ('bank', 0.0, 'deg'),
+                                  ('elevation', 0.0, 'deg'), ('heading', 0.0, 'deg'), ('Mach', case.mach, ''),
+                                  ('velocity', 0.0, 'Lunit/Tunit'), ('density', 1.0, 'Munit/Lunit^3'),
+                                  ('grav.acc.', 1.0, 'Lunit/Tunit^2'), ('turn_rad.', 0.0, 'Lunit'),
+                                  ('load_fac.', 1.0, ''), ('X_cg', 0.0, 'Lunit'), ('Y_cg', 0.0, 'Lunit'),
+                                  ('Z_cg', 0.0, 'Lunit'), ('mass', 1.0, 'Munit'),
+                                  ('Ixx', 1.0, 'Munit-Lunit^2'), ('Iyy', 1.0, 'Munit-Lunit^2'),
+                                  ('Izz', 1.0, 'Munit-Lunit^2'), ('Ixy', 0.0, 'Munit-Lunit^2'),
+                                  ('Iyz', 0.0, 'Munit-Lunit^2'), ('Izx', 0.0, 'Munit-Lunit^2'),
+                                  ('visc CL_a', 0.0, ''), ('visc CL_u', 0.0, ''),
+                                  ('visc CM_a', 0.0, ''), ('visc CM_u', 0.0, '')):
+            parts.append(f' {name:<9s} = {value:10.5f}     {unit}\n')
+    return ''.join(parts)
+
+
+def write_run_file(file_name, cases: Sequence[RunCase]) -> bool:
+    """
+    Grava um arquivo .run (ver format_run_file).
+
+    Returns:
+        True se o arquivo foi escrito, False se já tinha o mesmo conteúdo
+    """
+    if len(cases) > MAX_CASES:
+        raise ValueError(f'O AVL lê no máximo {MAX_CASES} casos por arquivo .run ({len(cases)} pedidos).')
+    return write_if_changed(file_name, format_run_file(cases))
+
+
+def run_cases(config_file, cases: Sequence[RunCase], avl_path=None, work_dir=None) -> Dict[str, np.ndarray]:
+    """
+    Resolve vários casos de voo com uma única carga da configuração.
+
+    Os casos são gravados em arquivos .run (até MAX_CASES por arquivo) e
+    carregados na mesma sessão do AVL; cada caso é selecionado e resolvido
+    no menu OPER, e as saídas 'ft'/'fs' são lidas do stdout. O custo cresce
+    com o número de soluções, e não com o de processos ou de arquivos .avl.
+
+    Args:
+        config_file: Arquivo .avl
+        cases: Casos de voo (ver RunCase e envelope)
+        avl_path: Executável do AVL (ou comando completo)
+        work_dir: Diretório dos arquivos .run (temporário por padrão)
+
+    Returns:
+        Dicionário de arrays indexados pelo caso: alpha, beta, mach, CL, CD,
+        CDi, CY, Cl, Cm, Cn, e (n_casos,), Yle (n_faixas,) e cl (n_casos, n_faixas)
+    """
+    avl_file = _resolve_avl_path(avl_path)
+    cases = list(cases)
+    rows = {name: np.full(len(cases), np.nan) for name in TOTALS}
+    strip_cl = []
+    Yle = None
+
+    with _work_directory(work_dir) as work_dir, \
+            closing(AVLSession(config_file, avl_path=avl_file)) as session:
+        for start in range(0, len(cases), MAX_CASES):
+            chunk = cases[start:start + MAX_CASES]
+            run_file = os.path.join(work_dir, f'cases_{start // MAX_CASES}.run')
+            write_run_file(run_file, chunk)
+            session.load_cases(run_file)
+            for number in range(1, len(chunk) + 1):
+                totals, strips = session.solve_case(number)
+                for name, key in TOTALS.items():
+                    rows[name][start + number - 1] = totals.get(key, np.nan)
+                strip_cl.append(strips['cl'])
+                Yle = strips['Yle']
+
+    rows['Yle'] = Yle
+    rows['cl'] = np.array(strip_cl)
+    return rows
+
+
+def run_envelope(config_file, alphas: Sequence[float], machs: Sequence[float] = (0.0,),
+                 betas: Sequence[float] = (0.0,), avl_path=None, work_dir=None) -> Dict[str, np.ndarray]:
+    """
+    Envelope alpha x Mach x beta numa única sessão do AVL (ver run_cases).
+
+    Returns:
+        Dicionário com os eixos (alphas, machs, betas) e, para cada grandeza
+        de run_cases, um array (n_mach, n_beta, n_alpha); cl tem forma
+        (n_mach, n_beta, n_alpha, n_faixas)
+    """
+    shape = (len(machs), len(betas), len(alphas))
+    rows = run_cases(config_file, envelope(alphas, machs, betas), avl_path=avl_path, work_dir=work_dir)
+    grid = {name: values.reshape(shape + values.shape[1:]) for name, values in rows.items() if name != 'Yle'}
+    grid.update(alphas=np.asarray(alphas, dtype=float), machs=np.asarray(machs, dtype=float),
+                betas=np.asarray(betas, dtype=float), Yle=rows['Yle'])
+    return grid
@@ -1,54 +1,285 @@
 # avl_generator.py
+import os
+from contextlib import closing
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
 import numpy as np
-def create_avl_config_from_bezier(file_name, bezier_wing, surface_name="wing"):
-    """
-    Cria um arquivo de configuração .avl completo a partir de um objeto BezierAirfoil.
-    """
-    # Extrair propriedades do objeto bezier_wing
-    chords = bezier_wing.properties["chord"]
-    span_positions = bezier_wing.properties["span"]
-    leading_edge_xyz = bezier_wing.leading_edge
-    airfoil_files = bezier_wing.properties["airfoil_files"] # Assumindo que você salvou isso
-
-    # Calcular valores de referência
-    half_wing_area = np.trapezoid(chords, span_positions)
-    Sref = 2 * half_wing_area
-    Bref = 2 * span_positions[-1]
-    Cref = (2 / Sref) * np.trapezoid(chords**2, span_positions) # C M A
-    
-    with open(file_name, 'w') as f:
-        # --- Cabeçalho do Arquivo ---
-        f.write(f'{surface_name} from Bezier\n') # Título do caso [cite: 45]
-        f.write('#Mach\n')
-        f.write('0.0\n') # Mach [cite: 47]
-        f.write('#iYsym  iZsym  Zsym\n')
-        f.write('1  0  0.0\n') # Simetria no plano Y=0 [cite: 48]
-        f.write('#Sref   Cref   Bref\n')
-        f.write(f'{Sref:.4f}  {Cref:.4f}  {Bref:.4f}\n') # Dimensões de referência [cite: 49]
-        f.write('#Xref   Yref   Zref\n')
-        f.write(f'{0.25*Cref:.4f}  0.0  0.0\n') # Ponto de referência (CG, aprox. 25% da CMA) [cite: 50]
-        f.write('\n')
 
+from .avl_runner import _resolve_avl_path
+from .avl_session import AVLSession
+from .bulk_writer import write_if_changed
+
+
+class AVLControl(NamedTuple):
+    """
+    Uma superfície de controle (CONTROL) de uma seção; os controles são
+    numerados (d1, d2, ...) na ordem em que os nomes aparecem no arquivo.
+    """
+    name: str
+    gain: float = 1.0
+    x_hinge: float = 0.75
+    hinge_vector: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    sign_duplicate: float = 1.0
+
+
+class AVLSection(NamedTuple):
+    """Uma seção (SECTION) de uma superfície do AVL."""
+    xle: float
+    yle: float
+    zle: float
+    chord: float
+    ainc: float = 0.0
+    airfoil_file: Optional[str] = None
+    controls: Sequence[AVLControl] = ()
+
+
+class AVLSurface(NamedTuple):
+    """
+    Uma superfície (SURFACE) do AVL: asa, empenagem horizontal, deriva...
+
+    n_chord/c_space e n_span/s_space definem a malha de vórtices, que é o
+    principal custo de cada solução do AVL. translate, angle, y_duplicate e
+    component só são escritos quando informados.
+    """
+    name: str
+    sections: Sequence[AVLSection]
+    n_chord: int = 12
+    c_space: float = 1.0
+    n_span: int = 40
+    s_space: float = -2.0
+    translate: Optional[Tuple[float, float, float]] = None
+    angle: Optional[float] = None
+    y_duplicate: Optional[float] = None
+    component: Optional[int] = None
+
+
+def reference_dimensions(surface: AVLSurface, symmetric: bool = True) -> Tuple[float, float, float, float]:
+    """
+    Dimensões de referência (Sref, Cref, Bref, Xref) de uma superfície.
+
+    Sref e a CMA são integradas ao longo da envergadura; Xref fica a 25% da
+    CMA. As seções descrevem meia asa quando a configuração é simétrica
+    (``symmetric``, iYsym = 1) ou a superfície tem YDUPLICATE; caso
+    contrário, descrevem a envergadura inteira.
+    """
+    chords = np.array([section.chord for section in surface.sections], dtype=float)
+    span_positions = np.array([section.yle for section in surface.sections], dtype=float)
+
+    if symmetric or surface.y_duplicate is not None:
+        mirror = 0.0 if surface.y_duplicate is None else surface.y_duplicate
+        Sref = 2 * abs(np.trapezoid(chords, span_positions))
+        Bref = 2 * np.abs(span_positions - mirror).max()
+        Cref = 2 * abs(np.trapezoid(chords**2, span_positions)) / Sref # C M A
+    else:
+        Sref = abs(np.trapezoid(chords, span_positions))
+        Bref = span_positions.max() - span_positions.min()
+        Cref = abs(np.trapezoid(chords**2, span_positions)) / Sref
+    return Sref, Cref, Bref, 0.25 * Cref
+
+
+def surface_from_bezier(bezier_wing, surface_name="wing", twist=0.0, airfoil_files=None,
+                        n_chord=12, c_space=1.0, n_span=40, s_space=-2.0, **surface_options) -> AVLSurface:
+    """
+    Converte um BezierAirfoil (ou WingGeometry) numa AVLSurface.
+
+    Args:
+        bezier_wing: Asa de origem
+        surface_name: Nome da superfície
+        twist: Torção (Ainc, em graus) de cada seção, escalar ou array (n_paineis,)
+        airfoil_files: Arquivos de perfil de cada seção; por padrão,
+            properties["airfoil_files"]
+        n_chord, c_space, n_span, s_space: Malha de vórtices
+        **surface_options: Demais campos de AVLSurface (translate, angle, ...)
+    """
+    geometry = getattr(bezier_wing, "geometry", bezier_wing)
+    chords = geometry.chord
+    span_positions = geometry.span
+    leading_edge_xyz = geometry.leading_edge
+    if airfoil_files is None:
+        airfoil_files = geometry.properties["airfoil_files"] # Assumindo que você salvou isso
+    twist = np.broadcast_to(np.asarray(twist, dtype=float), span_positions.shape)
+
+    sections = [
+        AVLSection(xle=leading_edge_xyz[i, 1] - chords[i], # Posição x do bordo de ataque
+                   yle=span_positions[i], zle=0.0, chord=chords[i], ainc=twist[i],
+                   airfoil_file=airfoil_files[i])
+        for i in range(len(span_positions))
+    ]
+    return AVLSurface(surface_name, sections, n_chord=n_chord, c_space=c_space, n_span=n_span,
+                      s_space=s_space, **surface_options)
+
+
+def scale_lattice(surface: AVLSurface, factor: float) -> AVLSurface:
+    """Refina (factor > 1) ou engrossa (factor < 1) a malha de uma superfície."""
+    return surface._replace(n_chord=max(1, int(round(surface.n_chord * factor))),
+                            n_span=max(1, int(round(surface.n_span * factor))))
+
+
+def format_avl_config(surfaces: Sequence[AVLSurface], title: str, mach: float = 0.0,
+                      reference: Optional[Tuple[float, float, float, float]] = None,
+                      iysym: int = 1, izsym: int = 0, zsym: float = 0.0) -> str:
+    """
+    Texto de um arquivo .avl com uma ou mais superfícies.
+
+    Args:
+        surfaces: Superfícies, a primeira sendo a asa principal
+        title: Título do caso
+        mach: Número de Mach
+        reference: (Sref, Cref, Bref, Xref); por padrão, calculadas a partir
+            da primeira superfície
+        iysym, izsym, zsym: Simetria em y = 0 e em z = zsym (cabeçalho do
+            .avl: 1 simétrico, -1 antissimétrico, 0 sem simetria). Com
+            iysym != 0, superfícies com YDUPLICATE são rejeitadas: o AVL
+            somaria a imagem e a cópia
+    """
+    if iysym != 0:
+        duplicated = [surface.name for surface in surfaces if surface.y_duplicate is not None]
+        if duplicated:
+            raise ValueError(f'YDUPLICATE em {duplicated} exige iysym = 0 (a simetria em y = 0 já '
+                             f'espelha as superfícies).')
+    Sref, Cref, Bref, Xref = (reference if reference is not None
+                              else reference_dimensions(surfaces[0], symmetric=iysym != 0))
+
+    parts = []
+    # --- Cabeçalho do Arquivo ---
+    parts.append(f'{title}\n') # Título do caso [cite: 45]
+    parts.append('#Mach\n')
+    parts.append(f'{mach}\n') # Mach [cite: 47]
+    parts.append('#iYsym  iZsym  Zsym\n')
+    parts.append(f'{iysym}  {izsym}  {zsym}\n') # Simetria no plano Y=0 [cite: 48]
+    parts.append('#Sref   Cref   Bref\n')
+    parts.append(f'{Sref:.4f}  {Cref:.4f}  {Bref:.4f}\n') # Dimensões de referência [cite: 49]
+    parts.append('#Xref   Yref   Zref\n')
+    parts.append(f'{Xref:.4f}  0.0  0.0\n') # Ponto de referência (CG, aprox. 25% da CMA) [cite: 50]
+    parts.append('\n')
+
+    for surface in surfaces:
         # --- Definição da Superfície ---
-        f.write('#====================================================================\n')
-        f.write('SURFACE\n') # Palavra-chave SURFACE [cite: 69]
-        f.write(f'{surface_name}\n') # Nome da superfície [cite: 70]
-        f.write('#Nchord  Cspace   Nspan  Sspace\n')
-        f.write('12  1.0  40  -2.0\n') # Discretização (ajuste conforme necessário) [cite: 71, 265]
-        f.write('\n')
-
-        # --- Seções da Asa ---
-        for i in range(len(span_positions)):
-            f.write('#-----------------------------------------------------------------\n')
-            f.write('SECTION\n') # Palavra-chave SECTION [cite: 124]
-            f.write(f'#Xle Yle Zle   Chord   Ainc\n')
-            Xle = leading_edge_xyz[i, 1] - chords[i] # Posição x do bordo de ataque
-            Yle = span_positions[i] # Posição y
-            Zle = 0.0 # Posição z
-            chord = chords[i]
-            ainc = 0.0 # Ângulo de incidência/torção, pode ser parametrizado
-            f.write(f'{Xle:.4f}  {Yle:.4f}  {Zle:.4f}  {chord:.4f}  {ainc:.2f}\n') # [cite: 125]
-            
-            f.write('AFILE\n') # Palavra-chave AFILE [cite: 163]
-            f.write(f'{airfoil_files[i]}\n') # Caminho para o arquivo do aerofólio [cite: 164]
-            f.write('\n')
\ No newline at end of file
+        parts.append('#====================================================================\n')
+        parts.append('SURFACE\n') # Palavra-chave SURFACE [cite: 69]
+        parts.append(f'{surface.name}\n') # Nome da superfície [cite: 70]
+        parts.append('#Nchord  Cspace   Nspan  Sspace\n')
+        parts.append(f'{surface.n_chord}  {surface.c_space}  {surface.n_span}  {surface.s_space}\n') # Discretização [cite: 71, 265]
+        if surface.component is not None:
+            parts.append(f'COMPONENT\n{surface.component}\n')
+        if surface.y_duplicate is not None:
+            parts.append(f'YDUPLICATE\n{surface.y_duplicate}\n')
+        if surface.angle is not None:
+            parts.append(f'ANGLE\n{surface.angle}\n')
+        if surface.translate is not None:
+            parts.append('TRANSLATE\n{} {} {}\n'.format(*surface.translate))
+        parts.append('\n')
+
+        # --- Seções da Superfície ---
+        for section in surface.sections:
+            parts.append('#-----------------------------------------------------------------\n')
+            parts.append('SECTION\n') # Palavra-chave SECTION [cite: 124]
+            parts.append('#Xle Yle Zle   Chord   Ainc\n')
+            parts.append(f'{section.xle:.4f}  {section.yle:.4f}  {section.zle:.4f}  '
+                         f'{section.chord:.4f}  {section.ainc:.2f}\n') # [cite: 125]
+
+            if section.airfoil_file is not None:
+                parts.append('AFILE\n') # Palavra-chave AFILE [cite: 163]
+                parts.append(f'{section.airfoil_file}\n') # Caminho para o arquivo do aerofólio [cite: 164]
+            for control in section.controls:
+                parts.append('CONTROL\n')
+                parts.append('#Cname   Cgain  Xhinge  HingeVec     SgnDup\n')
+                parts.append('{}  {}  {}  {} {} {}  {}\n'.format(control.name, control.gain, control.x_hinge,
+                                                              *control.hinge_vector, control.sign_duplicate))
+            parts.append('\n')
+
+    return ''.join(parts)
+
+
+def write_avl_config(file_name, surfaces: Sequence[AVLSurface], title: str, mach: float = 0.0,
+                     reference: Optional[Tuple[float, float, float, float]] = None,
+                     iysym: int = 1, izsym: int = 0, zsym: float = 0.0) -> bool:
+    """
+    Grava um arquivo .avl com várias superfícies (ver format_avl_config).
+
+    Returns:
+        True se o arquivo foi escrito, False se já tinha o mesmo conteúdo
+    """
+    return write_if_changed(file_name, format_avl_config(surfaces, title, mach, reference, iysym, izsym, zsym))
+
+
+def create_avl_config_from_bezier(file_name, bezier_wing, surface_name="wing", twist=0.0,
+                                  n_chord=12, c_space=1.0, n_span=40, s_space=-2.0, extra_surfaces=()):
+    """
+    Cria um arquivo de configuração .avl completo a partir de um objeto BezierAirfoil
+    (ou diretamente de um WingGeometry).
+
+    Args:
+        file_name: Arquivo .avl gerado
+        bezier_wing: Asa principal
+        surface_name: Nome da superfície da asa
+        twist: Torção de cada seção (escalar ou array)
+        n_chord, c_space, n_span, s_space: Malha de vórtices da asa
+        extra_surfaces: AVLSurface adicionais (empenagens, deriva, ...)
+
+    Returns:
+        True se o arquivo foi escrito, False se já tinha o mesmo conteúdo
+    """
+    wing = surface_from_bezier(bezier_wing, surface_name, twist=twist, n_chord=n_chord,
+                               c_space=c_space, n_span=n_span, s_space=s_space)
+    return write_avl_config(file_name, [wing, *extra_surfaces], title=f'{surface_name} from Bezier')
+
+
+def select_discretization(file_name, surfaces: Sequence[AVLSurface], title: str, mach: float = 0.0,
+                          alpha: float = 5.0, tolerance: float = 0.01,
+                          factors: Sequence[float] = (0.25, 0.5, 0.75, 1.0),
+                          reference_factor: float = 2.0, avl_path=None,
+                          iysym: int = 1, izsym: int = 0, zsym: float = 0.0) -> Tuple[List[AVLSurface], dict]:
+    """
+    Escolhe a malha mais grossa que mantém CL e CD próximos aos de uma malha fina.
+
+    A malha de cada superfície é multiplicada por ``reference_factor`` para
+    obter a referência e por cada um dos ``factors`` (do mais grosso ao mais
+    fino) para os candidatos. O primeiro candidato com CL e CD a menos de
+    ``tolerance`` (erro relativo) da referência em ``alpha`` é gravado em
+    ``file_name``. Se nenhum atender, é usada a malha de referência.
+
+    Args:
+        file_name: Arquivo .avl gravado com a malha escolhida
+        surfaces: Superfícies com a malha nominal
+        title, mach, iysym, izsym, zsym: Como em write_avl_config
+        alpha: Ângulo de ataque da comparação
+        tolerance: Erro relativo admitido em CL e em CD
+        factors: Fatores de escala candidatos da malha
+        reference_factor: Fator de escala da malha de referência
+        avl_path: Executável do AVL (ou comando completo)
+
+    Returns:
+        Tuple com:
+            surfaces: superfícies com a malha escolhida
+            report: {'factor', 'reference': (CL, CD), 'candidates': [(fator, CL, CD), ...]}
+    """
+    avl_file = _resolve_avl_path(avl_path)
+    reference = reference_dimensions(surfaces[0], symmetric=iysym != 0)
+    symmetry = (iysym, izsym, zsym)
+    base, _ = os.path.splitext(file_name)
+    trial_file = f'{base}_lattice.avl'
+
+    def solve(factor):
+        scaled = [scale_lattice(surface, factor) for surface in surfaces]
+        write_avl_config(trial_file, scaled, title, mach, reference, *symmetry)
+        with closing(AVLSession(trial_file, avl_path=avl_file)) as session:
+            totals, _ = session.solve_alpha(alpha)
+        return scaled, totals['CLtot'], totals['CDtot']
+
+    try:
+        chosen, CL_ref, CD_ref = solve(reference_factor)
+        chosen_factor = reference_factor
+        candidates = []
+        for factor in sorted(factors):
+            scaled, CL, CD = solve(factor)
+            candidates.append((factor, CL, CD))
+            if abs(CL - CL_ref) <= tolerance * abs(CL_ref) and abs(CD - CD_ref) <= tolerance * abs(CD_ref):
+                chosen, chosen_factor = scaled, factor
+                break
+    finally:
+        if os.path.exists(trial_file):
+            os.remove(trial_file)
+
+    write_avl_config(file_name, chosen, title, mach, reference, *symmetry)
+    return chosen, {'factor': chosen_factor, 'reference': (CL_ref, CD_ref), 'candidates': candidates}
@@ -0,0 +1,111 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def _name_values(line: str, values: dict) -> None:
+    """Acumula os pares "nome = valor" de uma linha (ex.: "CLff  =   0.43563     CDff  =   0.00377")."""
+    parts = line.split('=')
+    for left, right in zip(parts[:-1], parts[1:]):
+        name = left.split()
+        value = right.split()
+        if not name or not value or name[-1] in values:
+            continue
+        try:
+            values[name[-1]] = float(value[0])
+        except ValueError:
+            # Valores como '*******' (estouro de formato do Fortran)
+            pass
+
+
+def _strip_columns(line: str):
+    """Retorna as colunas se a linha for o cabeçalho da tabela de faixas ('j ... cl ...')."""
+    # "c cl" é uma única coluna com espaço no nome.
+    columns = line.replace('c cl', 'c_cl').split()
+    if not columns or columns[0] != 'j' or 'cl' not in columns:
+        return None
+    return ['c cl' if column == 'c_cl' else column for column in columns]
+
+
+def parse_output(text: str) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+    """
+    Lê, numa única passada, uma saída 'ft' ou 'fs' do AVL.
+
+    As seções são identificadas pelo texto (linha de cabeçalho iniciada por
+    'j' e contendo 'cl'), e não por posições fixas de linha; as tabelas de
+    várias superfícies são concatenadas.
+
+    Args:
+        text: Conteúdo da saída do AVL
+
+    Returns:
+        Tuple com:
+            values: todos os pares "nome = valor" (em nomes repetidos vale a
+                primeira ocorrência, como em get_value)
+            strips: colunas da tabela de forças por faixa como arrays
+                ('j', 'Yle', 'Chord', 'Area', 'c cl', 'ai', 'cl_norm', 'cl',
+                'cd', 'cdv', 'cm_c/4', ...); vazio para a saída 'ft'
+    """
+    values = {}
+    columns = None
+    tables = []
+
+    lines = text.splitlines()
+    n_lines = len(lines)
+    i = 0
+    while i < n_lines:
+        line = lines[i]
+        i += 1
+        if '=' in line:
+            _name_values(line, values)
+            continue
+        if 'cl' not in line:
+            continue
+        table_columns = _strip_columns(line)
+        if table_columns is None:
+            continue
+
+        # Linhas seguintes com o mesmo número de campos formam a tabela.
+        tokens = []
+        while i < n_lines:
+            fields = lines[i].split()
+            if len(fields) != len(table_columns):
+                break
+            tokens.extend(fields)
+            i += 1
+        if columns is None:
+            columns = table_columns
+        elif table_columns != columns:
+            # Tabelas com colunas diferentes da primeira são ignoradas.
+            continue
+        try:
+            data = np.array(tokens, dtype=float)
+        except ValueError as error:
+            raise ValueError(f'Tabela de forças por faixa malformada após: {line.strip()!r}') from error
+        tables.append(data.reshape(-1, len(columns)))
+
+    strips = {}
+    if tables:
+        data = np.concatenate(tables) if len(tables) > 1 else tables[0]
+        strips = {name: data[:, i] for i, name in enumerate(columns)}
+    return values, strips
+
+
+def strip_cl_max(strips: Dict[str, np.ndarray]) -> float:
+    """
+    Maior cl de faixa usado no critério de estol.
+
+    Como no get_clmax original, que começava a ler uma linha depois do
+    cabeçalho da tabela, a primeira faixa não é considerada. Com cl de
+    forma (n_faixas, n_alphas), como em VortexLattice.solve, retorna um
+    array com um valor por alpha.
+    """
+    cl = np.asarray(strips['cl'])
+    cl_max = (cl[1:] if len(cl) > 1 else cl).max(axis=0)
+    return float(cl_max) if cl_max.ndim == 0 else cl_max
+
+
+def read_output(output_file: str) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+    """Lê o arquivo uma única vez e o interpreta com :func:`parse_output`."""
+    with open(output_file, 'r') as f:
+        return parse_output(f.read())
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from .avl_runner import get_aero_coef
+
+
+class SweepJob(NamedTuple):
+    """Uma varredura em alpha de uma configuração (mesmos argumentos de get_aero_coef)."""
+    config_file: str
+    Cl_max_airfoil: float
+    alpha_start: float
+    alpha_end: float
+    alpha_step: float
+
+
+def _run_job(job: SweepJob, avl_path, work_root: Optional[str], in_memory: bool = False) -> tuple:
+    """Executa uma varredura num diretório de trabalho exclusivo e o remove no final."""
+    if in_memory:
+        return get_aero_coef(*job, avl_path=avl_path, in_memory=True)
+    scratch_dir = tempfile.mkdtemp(prefix='avl_job_', dir=work_root)
+    try:
+        return get_aero_coef(job.config_file, job.Cl_max_airfoil, job.alpha_start, job.alpha_end,
+                             job.alpha_step, avl_path=avl_path, work_dir=scratch_dir)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def run_sweeps(jobs: Iterable[Union[SweepJob, Sequence]], max_workers: Optional[int] = None,
+               avl_path: Union[str, Sequence[str], None] = None,
+               work_root: Optional[str] = None, in_memory: bool = False) -> List[tuple]:
+    """
+    Executa várias varreduras em alpha em paralelo, uma por processo.
+
+    Cada job roda em seu próprio diretório temporário (dentro de
+    ``work_root``, se informado), de modo que as saídas do AVL de jobs
+    simultâneos nunca colidem. Os diretórios são apagados ao final de cada job.
+
+    Args:
+        jobs: Sequência de SweepJob, ou de tuplas
+            (config_file, Cl_max_airfoil, alpha_start, alpha_end, alpha_step)
+        max_workers: Número de processos; por padrão, os.cpu_count().
+            Com 1, os jobs rodam em série no processo atual.
+        avl_path: Executável do AVL (ou comando completo)
+        work_root: Diretório onde os diretórios de trabalho são criados
+        in_memory: Lê as saídas do stdout do AVL, sem diretórios de trabalho
+
+    Returns:
+        Lista com o resultado de get_aero_coef de cada job, na mesma ordem
+        dos jobs
+    """
+    jobs = [SweepJob(*job) for job in jobs]
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    if max_workers == 1:
+        return [_run_job(job, avl_path, work_root, in_memory) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_job, job, avl_path, work_root, in_memory) for job in jobs]
+        return [future.result() for future in futures]
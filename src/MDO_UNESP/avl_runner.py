@@ -1,15 +1,18 @@
-import subprocess
 import os
+import tempfile
+from contextlib import closing, contextmanager
 from math import radians
 import numpy as np
 import logging
-import tqdm
 # import pandas as pd
 
 
 import fileinput
 from typing import Optional
 
+from .avl_output import read_output, strip_cl_max
+from .avl_session import AVLSession, default_avl_path
+
 
 def get_value(output_file: str, variable_name: str) -> Optional[float]:
     """
@@ -150,10 +153,10 @@ def get_clmax(output_file):
         return None
 
     # 1. Encontrar a posição da coluna 'cl' no cabeçalho
-    header = lines[header_line_index].strip().split()
+    # A coluna "c cl" tem um espaço no nome; sem juntá-la (como fazia a
+    # versão com pandas), 'cl' apontaria para a coluna seguinte ('ai').
+    header = lines[header_line_index].replace('c cl', 'c_cl').strip().split()
     try:
-        # Procuramos por 'cl'. Pode ser que o cabeçalho original seja "c" "cl",
-        # que o pandas leria como duas colunas. Vamos procurar por 'cl'.
         cl_column_index = header.index('cl')
     except ValueError:
         logging.exception(f"Erro: Coluna 'cl' não encontrada no cabeçalho do arquivo: {header}")
@@ -202,56 +205,112 @@ def get_clmax(output_file):
 # Supondo que você tenha as funções get_clmax e get_value definidas em outro lugar
 # from your_helpers import get_clmax, get_value 
 
-def get_aero_coef(config_file, Cl_max_airfoil,alpha_start, alpha_end, alpha_step):
-    dir_name = os.path.dirname(os.path.abspath(__file__))
-    outputs_path = os.path.join(dir_name, 'outputs')
-    output_file = os.path.join(outputs_path, 'coeficients')
-    output2_file = os.path.join(outputs_path, 'coeficients_along_span')
-    avl_file = os.path.join(dir_name, 'avl.exe')
 
+def _resolve_avl_path(avl_path):
+    avl_file = avl_path if avl_path is not None else default_avl_path()
+    if avl_path is None and not os.path.exists(avl_file):
+        raise FileNotFoundError(f"Arquivo AVL não encontrado em '{avl_file}'")
+    return avl_file
+
+
+@contextmanager
+def _work_directory(work_dir, in_memory=False):
+    """Usa work_dir, ou cria um diretório temporário exclusivo removido ao final."""
+    if in_memory or work_dir is not None:
+        yield work_dir
+        return
+    with tempfile.TemporaryDirectory(prefix='avl_') as scratch_dir:
+        yield scratch_dir
+
+
+def _run_point(session, alpha, work_dir, cache=None, config_digest=None):
+    """
+    Resolve um alpha na sessão e lê as saídas.
+
+    Com work_dir None, as saídas são lidas do stdout do AVL, sem arquivos.
+    Com um cache, o AVL só é chamado se o ponto ainda não estiver nele.
+
+    Returns:
+        Tuple com (cl máximo ao longo da envergadura, ver strip_cl_max, CLtot, CDtot, Cmtot)
+    """
+    cached = None
+    if cache is not None:
+        key = cache.point_key(config_digest[0], alpha, config_digest[1])
+        cached = cache.get(key)
+
+    if cached is not None:
+        totals, strips = cached
+    elif work_dir is None:
+        totals, strips = session.solve_alpha(alpha)
+    else:
+        output_file = os.path.join(work_dir, 'coeficients')
+        output2_file = os.path.join(work_dir, 'coeficients_along_span')
+        session.run_alpha(alpha, output_file, output2_file)
+        totals, _ = read_output(output_file)
+        _, strips = read_output(output2_file)
+    if 'cl' not in strips:
+        raise ValueError(f'Tabela de forças por faixa não encontrada na saída do AVL (alpha={alpha})')
+    if cache is not None and cached is None:
+        cache.put(key, totals, strips)
+    return (strip_cl_max(strips), totals.get('CLtot'), totals.get('CDtot'), totals.get('Cmtot'))
+
+
+def get_aero_coef(config_file, Cl_max_airfoil,alpha_start, alpha_end, alpha_step, avl_path=None,
+                  work_dir=None, in_memory=False, cache=None, backend='avl'):
+    """
+    Varre o ângulo de ataque até o estol e retorna CL, CD e Cm por alpha.
+
+    A configuração é carregada uma única vez numa sessão persistente do AVL
+    (ver :class:`AVLSession`) e cada alpha é enviado para o mesmo menu OPER.
+
+    Args:
+        config_file: Arquivo .avl
+        Cl_max_airfoil: Cl máximo do perfil; a varredura para quando o cl
+            de alguma faixa da asa ultrapassa esse valor
+        alpha_start, alpha_end, alpha_step: Intervalo de alpha (np.arange)
+        avl_path: Executável do AVL (ou comando completo); por padrão, o
+            avl.exe distribuído com o pacote
+        work_dir: Diretório onde o AVL grava as saídas 'ft'/'fs'. Por
+            padrão, um diretório temporário exclusivo desta chamada, o que
+            permite rodar várias varreduras ao mesmo tempo.
+        in_memory: Se True, as saídas 'ft'/'fs' são lidas do stdout do AVL
+            e nenhum arquivo é gravado (work_dir é ignorado)
+        cache: AVLResultCache opcional; pontos já calculados não chamam o
+            AVL (o processo só é iniciado no primeiro ponto fora do cache)
+        backend: 'avl' ou 'vlm' (malha de vórtices em NumPy, ver
+            vlm.get_aero_coef_vlm; avl_path, work_dir, in_memory e cache são
+            ignorados)
+
+    Returns:
+        Tuple com os dicionários (CL_dict, CD_dict, Cm_dict) indexados por alpha
+    """
+    if backend == 'vlm':
+        from .vlm import get_aero_coef_vlm
+        return get_aero_coef_vlm(config_file, Cl_max_airfoil, alpha_start, alpha_end, alpha_step)
+    if backend != 'avl':
+        raise ValueError(f"backend deve ser 'avl' ou 'vlm', não '{backend}'")
+    avl_file = _resolve_avl_path(avl_path)
     alpha_range = np.arange(alpha_start, alpha_end, alpha_step)
 
     CL_dict = {}
     CD_dict = {}
     Cm_dict = {}
 
-    #Verifica se os diretorios existem e cria se não existirem
-    if not os.path.exists(outputs_path):
-        os.makedirs(outputs_path)
-    if not os.path.exists(avl_file):
-        raise FileNotFoundError(f"Arquivo AVL não encontrado em '{avl_file}'")
-    
-
-    # Garante que os arquivos existam antes do loop
-    open(output_file, 'w').close()
-    open(output2_file, 'w').close()
+    config_digest = cache.config_digest(config_file) if cache is not None else None
 
-    # Usar tqdm para mostrar barra de progresso
-    for alpha in alpha_range:
-        os.remove(output_file)
-        os.remove(output2_file)
+    # Uma única sessão do AVL para toda a varredura; o processo só é
+    # iniciado no primeiro ponto que precisar dele
+    with _work_directory(work_dir, in_memory) as work_dir, \
+            closing(AVLSession(config_file, avl_path=avl_file)) as session:
+        for alpha in alpha_range:
+            cl_max, CL, CD, Cm = _run_point(session, alpha, work_dir, cache, config_digest)
 
-
-        comm_string = f'load {config_file}\n oper\n a\n a\n {alpha}\n x\n ft\n{output_file}\nfs\n{output2_file}\n'
-        # logging.info(f'Running AVL for alpha={alpha} degrees with command string:\n{comm_string}')
-        
-        # Usar with para garantir que o processo seja fechado
-        #stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
-        with subprocess.Popen([avl_file], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, shell=True) as process:
-            process.communicate(bytes(comm_string, encoding='utf8'))
-        # logging.info(f'Finished AVL run for alpha={alpha} degrees')
-        # Supondo que as funções auxiliares (get_clmax, get_value) existam e funcionem
-        # logging.info(f'Calculating aerodynamic coefficients for alpha={alpha} degrees')
-        # logging.info(f"output_file: {output_file}")
-        # logging.info(f"output2_file: {output2_file}")
-        # logging.info(f"Cl_max_airfoil: {Cl_max_airfoil}")
-        # logging.info(f"Getting Cl_max from output2_file: {get_clmax(output2_file)}")
-        if get_clmax(output2_file) > Cl_max_airfoil:
-            break
-        else:
-            CL_dict[alpha] = get_value(output_file, 'CLtot')
-            CD_dict[alpha] = get_value(output_file, 'CDtot')
-            Cm_dict[alpha] = get_value(output_file, 'Cmtot')
+            if cl_max > Cl_max_airfoil:
+                break
+            else:
+                CL_dict[alpha] = CL
+                CD_dict[alpha] = CD
+                Cm_dict[alpha] = Cm
 
     # ----- PARTE DO PANDAS REMOVIDA -----
     # CL_df = pd.DataFrame.from_dict(CL_dict,  orient="index", columns=["CL"])
@@ -263,6 +322,176 @@ def get_aero_coef(config_file, Cl_max_airfoil,alpha_start, alpha_end, alpha_step
 
     # Retorna apenas os dicionários
     return CL_dict, CD_dict, Cm_dict
+
+
+def get_aero_coef_adaptive(config_file, Cl_max_airfoil, alpha_start, alpha_end, coarse_step=2.0,
+                           tolerance=0.25, avl_path=None, work_dir=None, in_memory=False,
+                           cache=None):
+    """
+    Localiza o alpha de estol com passos grossos seguidos de bisseção.
+
+    Alpha avança em passos de ``coarse_step`` enquanto o cl de todas as
+    faixas fica abaixo de ``Cl_max_airfoil`` (região linear). Quando algum
+    passo ultrapassa o limite, o intervalo [último alpha válido, primeiro
+    alpha estolado] é dividido ao meio até ficar menor que ``tolerance``.
+    O custo cai de (alpha_end - alpha_start)/passo execuções para
+    aproximadamente (alpha_end - alpha_start)/coarse_step + log2(coarse_step/tolerance).
+
+    Args:
+        config_file: Arquivo .avl
+        Cl_max_airfoil: Cl máximo do perfil
+        alpha_start, alpha_end: Intervalo de busca (alpha_end excluído, como em np.arange)
+        coarse_step: Passo da varredura grossa
+        tolerance: Largura máxima do intervalo final que contém o estol
+        avl_path: Executável do AVL (ou comando completo)
+        work_dir: Diretório das saídas do AVL (temporário por padrão)
+        in_memory: Se True, as saídas são lidas do stdout do AVL, sem arquivos
+        cache: AVLResultCache opcional
+
+    Returns:
+        Dicionário com:
+            alpha_stall: maior alpha amostrado sem estol (None se o primeiro
+                ponto já estiver estolado)
+            CL_max: CLtot em alpha_stall
+            bracket: (alpha_stall, primeiro alpha estolado); o segundo valor
+                é None se o estol não ocorreu no intervalo
+            CL, CD, Cm: dicionários com os pontos amostrados sem estol,
+                ordenados por alpha
+            n_runs: número de pontos avaliados
+    """
+    avl_file = _resolve_avl_path(avl_path)
+    samples = {}
+    lower = None
+    upper = None
+
+    config_digest = cache.config_digest(config_file) if cache is not None else None
+
+    # O processo do AVL só é iniciado no primeiro ponto que precisar dele
+    with _work_directory(work_dir, in_memory) as work_dir, \
+            closing(AVLSession(config_file, avl_path=avl_file)) as session:
+        def stalled(alpha):
+            cl_max, CL, CD, Cm = _run_point(session, alpha, work_dir, cache, config_digest)
+            if cl_max > Cl_max_airfoil:
+                return True
+            samples[alpha] = (CL, CD, Cm)
+            return False
+
+        n_runs = 0
+        for alpha in np.arange(alpha_start, alpha_end, coarse_step):
+            n_runs += 1
+            if stalled(alpha):
+                upper = alpha
+                break
+            lower = alpha
+
+        if lower is not None and upper is not None:
+            while upper - lower > tolerance:
+                middle = 0.5 * (lower + upper)
+                n_runs += 1
+                if stalled(middle):
+                    upper = middle
+                else:
+                    lower = middle
+
+    alphas = sorted(samples)
+    return {
+        'alpha_stall': lower,
+        'CL_max': samples[lower][0] if lower is not None else None,
+        'bracket': (lower, upper),
+        'CL': {alpha: samples[alpha][0] for alpha in alphas},
+        'CD': {alpha: samples[alpha][1] for alpha in alphas},
+        'Cm': {alpha: samples[alpha][2] for alpha in alphas},
+        'n_runs': n_runs,
+    }
+
+
+def get_operating_points(config_file, CL_targets, trim_control=None, Cm_target=0.0, avl_path=None,
+                         tolerance=1e-3):
+    """
+    Resolve diretamente os pontos de operação com os CL pedidos, sem varrer alpha.
+
+    Para cada alvo, o AVL recebe a restrição ``a c <CL>`` (e, com
+    ``trim_control``, ``<controle> pm <Cm_target>``) e resolve o ponto numa
+    única execução. Todos os alvos usam a mesma sessão do AVL.
+
+    Args:
+        config_file: Arquivo .avl
+        CL_targets: CL desejado, ou lista de CLs
+        trim_control: Controle usado para equilibrar o momento de arfagem
+            ('d1', 'd2', ...; precisa estar declarado no .avl com CONTROL)
+        Cm_target: Cm do equilíbrio
+        avl_path: Executável do AVL (ou comando completo)
+        tolerance: Erro admitido em CL (e em Cm) para considerar o ponto convergido
+
+    Returns:
+        Lista com um dicionário por alvo: CL_target, alpha, CL, CD, Cm,
+        converged, totals (todos os valores da saída 'ft', inclusive as
+        deflexões dos controles) e strips (cargas por faixa da saída 'fs')
+    """
+    avl_file = _resolve_avl_path(avl_path)
+    points = []
+    with closing(AVLSession(config_file, avl_path=avl_file)) as session:
+        for CL_target in np.atleast_1d(CL_targets):
+            constraints = [f'a c {CL_target}']
+            if trim_control is not None:
+                constraints.append(f'{trim_control} pm {Cm_target}')
+            totals, strips = session.solve_constraints(constraints)
+            converged = abs(totals['CLtot'] - CL_target) <= tolerance
+            if trim_control is not None:
+                converged = converged and abs(totals['Cmtot'] - Cm_target) <= tolerance
+            points.append({
+                'CL_target': float(CL_target),
+                'alpha': totals.get('Alpha'),
+                'CL': totals.get('CLtot'),
+                'CD': totals.get('CDtot'),
+                'Cm': totals.get('Cmtot'),
+                'converged': converged,
+                'totals': totals,
+                'strips': strips,
+            })
+    return points
+
+
+def get_stability_derivatives(config_file, alpha, avl_path=None):
+    """
+    Coeficientes e derivadas de estabilidade num ângulo de ataque, numa única solução do AVL.
+
+    Em vez de diferenças finitas em alpha (uma execução extra por
+    derivada), usa as derivadas que o AVL já calcula na solução do ponto
+    (comando 'st' do menu OPER).
+
+    Args:
+        config_file: Arquivo .avl
+        alpha: Ângulo de ataque em graus
+        avl_path: Executável do AVL (ou comando completo)
+
+    Returns:
+        Dicionário com:
+            CL, CD, Cm: coeficientes totais em alpha
+            CL_alpha, Cm_alpha: derivadas em relação a alpha (1/rad)
+            Xnp: posição x do ponto neutro
+            static_margin: (Xnp - Xref) / Cref
+            derivatives: todos os valores da saída 'st' (CYb, Clb, Cnb, ...)
+    """
+    avl_file = _resolve_avl_path(avl_path)
+    with closing(AVLSession(config_file, avl_path=avl_file)) as session:
+        values = session.solve_stability(alpha)
+    for name in ('CLa', 'Cma', 'Xnp', 'Xref', 'Cref'):
+        if name not in values:
+            raise ValueError(f"'{name}' não encontrado na saída 'st' do AVL (alpha={alpha})")
+    return {
+        'alpha': alpha,
+        'CL': values.get('CLtot'),
+        'CD': values.get('CDtot'),
+        'Cm': values.get('Cmtot'),
+        'CL_alpha': values['CLa'],
+        'Cm_alpha': values['Cma'],
+        'Xnp': values['Xnp'],
+        'static_margin': (values['Xnp'] - values['Xref']) / values['Cref'],
+        'derivatives': values,
+    }
+
+
 # def get_aero_coef(config_file, Cl_max_airfoil):
 #     dir_name = os.path.dirname(os.path.abspath(__file__))
 #     outputs_path = os.path.join(dir_name, 'outputs')
@@ -0,0 +1,319 @@
+import logging
+import os
+import queue
+import re
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .avl_output import parse_output
+
+
+# Prompts impressos pelo AVL ao final de cada comando. O prompt do menu
+# principal ("AVL   c>") não casa com o do OPER ("OPER (AVL)   c>") porque,
+# neste último, "AVL" é seguido de ")".
+TOP_PROMPT = re.compile(r'AVL\s+c>')
+OPER_PROMPT = re.compile(r'OPER \(AVL\)\s+c>')
+# Variável de controle do menu OPER ('d1', 'd2', ...)
+CONTROL = re.compile(r'd\d+', re.IGNORECASE)
+
+
+class AVLSessionError(RuntimeError):
+    """Erro de comunicação com o processo do AVL (queda, travamento ou saída inesperada)."""
+
+
+def default_avl_path() -> str:
+    """Caminho do executável do AVL distribuído junto com o pacote."""
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'avl.exe')
+
+
+def _as_command(avl_path: Union[str, Sequence[str]]) -> List[str]:
+    if isinstance(avl_path, str):
+        return [avl_path]
+    return list(avl_path)
+
+
+class AVLSession():
+    """
+    Sessão de longa duração com o AVL.
+
+    O arquivo de configuração é carregado uma única vez e os pontos de
+    operação são enviados, um após o outro, para a mesma sessão OPER através
+    dos pipes de stdin/stdout do processo. Se o processo cair ou deixar de
+    responder dentro de ``timeout`` segundos, ele é encerrado, reiniciado e o
+    ponto é repetido (até ``max_restarts`` vezes).
+
+    Args:
+        config_file: Arquivo .avl a ser carregado
+        avl_path: Executável do AVL, ou lista com o comando completo
+            (ex.: ``[sys.executable, 'fake_avl.py']``)
+        timeout: Tempo máximo, em segundos, de espera por cada prompt
+        max_restarts: Número de reinícios permitidos por ponto
+        cwd: Diretório de trabalho do processo (os caminhos AFILE do .avl
+            são resolvidos a partir dele)
+        run_file: Arquivo .run com casos de voo, carregado junto com a
+            configuração (ver solve_case)
+    """
+
+    def __init__(self, config_file: str, avl_path: Union[str, Sequence[str], None] = None,
+                 timeout: float = 30.0, max_restarts: int = 2, cwd: Optional[str] = None,
+                 run_file: Optional[str] = None):
+        self.config_file = config_file
+        self.run_file = run_file
+        self.command = _as_command(avl_path if avl_path is not None else default_avl_path())
+        self.timeout = timeout
+        self.max_restarts = max_restarts
+        self.cwd = cwd
+        self.restarts = 0
+
+        self._process = None
+        self._controls = set()
+        self._reader = None
+        self._chunks = None
+        self._buffer = ''
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Inicia o AVL, carrega a configuração e entra no menu OPER."""
+        env = dict(os.environ)
+        # Executáveis compilados com gfortran bufferizam a saída quando ela
+        # não é um terminal, o que esconderia os prompts.
+        env.setdefault('GFORTRAN_UNBUFFERED_PRECONNECTED', 'y')
+
+        self._process = subprocess.Popen(self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.DEVNULL, cwd=self.cwd, env=env)
+        self._buffer = ''
+        self._controls = set()
+        self._chunks = queue.Queue()
+        self._reader = threading.Thread(target=self._read_stdout,
+                                        args=(self._process.stdout, self._chunks), daemon=True)
+        self._reader.start()
+
+        self._expect(TOP_PROMPT)
+        self.send(f'load {self.config_file}', TOP_PROMPT)
+        if self.run_file is not None:
+            self.send(f'case {self.run_file}', TOP_PROMPT)
+        self.send('oper', OPER_PROMPT)
+
+    def close(self) -> None:
+        """Sai do AVL de forma ordenada, encerrando o processo se necessário."""
+        if self._process is None:
+            return
+        try:
+            if self.is_running:
+                self._process.stdin.write(b'\nquit\n')
+                self._process.stdin.flush()
+                self._process.wait(timeout=self.timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        finally:
+            self._kill()
+
+    def send(self, command: str, prompt: 're.Pattern' = OPER_PROMPT) -> str:
+        """
+        Envia um comando (uma ou mais linhas) e espera pelo próximo prompt.
+
+        Returns:
+            Texto impresso pelo AVL entre o envio e o prompt
+        """
+        if not self.is_running:
+            raise AVLSessionError('O processo do AVL não está em execução.')
+        try:
+            self._process.stdin.write(bytes(command + '\n', encoding='utf8'))
+            self._process.stdin.flush()
+        except OSError as error:
+            raise AVLSessionError(f'Falha ao escrever no AVL: {error}') from error
+        return self._expect(prompt)
+
+    def run_alpha(self, alpha: float, forces_file: str, strip_forces_file: str) -> None:
+        """
+        Resolve um ângulo de ataque e grava as saídas 'ft' e 'fs' do AVL.
+
+        Args:
+            alpha: Ângulo de ataque em graus
+            forces_file: Arquivo de saída das forças totais
+            strip_forces_file: Arquivo de saída das forças por faixa
+        """
+        self._with_restart(self._run_alpha, alpha, forces_file, strip_forces_file)
+
+    def _run_alpha(self, alpha, forces_file, strip_forces_file):
+        # O AVL pede confirmação para sobrescrever arquivos existentes.
+        for file_path in (forces_file, strip_forces_file):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+        self._release_controls()
+        self.send(f'a a {alpha}')
+        self.send('x')
+        self.send(f'ft\n{forces_file}')
+        self.send(f'fs\n{strip_forces_file}')
+
+    def solve_alpha(self, alpha: float) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+        """
+        Resolve um ângulo de ataque sem gravar arquivos.
+
+        As saídas 'ft' e 'fs' são pedidas na tela (nome de arquivo vazio) e
+        lidas diretamente do stdout do AVL.
+
+        Returns:
+            Tuple (totals, strips) como em :func:`avl_output.parse_output`
+        """
+        return self._with_restart(self._solve_alpha, alpha)
+
+    def _solve_alpha(self, alpha):
+        self._release_controls()
+        return self._solve_constraints((f'a a {alpha}',))
+
+    def load_cases(self, run_file: str) -> None:
+        """Troca o arquivo .run da sessão sem recarregar a configuração."""
+        self.run_file = run_file
+        if self.is_running:
+            # Linha vazia: volta do OPER para o menu principal
+            self.send('', TOP_PROMPT)
+            self.send(f'case {run_file}', TOP_PROMPT)
+            self.send('oper', OPER_PROMPT)
+
+    def solve_case(self, index: int) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+        """
+        Seleciona e resolve um caso do arquivo .run (numerados a partir de 1).
+
+        Returns:
+            Tuple (totals, strips) como em :func:`avl_output.parse_output`
+        """
+        if self.run_file is None:
+            raise ValueError('A sessão foi criada sem arquivo .run (run_file).')
+        return self._with_restart(self._solve_constraints, (f'{index}',))
+
+    def solve_constraints(self, constraints: Sequence[str]) -> Tuple[Dict[str, float], Dict[str, np.ndarray]]:
+        """
+        Resolve o ponto definido por comandos de restrição do menu OPER.
+
+        Cada comando fixa a variável que o AVL ajusta para satisfazer uma
+        condição, por exemplo ``'a c 0.5'`` (alpha tal que CL = 0.5) ou
+        ``'d1 pm 0'`` (controle 1 tal que Cm = 0). O AVL resolve o sistema
+        numa única execução ('x'). As restrições continuam valendo na sessão
+        até serem trocadas; run_alpha, solve_alpha e solve_stability, porém,
+        voltam os controles restringidos aqui à deflexão zero antes de resolver.
+
+        Returns:
+            Tuple (totals, strips) como em :func:`avl_output.parse_output`
+        """
+        return self._with_restart(self._solve_constraints, tuple(constraints))
+
+    def _solve_constraints(self, constraints):
+        for command in constraints:
+            name = command.split(maxsplit=1)[0] if command.strip() else ''
+            if CONTROL.fullmatch(name):
+                self._controls.add(name.lower())
+            self.send(command)
+        self.send('x')
+        totals, _ = parse_output(self.send('ft\n'))
+        _, strips = parse_output(self.send('fs\n'))
+        return totals, strips
+
+    def solve_stability(self, alpha: float) -> Dict[str, float]:
+        """
+        Resolve um ângulo de ataque e lê as derivadas de estabilidade ('st').
+
+        A saída 'st' traz as forças totais e as derivadas (CLa, Cma, CYb,
+        ..., por radiano) e o ponto neutro Xnp, calculados pelo AVL na mesma
+        solução; nenhuma execução extra é necessária.
+
+        Returns:
+            Todos os pares "nome = valor" da saída (CLtot, CDtot, Cmtot, Xref,
+            Cref, CLa, Cma, Xnp, ...)
+        """
+        return self._with_restart(self._solve_stability, alpha)
+
+    def _solve_stability(self, alpha):
+        self._release_controls()
+        self.send(f'a a {alpha}')
+        self.send('x')
+        values, _ = parse_output(self.send('st\n'))
+        return values
+
+    def _release_controls(self):
+        # Sem isso, um 'd1 pm 0' de solve_constraints deixaria as varreduras
+        # em alpha seguintes equilibradas sem aviso
+        for name in sorted(self._controls):
+            self.send(f'{name} {name} 0')
+        self._controls.clear()
+
+    def _with_restart(self, function, *args):
+        for attempt in range(self.max_restarts + 1):
+            try:
+                if not self.is_running:
+                    self._kill()
+                    self.start()
+                return function(*args)
+            except AVLSessionError as error:
+                logging.warning(f'AVL falhou (tentativa {attempt + 1}): {error}')
+                self._kill()
+                if attempt < self.max_restarts:
+                    self.restarts += 1
+        raise AVLSessionError(f'AVL não respondeu após {self.max_restarts + 1} tentativas '
+                              f'(args={args}).')
+
+    def _expect(self, prompt) -> str:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            match = prompt.search(self._buffer)
+            if match:
+                output = self._buffer[:match.end()]
+                self._buffer = self._buffer[match.end():]
+                return output
+            try:
+                chunk = self._chunks.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                raise AVLSessionError(f'Tempo esgotado ({self.timeout} s) esperando o prompt do AVL.')
+            if chunk is None:
+                raise AVLSessionError('O processo do AVL terminou inesperadamente.')
+            self._buffer += chunk
+
+    @staticmethod
+    def _read_stdout(stream, chunks):
+        # Lê em blocos (e não por linha): os prompts do AVL não terminam em '\n'.
+        fd = stream.fileno()
+        while True:
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                data = b''
+            if not data:
+                chunks.put(None)
+                return
+            chunks.put(data.decode('latin-1'))
+
+    def _kill(self):
+        process = self._process
+        if process is None:
+            return
+        if process.poll() is None:
+            process.kill()
+        try:
+            process.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            pass
+        # A thread de leitura precisa terminar antes de o descritor ser fechado.
+        if self._reader is not None:
+            self._reader.join(timeout=self.timeout)
+            self._reader = None
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        self._process = None
@@ -0,0 +1,118 @@
+from typing import Dict, List, Mapping, Tuple
+
+from .avl_runner import _calculate_geometry, _create_substitution_dict
+from .bulk_writer import write_if_changed
+
+
+# Prefixos dos marcadores reconhecidos por set_dimensions
+MARKER_PREFIXES = ('#Dimensoes_referencia_', '#Localizacao_cg_', '#arquivo_',
+                   '#Angulo_incidencia_', '#Dimensao_')
+
+
+def _surface_name(marker: str) -> str:
+    """Nome da superfície de um marcador ('#Dimensao_asa_secao_2' -> 'asa')."""
+    if marker.startswith('#Dimensao_'):
+        return marker[len('#Dimensao_'):].rsplit('_secao_', 1)[0]
+    if marker.startswith('#arquivo_'):
+        return marker[len('#arquivo_'):].rsplit('_', 1)[0]
+    for prefix in MARKER_PREFIXES:
+        if marker.startswith(prefix):
+            return marker[len(prefix):]
+    raise ValueError(f'Marcador desconhecido: {marker!r}')
+
+
+class ConfigTemplate():
+    """
+    Arquivo .avl com marcadores, interpretado uma única vez.
+
+    A linha seguinte a cada marcador (``#Dimensao_<sup>_secao_<i>``,
+    ``#arquivo_<sup>_<i>``, ``#Angulo_incidencia_<sup>``,
+    ``#Dimensoes_referencia_<sup>``, ``#Localizacao_cg_<sup>``) é um campo
+    variável; o texto entre os campos fica pré-montado. Gerar uma nova
+    configuração custa uma junção de O(campos) strings e uma escrita,
+    com o mesmo resultado de chamar set_dimensions para cada superfície.
+
+    Args:
+        text: Conteúdo do arquivo .avl com os marcadores
+    """
+
+    def __init__(self, text: str):
+        lines = text.splitlines()
+        slots: List[Tuple[int, str]] = []
+        next_marker = None
+        # Mesma regra de set_dimensions: a linha após um marcador é sempre substituída.
+        for i, line in enumerate(lines):
+            if next_marker is not None:
+                slots.append((i, next_marker))
+                next_marker = None
+            elif line.startswith(MARKER_PREFIXES):
+                next_marker = line
+
+        self.markers = [marker for _, marker in slots]
+        self.defaults = [lines[i] for i, _ in slots]
+        self.surfaces = list(dict.fromkeys(_surface_name(marker) for marker in self.markers))
+
+        # Texto fixo antes, entre e depois dos campos (com as quebras de linha)
+        self._chunks = []
+        start = 0
+        for i, _ in slots:
+            self._chunks.append(''.join(line + '\n' for line in lines[start:i]))
+            start = i + 1
+        self._chunks.append(''.join(line + '\n' for line in lines[start:]))
+
+    @classmethod
+    def from_file(cls, config_file: str) -> 'ConfigTemplate':
+        with open(config_file, 'r') as f:
+            return cls(f.read())
+
+    def render_values(self, substitutions: Mapping[str, str]) -> str:
+        """
+        Monta a configuração a partir do texto de cada campo.
+
+        Args:
+            substitutions: Texto do campo por marcador (campos ausentes mantêm
+                o valor do modelo)
+        """
+        parts = [self._chunks[0]]
+        for marker, default, chunk in zip(self.markers, self.defaults, self._chunks[1:]):
+            parts.append(substitutions.get(marker, default))
+            parts.append('\n')
+            parts.append(chunk)
+        return ''.join(parts)
+
+    def substitutions(self, surfaces: Mapping[str, Mapping]) -> Dict[str, str]:
+        """
+        Texto dos campos de cada superfície, como em set_dimensions.
+
+        Args:
+            surfaces: Parâmetros por nome de superfície; cada item tem os
+                argumentos de set_dimensions (airfoil1_file, ..., x, y1, y2,
+                y3, z, c1, c2, c3, angle_incidence, twist1, twist2, twist3)
+        """
+        substitutions = {}
+        for surface_name, parameters in surfaces.items():
+            if surface_name not in self.surfaces:
+                raise ValueError(f"Superfície '{surface_name}' não tem marcadores no modelo "
+                                 f"(disponíveis: {', '.join(self.surfaces)}).")
+            p = parameters
+            S_total, MAC, B_total = _calculate_geometry(p['c1'], p['c2'], p['c3'], p['y1'], p['y2'], p['y3'])
+            substitutions.update(_create_substitution_dict(
+                surface_name, p['airfoil1_file'], p['airfoil2_file'], p['airfoil3_file'],
+                p['x'], p['y1'], p['y2'], p['y3'], p['z'], p['c1'], p['c2'], p['c3'],
+                p['angle_incidence'], p['twist1'], p['twist2'], p['twist3'],
+                S_total, MAC, B_total
+            ))
+        return substitutions
+
+    def render(self, surfaces: Mapping[str, Mapping]) -> str:
+        """Monta a configuração com os parâmetros de uma ou mais superfícies."""
+        return self.render_values(self.substitutions(surfaces))
+
+    def write(self, config_file: str, surfaces: Mapping[str, Mapping]) -> bool:
+        """
+        Grava a configuração numa única escrita (nada é escrito se não mudou).
+
+        Returns:
+            True se o arquivo foi escrito
+        """
+        return write_if_changed(config_file, self.render(surfaces))
@@ -1,86 +1,287 @@
 import numpy as np
-from scipy.special import comb
-from matplotlib import pyplot as plt
-from matplotlib import cm
-from mpl_toolkits.mplot3d import axes3d
 import os
 import logging
-class BezierAirfoil():
-    def __init__(self, properties):
-        self.properties = properties
-        self.properties["te_x1"] = properties["semi_span"]/3
-        self.properties["te_x2"] = 2 * properties["semi_span"]/3
-
-        self.properties["te_y1"] = 0.1
-        self.properties["te_y2"] = 0.15
-        self.properties["te_y3"] = 0.3
-
-
-        self.properties["le_x1"] = properties["semi_span"]/3
-        self.properties["le_x2"] = 2 * properties["semi_span"]/3
-
-        self.properties["le_y1"]  = 1.1
-        self.properties["le_y2"] = 0.9
-        self.properties["le_y3"] = self.properties["te_y3"] + properties["chord_tip"]
-
-        self.properties["span"] = np.linspace(0., np.pi/2, properties['number_of_panels']) *self.properties["semi_span"]
-        span_points = np.array((0, self.properties["semi_span"]/3, 2*self.properties["semi_span"]/3, self.properties["semi_span"]))
-        lagrange_basis = self.lagrange_polynomials(span_points)
+import functools
+import math
+
+from .bulk_writer import format_coordinates, write_if_changed
+from .wing_geometry import SPANWISE_ROWS, WingGeometry
+
+
+def bernstein_matrix(degree, t):
+    """
+    Matriz (len(t), degree + 1) com os polinômios de Bernstein avaliados em t.
+
+    As matrizes são memorizadas por (grau, vetor t): numa otimização as
+    estações de envergadura não mudam, e cada curva vira um único produto
+    matricial. O array retornado é somente leitura.
+    """
+    t = np.ascontiguousarray(t, dtype=float)
+    return _bernstein_matrix(int(degree), t.tobytes())
+
+
+def lagrange_matrix(nodes, x):
+    """Matriz (len(x), len(nodes)) com a base de Lagrange dos nós avaliada em x (memorizada, somente leitura)."""
+    nodes = np.ascontiguousarray(nodes, dtype=float)
+    x = np.ascontiguousarray(x, dtype=float)
+    return _lagrange_matrix(nodes.tobytes(), x.tobytes())
+
+
+def clear_basis_cache():
+    """Esvazia o cache das matrizes de Bernstein e de Lagrange."""
+    _bernstein_matrix.cache_clear()
+    _lagrange_matrix.cache_clear()
+
+
+@functools.lru_cache(maxsize=None)
+def _binomial(degree):
+    # math.comb (exato) em vez de scipy.special.comb: evita importar o scipy
+    return np.array([math.comb(degree, k) for k in range(degree + 1)], dtype=float)
+
+
+@functools.lru_cache(maxsize=128)
+def _bernstein_matrix(degree, t_bytes):
+    t = np.frombuffer(t_bytes)[:, None]
+    i = np.arange(degree + 1)
+    matrix = _binomial(degree) * t ** i * (1 - t) ** (degree - i)
+    matrix.flags.writeable = False
+    return matrix
+
+
+@functools.lru_cache(maxsize=128)
+def _lagrange_matrix(nodes_bytes, x_bytes):
+    nodes = np.frombuffer(nodes_bytes)
+    x = np.frombuffer(x_bytes)
+    differences = x[:, None, None] - nodes[None, None, :]        # (len(x), 1, n)
+    denominators = nodes[:, None] - nodes[None, :]                 # (n, n)
+    n = len(nodes)
+    off_diagonal = ~np.eye(n, dtype=bool)
+    factors = np.where(off_diagonal, differences / np.where(off_diagonal, denominators, 1.0), 1.0)
+    matrix = factors.prod(axis=2)
+    matrix.flags.writeable = False
+    return matrix
+
+
+def naca_4digits_batch(camber, camber_pos, thickness, npts=100, spacing="uniform"):
+    """
+    Perfis NACA de 4 dígitos de várias seções numa única passada NumPy.
+
+    Os ramos da linha de cambra (antes e depois da posição de cambra máxima)
+    são escolhidos com np.where. Com ``spacing="cosine"`` os pontos se
+    concentram nos bordos de ataque e de fuga, o que dá ao AVL a mesma
+    precisão com menos pontos.
+
+    Args:
+        camber, camber_pos, thickness: Arrays (n,) com os parâmetros de cada seção
+        npts: Número de pontos em cada superfície (extradorso e intradorso)
+        spacing: Distribuição dos pontos na corda, "uniform" ou "cosine"
+
+    Returns:
+        Array (2, n, 2·npts − 1) com as coordenadas x e y de cada seção: do
+        bordo de fuga pelo extradorso até o bordo de ataque e de volta pelo
+        intradorso
+    """
+    if spacing == "uniform":
+        x = np.linspace(0, 1., npts)
+    elif spacing == "cosine":
+        x = 0.5 * (1 - np.cos(np.linspace(0, np.pi, npts)))
+    else:
+        raise ValueError(f"Espaçamento desconhecido: {spacing!r} (use 'uniform' ou 'cosine').")
+
+    m = np.asarray(camber, dtype=float).reshape(-1, 1)
+    p = np.asarray(camber_pos, dtype=float).reshape(-1, 1)
+    t = np.asarray(thickness, dtype=float).reshape(-1, 1)
+
+    yt = 5 * t * (0.2969 * np.sqrt(x) - 0.1260*x - 0.3516*x**2 + 0.2843*x**3 - 0.1015*x**4)
+
+    forward = x <= p
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mid = np.where(forward,
+                       m / p**2 * (2 * p * x - x**2.),
+                       m / (1 - p)**2 * ((1 - 2*p) + 2 * p * x - x**2.))
+        dmid = np.where(forward,
+                        2 * m / p**2 * (p - x),
+                        2 * m / (1 - p)**2 * (p - x))
+
+    theta = np.arctan(dmid)
+    sin = yt * np.sin(theta)
+    cos = yt * np.cos(theta)
+
+    # Extradorso do bordo de fuga ao de ataque, intradorso sem repetir o bordo de ataque
+    sections = np.empty((2, len(m), 2 * npts - 1))
+    sections[0, :, :npts] = (x - sin)[:, ::-1]
+    sections[0, :, npts:] = (x + sin)[:, 1:]
+    sections[1, :, :npts] = (mid + cos)[:, ::-1]
+    sections[1, :, npts:] = (mid - cos)[:, 1:]
+    return sections
 
-        leading_edge_points = np.array(((0., self.properties["chord_root"]), (self.properties["le_x1"], self.properties["le_y1"]), (self.properties["le_x2"], self.properties["le_y2"]), (self.properties["semi_span"], self.properties["le_y3"])))
-        trailing_edge_points = np.array(((0., 0.), (self.properties["te_x1"], self.properties["te_y1"]), (self.properties["te_x2"], self.properties["te_y2"]), (self.properties["semi_span"], self.properties["te_y3"])))
-
-        thickness_points = np.array(properties["thicks"])
-        camber_points = np.array(properties["cambers"])
-        camber_pos_points = np.array(properties["cambers_pos"])
-
-        self.leading_edge = self.bezier_curve(leading_edge_points, self.properties["span"])
-        trailing_edge = self.bezier_curve(trailing_edge_points, self.properties["span"])
-
-        self.properties["chord"] = self.leading_edge[:,1] - trailing_edge[:,1]
-
-        self.properties["thickness"] = self.lagrange_curve(lagrange_basis, self.properties["span"], thickness_points)
-        self.properties["camber"]= self.lagrange_curve(lagrange_basis, self.properties["span"], camber_points)
-        self.properties["camber_pos"] = self.lagrange_curve(lagrange_basis, self.properties["span"], camber_pos_points)
 
+class BezierAirfoil():
+    def __init__(self, properties, _arrays=None, _index=0):
+        if _arrays is None:
+            _arrays = self._build([properties])
 
-        self.ze_points = []
-        self.ye_points = []
-        self.xe_points = []
+        # A geometria guarda views nos blocos do lote; properties é uma visão
+        # compatível com o antigo dicionário (chaves 'span', 'xu_0', ...).
+        self.geometry = WingGeometry(properties, _arrays["spanwise"][_index], _arrays["sections"][_index])
+        self.properties = self.geometry.properties
 
-    
-        for i in range(self.properties["number_of_panels"]):
-            # Certifique-se de que naca_4digits retorna coordenadas normalizadas (x/c, y/c)
-            
-            xu, yu = self.naca_4digits(self.properties["camber"][i], self.properties["camber_pos"][i], self.properties["thickness"][i])
-            self.properties[f"xu_{i}"] = xu
-            self.properties[f"yu_{i}"] = yu
-            z = np.ones(xu.shape) * self.properties["span"][i]
-            self.properties[f"z_{i}"] = z
-
-            #Isso aqui é pra pegar os pontos do bordo de ataque
-            idx_min = np.argmin(xu)
-            # Coordenadas dos pontos mínimos
-            z_min = z[idx_min]
-            xu_min = xu[idx_min]
-            yu_min = yu[idx_min]
-            self.ze_points.append(z_min)
-            self.ye_points.append(yu_min)
-            self.xe_points.append(xu_min)
-            logging.info(f"--- Seção {i} ---")
-            logging.info(f"Corda: {self.properties['chord'][i]:.4f}")
-            logging.info(f"Espessura: {self.properties['thickness'][i]:.4f}")
-            logging.info(f"Cambra: {self.properties['camber'][i]:.4f}")
-            logging.info(f"Pos. Cambra: {self.properties['camber_pos'][i]:.4f}")
-
-
-        # self.properties["xe_points"] = [np.mean(self.properties[])]
-        self.properties["ze_points"] = [np.mean(self.properties[f"z_{i}"]) for i in range(self.properties["number_of_panels"])]
-
-    def write_airfoil_files(self, output_dir='airfoils'):
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            for i in range(self.properties["number_of_panels"]):
+                logging.info(f"--- Seção {i} ---")
+                logging.info(f"Corda: {self.properties['chord'][i]:.4f}")
+                logging.info(f"Espessura: {self.properties['thickness'][i]:.4f}")
+                logging.info(f"Cambra: {self.properties['camber'][i]:.4f}")
+                logging.info(f"Pos. Cambra: {self.properties['camber_pos'][i]:.4f}")
+
+    def __getstate__(self):
+        return {"geometry": self.geometry}
+
+    def __setstate__(self, state):
+        self.geometry = state["geometry"]
+        self.properties = self.geometry.properties
+
+    @property
+    def leading_edge(self):
+        return self.geometry.leading_edge
+
+    @property
+    def xu(self):
+        return self.geometry.xu
+
+    @property
+    def yu(self):
+        return self.geometry.yu
+
+    @property
+    def z(self):
+        return self.geometry.z
+
+    #Isso aqui é pra pegar os pontos do bordo de ataque
+    @property
+    def ze_points(self):
+        return list(self.geometry.span)
+
+    @property
+    def ye_points(self):
+        idx_min = np.argmin(self.xu, axis=1)
+        return list(self.yu[np.arange(len(idx_min)), idx_min])
+
+    @property
+    def xe_points(self):
+        idx_min = np.argmin(self.xu, axis=1)
+        return list(self.xu[np.arange(len(idx_min)), idx_min])
+
+    @classmethod
+    def batch(cls, properties_list):
+        """
+        Constrói uma população de asas numa única chamada.
+
+        Todas as asas do lote precisam ter o mesmo 'number_of_panels' (e os
+        mesmos 'airfoil_points' e 'airfoil_spacing', se informados). As
+        curvas e os perfis de todas as seções de todas as asas são calculados
+        juntos, em operações vetorizadas, e cada asa guarda views nesses arrays.
+
+        Args:
+            properties_list: Lista de dicionários de propriedades
+
+        Returns:
+            Lista de BezierAirfoil, na mesma ordem
+        """
+        properties_list = list(properties_list)
+        arrays = cls._build(properties_list)
+        return [cls(properties, _arrays=arrays, _index=k) for k, properties in enumerate(properties_list)]
+
+    @staticmethod
+    def _build(properties_list):
+        """Calcula a geometria de um lote de asas; cada array tem a asa no primeiro eixo."""
+        number_of_panels = {properties["number_of_panels"] for properties in properties_list}
+        if len(number_of_panels) != 1:
+            raise ValueError("Todas as asas do lote devem ter o mesmo 'number_of_panels'.")
+        n_panels = number_of_panels.pop()
+
+        semi_span = np.array([properties["semi_span"] for properties in properties_list], dtype=float)
+        chord_root = np.array([properties["chord_root"] for properties in properties_list], dtype=float)
+        chord_tip = np.array([properties["chord_tip"] for properties in properties_list], dtype=float)
+        ones = np.ones_like(semi_span)
+
+        arrays = {
+            "te_x1": semi_span/3, "te_x2": 2 * semi_span/3,
+            "te_y1": 0.1 * ones, "te_y2": 0.15 * ones, "te_y3": 0.3 * ones,
+            "le_x1": semi_span/3, "le_x2": 2 * semi_span/3,
+            "le_y1": 1.1 * ones, "le_y2": 0.9 * ones,
+        }
+        arrays["le_y3"] = arrays["te_y3"] + chord_tip
+
+        # (n_asas, n_paineis)
+        span_fraction = np.linspace(0., np.pi/2, n_panels)
+        span = span_fraction[None, :] * semi_span[:, None]
+        arrays["span"] = span
+
+        # As curvas são avaliadas em coordenadas normalizadas pela envergadura,
+        # portanto as matrizes de base são as mesmas para todas as asas.
+        t = span_fraction / span_fraction[-1] if span_fraction[-1] > 0 else span_fraction
+        bernstein = bernstein_matrix(3, t)
+        span_points = np.array((0, 1/3, 2/3, 1.))
+        lagrange = lagrange_matrix(span_points, span_fraction)
+
+        zeros = np.zeros_like(semi_span)
+        leading_edge_points = np.stack([
+            np.stack([zeros, chord_root], axis=1),
+            np.stack([arrays["le_x1"], arrays["le_y1"]], axis=1),
+            np.stack([arrays["le_x2"], arrays["le_y2"]], axis=1),
+            np.stack([semi_span, arrays["le_y3"]], axis=1),
+        ], axis=1)                                                   # (n_asas, 4, 2)
+        trailing_edge_points = np.stack([
+            np.stack([zeros, zeros], axis=1),
+            np.stack([arrays["te_x1"], arrays["te_y1"]], axis=1),
+            np.stack([arrays["te_x2"], arrays["te_y2"]], axis=1),
+            np.stack([semi_span, arrays["te_y3"]], axis=1),
+        ], axis=1)
+
+        n_designs = len(properties_list)
+        spanwise = np.empty((n_designs, len(SPANWISE_ROWS), n_panels))
+        rows = {name: i for i, name in enumerate(SPANWISE_ROWS)}
+        spanwise[:, rows["span"]] = span
+
+        leading_edge = bernstein @ leading_edge_points               # (n_asas, n_paineis, 2)
+        trailing_edge = bernstein @ trailing_edge_points
+        spanwise[:, rows["le_x"]] = leading_edge[:, :, 0]
+        spanwise[:, rows["le_y"]] = leading_edge[:, :, 1]
+        spanwise[:, rows["te_x"]] = trailing_edge[:, :, 0]
+        spanwise[:, rows["te_y"]] = trailing_edge[:, :, 1]
+        spanwise[:, rows["chord"]] = leading_edge[:, :, 1] - trailing_edge[:, :, 1]
+
+        for key, points_key in (("thickness", "thicks"), ("camber", "cambers"), ("camber_pos", "cambers_pos")):
+            points = np.array([properties[points_key] for properties in properties_list], dtype=float)
+            spanwise[:, rows[key]] = points @ lagrange.T
+
+        airfoil = {(properties.get("airfoil_points", 100), properties.get("airfoil_spacing", "uniform"))
+                   for properties in properties_list}
+        if len(airfoil) != 1:
+            raise ValueError("Todas as asas do lote devem ter os mesmos 'airfoil_points' e 'airfoil_spacing'.")
+        npts, spacing = airfoil.pop()
+
+        coordinates = naca_4digits_batch(spanwise[:, rows["camber"]].ravel(),
+                                         spanwise[:, rows["camber_pos"]].ravel(),
+                                         spanwise[:, rows["thickness"]].ravel(),
+                                         npts=npts, spacing=spacing)
+        sections = np.empty((n_designs, 2, n_panels, coordinates.shape[2]))
+        sections[:] = coordinates.reshape(2, n_designs, n_panels, -1).transpose(1, 0, 2, 3)
+        return {"spanwise": spanwise, "sections": sections}
+
+    def write_airfoil_files(self, output_dir='airfoils', library=None):
             """
             Escreve os arquivos de coordenadas .dat para cada seção da asa.
+
+            Cada arquivo é montado de uma vez e gravado numa única escrita;
+            arquivos cujo conteúdo não mudou desde o último projeto não são
+            reescritos. Com ``library`` (um AirfoilLibrary), as seções usam os
+            arquivos compartilhados da biblioteca, e ``output_dir`` é ignorado.
             """
+            if library is not None:
+                return library.wing_files(self)
+
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
 
@@ -90,14 +291,7 @@ class BezierAirfoil():
                 file_path = os.path.join(output_dir, f'{airfoil_name}.dat')
 
                 # Pega as coordenadas normalizadas
-                x_coords = self.properties[f"xu_{i}"]
-                y_coords = self.properties[f"yu_{i}"]
-
-                with open(file_path, 'w') as f:
-                    f.write(f'{airfoil_name}\n')
-                    for x, y in zip(x_coords, y_coords):
-                        f.write(f'{x:.6f} {y:.6f}\n')
-                
+                write_if_changed(file_path, format_coordinates(airfoil_name, self.xu[i], self.yu[i]))
                 airfoil_files.append(file_path)
                 
             return airfoil_files
@@ -121,8 +315,6 @@ class BezierAirfoil():
     def bezier_curve(self, control_points, coords):
         control_points = np.array(control_points)
         n = len(control_points) - 1
-        d = control_points.shape[1]
-        num_points = len(coords)
 
         # --- CORREÇÃO FUNDAMENTAL AQUI ---
         # O parâmetro 't' de uma curva de Bezier DEVE estar no intervalo [0, 1].
@@ -131,22 +323,16 @@ class BezierAirfoil():
         max_coord = coords[-1] if coords[-1] > 0 else 1.0
         t = coords / max_coord  # Normaliza o vetor (ex: [0,..,3.0] -> [0,..,1.0])
 
-        curve = np.zeros((num_points, d))
-
-        for i in range(n + 1):
-            binomial = comb(n, i)
-            bernstein = binomial * (t ** i) * ((1 - t) ** (n - i))
-            curve += np.outer(bernstein, control_points[i])
-
-        return curve
+        return bernstein_matrix(n, t) @ control_points
     
     def lagrange_curve(self,lagrange_basis, x, y):
-        curve = np.zeros(x.shape)
-
-        for i in range(len(y)):
-            curve += y[i] * lagrange_basis[i](x)
-
-        return curve
+        # lagrange_basis pode ser a lista de polinômios de lagrange_polynomials
+        # ou diretamente os nós; com os nós a base vem do cache (lagrange_matrix).
+        if callable(lagrange_basis[0]):
+            basis = np.array([polynomial(x) * np.ones(x.shape) for polynomial in lagrange_basis]).T
+        else:
+            basis = lagrange_matrix(lagrange_basis, x)
+        return basis @ np.asarray(y, dtype=float)
     
     # def naca_4digits(self, camber, camber_pos, thickness): # Removido 'chord'
     #         x = np.linspace(0, 1., 100)
@@ -177,48 +363,15 @@ class BezierAirfoil():
     #         # Não multiplique por 'chord' aqui!
     #         return np.array((*xu[::-1], *xl)).flatten(), np.array((*yu[::-1], *yl)).flatten()
     def naca_4digits(self, camber, camber_pos, thickness):
-        x = np.linspace(0, 1., 100)
-        
-        # Garantir que o bordo de ataque (x=0) esteja presente
-        if x[0] != 0:
-            x = np.concatenate([[0], x])
-        
-        x_start = x[x <= camber_pos]
-        x_finish = x[x > camber_pos]
-
-        yt = 5 * thickness * (0.2969 * np.sqrt(x) - 0.1260*x - 0.3516*x**2 + 0.2843*x**3 - 0.1015*x**4)
-
-        mid_start = camber / camber_pos**2 * (2 * camber_pos * x_start - x_start**2.)
-        mid_finish = camber / (1 - camber_pos)**2 * ((1 - 2*camber_pos) + 2 * camber_pos * x_finish - x_finish**2.)
-
-        dmid_start = 2 * camber / camber_pos**2 * (camber_pos - x_start)
-        dmid_finish = 2 * camber / (1 - camber_pos)**2 * (camber_pos - x_finish)
-
-        mid = np.concatenate([mid_start, mid_finish])
-        dmid = np.concatenate([dmid_start, dmid_finish])
-
-        theta = np.arctan(dmid)
-        
-        xu = x - yt * np.sin(theta)
-        yu = mid + yt * np.cos(theta)
-        xl = x + yt * np.sin(theta)
-        yl = mid - yt * np.cos(theta)
-        
-        # Garantir ordenação correta: do bordo de fuga superior para o inferior
-        # Primeiro: pontos superiores do TE ao LE
-        x_upper = xu[::-1]
-        y_upper = yu[::-1]
-        
-        # Depois: pontos inferiores do LE ao TE (excluindo o LE para não duplicar)
-        x_lower = xl[1:]
-        y_lower = yl[1:]
-        
-        # Combinar todos os pontos
-        x_total = np.concatenate([x_upper, x_lower])
-        y_total = np.concatenate([y_upper, y_lower])
-        
-        return x_total, y_total
+        x_total, y_total = naca_4digits_batch([camber], [camber_pos], [thickness],
+                                              npts=self.properties.get("airfoil_points", 100),
+                                              spacing=self.properties.get("airfoil_spacing", "uniform"))
+        return x_total[0], y_total[0]
     def plot(self):
+            # matplotlib só é importado aqui: os processos de cálculo não pagam o custo
+            from matplotlib import pyplot as plt
+            from mpl_toolkits.mplot3d import axes3d  # noqa: F401 (registra a projeção '3d')
+
             fig = plt.figure()
             ax = fig.add_subplot(projection='3d')
 
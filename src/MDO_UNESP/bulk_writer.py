@@ -0,0 +1,77 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+
+# Caminho absoluto -> (sha256, st_mtime_ns, st_size) da última escrita feita por este processo
+_written = {}
+
+# Permissões de um arquivo novo, como as de open(): 0o666 sem os bits da umask
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+def format_coordinates(name: str, x, y) -> str:
+    """
+    Texto de um arquivo de perfil (.dat) numa única operação de formatação.
+
+    Equivale a escrever ``f'{x:.6f} {y:.6f}\\n'`` ponto a ponto, mas monta o
+    arquivo inteiro com um único ``%`` sobre os valores intercalados.
+    """
+    values = np.empty(2 * len(x))
+    values[0::2] = x
+    values[1::2] = y
+    return f'{name}\n' + ('%.6f %.6f\n' * len(x)) % tuple(values.tolist())
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    """
+    Grava ``text`` em ``path`` de forma atômica, se o conteúdo mudou.
+
+    O hash do conteúdo gravado fica guardado em memória junto com a data de
+    modificação e o tamanho do arquivo; enquanto o arquivo não for alterado
+    por fora, a comparação não precisa ler o disco. Para arquivos ainda não
+    vistos, o conteúdo atual é lido e comparado.
+
+    Returns:
+        True se o arquivo foi (re)escrito, False se já tinha o mesmo conteúdo
+    """
+    data = text.encode('utf8')
+    digest = hashlib.sha256(data).digest()
+    path = os.path.abspath(path)
+
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        stat = None
+    if stat is not None:
+        if _written.get(path) == (digest, stat.st_mtime_ns, stat.st_size):
+            return False
+        if path not in _written and stat.st_size == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    _written[path] = (digest, stat.st_mtime_ns, stat.st_size)
+                    return False
+
+    # Arquivo temporário + os.replace: outros processos (AVL, workers do
+    # pool) leem o conteúdo antigo ou o novo, nunca um arquivo truncado
+    fd, temporary = tempfile.mkstemp(prefix='.tmp_', dir=os.path.dirname(path))
+    try:
+        if hasattr(os, 'fchmod'):
+            # mkstemp cria com 0o600: mantém as permissões do arquivo substituído
+            os.fchmod(fd, stat.st_mode & 0o7777 if stat is not None else _NEW_FILE_MODE)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            # os.replace não altera a data de modificação nem o tamanho
+            stat = os.fstat(fd)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    _written[path] = (digest, stat.st_mtime_ns, stat.st_size)
+    return True
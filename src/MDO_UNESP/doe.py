@@ -0,0 +1,302 @@
+import itertools
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .avl_generator import create_avl_config_from_bezier
+from .avl_runner import get_aero_coef
+from .bezier_airfoil import BezierAirfoil
+
+_VARIABLE = re.compile(r'^(\w+)(?:\[(\d+)\])?$')
+_CHUNK = re.compile(r'^chunk_(\d+)\.npz$')
+
+
+def latin_hypercube(n_samples: int, bounds: Mapping[str, Tuple[float, float]], seed=None) -> np.ndarray:
+    """
+    Amostragem por hipercubo latino.
+
+    Args:
+        n_samples: Número de projetos
+        bounds: Limites (mínimo, máximo) por variável
+        seed: Semente (a mesma semente gera as mesmas amostras, o que permite retomar um estudo)
+
+    Returns:
+        Array (n_samples, n_variaveis), colunas na ordem de ``bounds``
+    """
+    rng = np.random.default_rng(seed)
+    lower, upper = np.array(list(bounds.values()), dtype=float).T
+    strata = np.argsort(rng.random((len(lower), n_samples)), axis=1).T
+    unit = (strata + rng.random((n_samples, len(lower)))) / n_samples
+    return lower + unit * (upper - lower)
+
+
+def sobol(n_samples: int, bounds: Mapping[str, Tuple[float, float]], seed=None,
+          block_size: int = 1024) -> Iterator[np.ndarray]:
+    """
+    Sequência de Sobol embaralhada, gerada em blocos (memória limitada).
+
+    Returns:
+        Iterador de vetores de projeto, colunas na ordem de ``bounds``
+    """
+    from scipy.stats import qmc
+
+    lower, upper = np.array(list(bounds.values()), dtype=float).T
+    sampler = qmc.Sobol(d=len(lower), scramble=True, seed=seed)
+    remaining = n_samples
+    while remaining > 0:
+        block = sampler.random(min(block_size, remaining))
+        remaining -= len(block)
+        yield from lower + block * (upper - lower)
+
+
+def full_factorial(levels: Mapping[str, Sequence[float]]) -> Iterator[np.ndarray]:
+    """Fatorial completo sobre os níveis de cada variável, gerado sob demanda."""
+    for combination in itertools.product(*levels.values()):
+        yield np.array(combination, dtype=float)
+
+
+def apply_variables(base_properties: dict, names: Sequence[str], values) -> dict:
+    """
+    Propriedades de um projeto a partir das propriedades base.
+
+    Nomes simples ('semi_span', 'thicks') substituem a chave inteira; para
+    listas, o valor é repetido em todos os pontos de controle. Nomes
+    indexados ('thicks[2]') alteram um único ponto de controle.
+    """
+    properties = {key: list(value) if isinstance(value, (list, tuple)) else value
+                  for key, value in base_properties.items()}
+    for name, value in zip(names, values):
+        match = _VARIABLE.match(name)
+        if match is None or match.group(1) not in properties:
+            raise KeyError(f"Variável desconhecida: '{name}'")
+        key, index = match.group(1), match.group(2)
+        value = float(value)
+        if index is not None:
+            properties[key][int(index)] = value
+        elif isinstance(properties[key], list):
+            properties[key] = [value] * len(properties[key])
+        else:
+            properties[key] = int(round(value)) if key == 'number_of_panels' else value
+    return properties
+
+
+def failed_design(index, alpha_range, error) -> dict:
+    """Linha de resultado de um projeto que falhou: curvas NaN e a mensagem de erro."""
+    nan_curve = np.full(len(np.arange(*alpha_range)), np.nan)
+    return {'index': index, 'CL_max': np.nan, 'alpha_stall': np.nan,
+            'CL': nan_curve, 'CD': nan_curve.copy(), 'Cm': nan_curve.copy(),
+            'error': f'{type(error).__name__}: {error}'}
+
+
+def evaluate_design(index, properties, Cl_max_airfoil, alpha_range, avl_path, work_root) -> dict:
+    """
+    Geometria, arquivos e AVL de um projeto, num diretório temporário exclusivo.
+
+    Uma falha do projeto (geometria inválida, AVL que cai ou não responde
+    após os reinícios) não é propagada: o resultado é a linha de
+    failed_design, com 'error' preenchido ('' quando o projeto foi avaliado).
+    """
+    work_dir = tempfile.mkdtemp(prefix='doe_', dir=work_root)
+    try:
+        wing = BezierAirfoil(properties)
+        wing.properties['airfoil_files'] = wing.write_airfoil_files(os.path.join(work_dir, 'airfoils'))
+        config_file = os.path.join(work_dir, 'design.avl')
+        create_avl_config_from_bezier(config_file, wing)
+        CL_dict, CD_dict, Cm_dict = get_aero_coef(config_file, Cl_max_airfoil, *alpha_range,
+                                                  avl_path=avl_path, in_memory=True)
+    except Exception as error:
+        return failed_design(index, alpha_range, error)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    alphas = np.arange(*alpha_range)
+    curves = {}
+    for name, values in (('CL', CL_dict), ('CD', CD_dict), ('Cm', Cm_dict)):
+        curve = np.full(len(alphas), np.nan)
+        curve[:len(values)] = list(values.values())
+        curves[name] = curve
+    n_valid = len(CL_dict)
+    return {
+        'index': index,
+        'CL_max': np.nanmax(curves['CL']) if n_valid else np.nan,
+        'alpha_stall': alphas[n_valid - 1] if n_valid else np.nan,
+        **curves,
+        'error': '',
+    }
+
+
+def _completed_designs(output_dir: str, names: Sequence[str], retry_failed: bool = True) -> Tuple[set, int]:
+    """
+    Vetores de projeto já gravados nos blocos do estudo.
+
+    Returns:
+        Tuple com (vetores em bytes, sem os que falharam se ``retry_failed``,
+        próximo índice livre)
+    """
+    completed = set()
+    next_index = 0
+    for file_name in os.listdir(output_dir):
+        if _CHUNK.match(file_name):
+            with np.load(os.path.join(output_dir, file_name), allow_pickle=False) as data:
+                if list(data['variables']) != list(names):
+                    raise ValueError(f"Estudo em '{output_dir}' tem outras variáveis: {list(data['variables'])}")
+                x = np.asarray(data['x'], dtype=float)
+                if retry_failed and 'error' in data.files:
+                    x = x[data['error'] == '']
+                completed.update(row.tobytes() for row in x)
+                if len(data['index']):
+                    next_index = max(next_index, int(data['index'].max()) + 1)
+    return completed, next_index
+
+
+def _next_chunk(output_dir: str) -> int:
+    numbers = [int(match.group(1)) for match in map(_CHUNK.match, os.listdir(output_dir)) if match]
+    return max(numbers, default=-1) + 1
+
+
+def _write_chunk(output_dir: str, number: int, names: Sequence[str], records: List[Tuple[np.ndarray, dict]]) -> None:
+    """Grava um bloco de resultados de forma atômica (arquivo temporário + os.replace)."""
+    columns = {'variables': np.array(names, dtype=str),
+               'x': np.array([x for x, _ in records], dtype=float).reshape(len(records), len(names))}
+    for key in records[0][1]:
+        columns[key] = np.array([record[key] for _, record in records])
+    fd, temporary = tempfile.mkstemp(prefix='.tmp_', suffix='.npz', dir=output_dir)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(temporary, os.path.join(output_dir, f'chunk_{number:06d}.npz'))
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def run_doe(base_properties: dict, names: Sequence[str], samples: Iterable, output_dir: str,
+            Cl_max_airfoil: float, alpha_start: float, alpha_end: float, alpha_step: float,
+            max_workers: Optional[int] = None, chunk_size: int = 256, avl_path=None,
+            work_root: Optional[str] = None, retry_failed: bool = True) -> Dict[str, int]:
+    """
+    Executa um planejamento de experimentos, gravando os resultados em blocos.
+
+    Cada projeto (geometria, arquivos .dat/.avl e varredura do AVL) roda num
+    processo do pool. No máximo 2 * max_workers projetos ficam em andamento
+    e no máximo ``chunk_size`` resultados ficam em memória antes de irem
+    para um novo arquivo ``chunk_NNNNNN.npz`` em ``output_dir``; assim a
+    memória não depende do tamanho do planejamento. Os blocos são escritos
+    de forma atômica e nunca alterados, e os projetos já presentes em algum
+    bloco (pelo vetor de projeto, não pela posição na amostragem) são
+    pulados, de modo que um estudo interrompido pode ser retomado chamando a
+    função de novo com as mesmas amostras (em qualquer ordem). A coluna
+    'index' numera os projetos na ordem em que foram submetidos ao longo
+    de todo o estudo, continuando do maior índice já gravado.
+
+    Um projeto que falha não interrompe o estudo: ele é gravado com curvas
+    NaN e a mensagem na coluna 'error' (ver evaluate_design). Com
+    ``retry_failed``, os projetos que falharam (inclusive por tempo
+    esgotado ou queda do pool) são avaliados de novo ao retomar.
+
+    Args:
+        base_properties: Propriedades da asa de referência
+        names: Variáveis do planejamento ('semi_span', 'thicks', 'thicks[2]', ...)
+        samples: Vetores de projeto, na ordem de ``names`` (ex.: latin_hypercube,
+            sobol ou full_factorial)
+        output_dir: Diretório dos blocos de resultados
+        Cl_max_airfoil, alpha_start, alpha_end, alpha_step: Como em get_aero_coef
+        max_workers: Número de processos; por padrão, os.cpu_count()
+        chunk_size: Resultados por bloco
+        avl_path: Executável do AVL (ou comando completo)
+        work_root: Onde criar os diretórios temporários de cada projeto
+        retry_failed: Reavaliar os projetos gravados com erro
+
+    Returns:
+        Dicionário com o número de projetos avaliados ('evaluated'), dos que
+        falharam entre eles ('failed') e dos pulados ('skipped')
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    completed, next_index = _completed_designs(output_dir, names, retry_failed)
+    chunk_number = _next_chunk(output_dir)
+    max_workers = max_workers or os.cpu_count() or 1
+    alpha_range = (alpha_start, alpha_end, alpha_step)
+
+    buffer = []
+    pending = {}
+    evaluated = skipped = failed = 0
+
+    def collect(done):
+        nonlocal chunk_number, evaluated, failed
+        for future in done:
+            x, index = pending.pop(future)
+            try:
+                record = future.result()
+            except Exception as error:
+                # Falhas fora de evaluate_design (ex.: processo do pool encerrado)
+                record = failed_design(index, alpha_range, error)
+            buffer.append((x, record))
+            evaluated += 1
+            failed += bool(record['error'])
+        if len(buffer) >= chunk_size:
+            _write_chunk(output_dir, chunk_number, names, buffer)
+            chunk_number += 1
+            buffer.clear()
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for x in samples:
+                x = np.asarray(x, dtype=float)
+                if x.tobytes() in completed:
+                    skipped += 1
+                    continue
+                index = next_index
+                next_index += 1
+                properties = apply_variables(base_properties, names, x)
+                future = executor.submit(evaluate_design, index, properties, Cl_max_airfoil,
+                                         alpha_range, avl_path, work_root)
+                pending[future] = (x, index)
+                if len(pending) >= 2 * max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        finally:
+            # Resultados já concluídos não se perdem se um projeto falhar
+            finished = [future for future in pending if future.done() and future.exception() is None]
+            for future in finished:
+                buffer.append((pending.pop(future)[0], future.result()))
+            if buffer:
+                _write_chunk(output_dir, chunk_number, names, buffer)
+                buffer.clear()
+
+    return {'evaluated': evaluated, 'failed': failed, 'skipped': skipped}
+
+
+def load_results(output_dir: str) -> Dict[str, np.ndarray]:
+    """
+    Junta os blocos de um estudo, com as linhas ordenadas pelo índice do projeto.
+
+    Um projeto avaliado mais de uma vez (nova tentativa após uma falha) fica
+    só com a linha mais recente.
+    """
+    chunks = sorted(file_name for file_name in os.listdir(output_dir) if _CHUNK.match(file_name))
+    columns: Dict[str, list] = {}
+    variables = None
+    for file_name in chunks:
+        with np.load(os.path.join(output_dir, file_name), allow_pickle=False) as data:
+            variables = data['variables']
+            for key in data.files:
+                if key != 'variables':
+                    columns.setdefault(key, []).append(data[key])
+    if not columns:
+        return {}
+    results = {key: np.concatenate(values) for key, values in columns.items()}
+    order = np.argsort(results['index'])
+    latest = {x.tobytes(): position for position, x in enumerate(results['x'][order])}
+    order = order[sorted(latest.values())]
+    results = {key: values[order] for key, values in results.items()}
+    results['variables'] = variables
+    return results
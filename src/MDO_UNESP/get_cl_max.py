@@ -1,6 +1,7 @@
-import pandas as pd
 import fileinput
 def get_clmax(output):
+    import pandas as pd
+
     with fileinput.input(output, inplace=True) as op:
         for line in op:
             if 'c cl' in line:
@@ -0,0 +1,210 @@
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from .avl_runner import get_aero_coef_adaptive
+
+
+def thin_airfoil_coefficients(camber, camber_pos, n_points=200):
+    """
+    Ângulo de sustentação nula e Cm em c/4 de perfis NACA de 4 dígitos (teoria do perfil fino).
+
+    As integrais em theta são feitas de uma vez para todas as seções
+    (regra do ponto médio), com a derivada da linha de cambra escolhida por np.where.
+
+    Args:
+        camber, camber_pos: Arrays (n,) com a cambra e sua posição (frações da corda)
+        n_points: Número de pontos de integração
+
+    Returns:
+        Tuple (alpha_0, cm_c4): arrays (n,), alpha_0 em radianos
+    """
+    m = np.asarray(camber, dtype=float)[:, None]
+    p = np.asarray(camber_pos, dtype=float)[:, None]
+    theta = (np.arange(n_points) + 0.5) * np.pi / n_points
+    x = 0.5 * (1 - np.cos(theta))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        dz_dx = np.where(x <= p, 2 * m / p**2 * (p - x), 2 * m / (1 - p)**2 * (p - x))
+    dz_dx = np.where(m == 0, 0.0, dz_dx)
+
+    d_theta = np.pi / n_points
+    alpha_0 = -(dz_dx * (np.cos(theta) - 1)).sum(axis=1) * d_theta / np.pi
+    A1 = 2 / np.pi * (dz_dx * np.cos(theta)).sum(axis=1) * d_theta
+    A2 = 2 / np.pi * (dz_dx * np.cos(2 * theta)).sum(axis=1) * d_theta
+    return alpha_0, np.pi / 4 * (A2 - A1)
+
+
+def estimate_aero_coef(wing, Cl_max_airfoil, alpha_start, alpha_end, alpha_step=0.25,
+                       reynolds=5e5, mach=0.0) -> dict:
+    """
+    Estimativa analítica (baixa fidelidade) das curvas da asa, sem o AVL.
+
+    A partir das distribuições de corda, espessura e cambra ao longo da
+    envergadura:
+
+    - CLa pela fórmula de Helmbold (DATCOM, asa sem enflechamento), com a
+      inclinação 2D corrigida pela espessura;
+    - alpha de sustentação nula e Cm0 pela teoria do perfil fino, ponderados
+      pela corda;
+    - CLmax pela distribuição de Schrenk: a asa estola quando o cl local de
+      alguma seção atinge Cl_max_airfoil (o mesmo critério de get_aero_coef);
+    - CD = CD0 + CL²/(pi e AR), com CD0 de placa plana turbulenta e fator de
+      forma, e o fator de Oswald de Raymer para asas retas.
+
+    Args:
+        wing: BezierAirfoil ou WingGeometry
+        Cl_max_airfoil: Cl máximo do perfil
+        alpha_start, alpha_end, alpha_step: Pontos avaliados (como em np.arange)
+        reynolds: Número de Reynolds baseado na CMA
+        mach: Número de Mach
+
+    Returns:
+        Dicionário com as mesmas chaves de get_aero_coef_adaptive (alpha_stall,
+        CL_max, bracket, CL, CD, Cm, n_runs) e também CL_alpha (1/rad),
+        alpha_0 (graus), CD0, e e fidelity = 'low'
+    """
+    geometry = getattr(wing, 'geometry', wing)
+    y = geometry.span
+    chord = geometry.chord
+
+    # Dimensões de referência (asa simétrica)
+    half_area = np.trapezoid(chord, y)
+    S = 2 * half_area
+    b = 2 * y[-1]
+    MAC = 2 / S * np.trapezoid(chord**2, y)
+    AR = b**2 / S
+
+    def chord_average(values):
+        return np.trapezoid(chord * values, y) / half_area
+
+    thickness = chord_average(geometry.thickness)
+    alpha_0_sections, cm_sections = thin_airfoil_coefficients(geometry.camber, geometry.camber_pos)
+    alpha_0 = chord_average(alpha_0_sections)
+    Cm0 = np.trapezoid(chord**2 * cm_sections, y) / (half_area * MAC)
+
+    # Helmbold / DATCOM
+    beta = np.sqrt(max(1 - mach**2, 0.05))
+    kappa = (1 + 0.77 * thickness)
+    CL_alpha = 2 * np.pi * AR / (2 + np.sqrt((AR * beta / kappa)**2 + 4))
+
+    # Schrenk: cl local = CL (c + c_eliptica) / (2 c)
+    elliptic_chord = 4 * S / (np.pi * b) * np.sqrt(np.clip(1 - (2 * y / b)**2, 0.0, None))
+    CL_max_wing = Cl_max_airfoil * np.min(2 * chord / (chord + elliptic_chord))
+
+    # Arrasto
+    skin_friction = 0.455 / np.log10(reynolds)**2.58
+    form_factor = 1 + 2 * thickness + 60 * thickness**4
+    CD0 = skin_friction * form_factor * (1.977 + 0.52 * thickness)
+    e = float(np.clip(1.78 * (1 - 0.045 * AR**0.68) - 0.64, 0.3, 1.0))
+
+    CL_dict, CD_dict, Cm_dict = {}, {}, {}
+    lower = upper = None
+    alpha_range = np.arange(alpha_start, alpha_end, alpha_step)
+    CL = CL_alpha * (np.radians(alpha_range) - alpha_0)
+    for alpha, CL_value in zip(alpha_range, CL):
+        if CL_value > CL_max_wing:
+            upper = alpha
+            break
+        lower = alpha
+        CL_dict[alpha] = float(CL_value)
+        CD_dict[alpha] = float(CD0 + CL_value**2 / (np.pi * e * AR))
+        Cm_dict[alpha] = float(Cm0)
+
+    return {
+        'alpha_stall': lower,
+        'CL_max': CL_dict[lower] if lower is not None else None,
+        'bracket': (lower, upper),
+        'CL': CL_dict,
+        'CD': CD_dict,
+        'Cm': Cm_dict,
+        'n_runs': 0,
+        'CL_alpha': float(CL_alpha),
+        'alpha_0': float(np.degrees(alpha_0)),
+        'CD0': float(CD0),
+        'e': e,
+        'fidelity': 'low',
+    }
+
+
+class MultiFidelityScreen():
+    """
+    Avaliação em duas fidelidades: estimativa analítica e, se promissor, o AVL.
+
+    Cada projeto é primeiro avaliado com estimate_aero_coef. O AVL
+    (get_aero_coef_adaptive) só roda se o objetivo estimado estiver a menos
+    de ``margin`` (relativo) do objetivo estimado do melhor projeto já
+    avaliado pelo AVL. A comparação é feita entre estimativas para que o
+    viés do modelo analítico (por exemplo, o CD0 que o AVL não inclui) se
+    cancele. Antes do primeiro resultado do AVL, todos os projetos vão para
+    o AVL. Cada resultado traz a chave 'fidelity' ('low' ou 'avl') e o
+    valor de 'objective'.
+
+    Args:
+        objective: Função resultado -> float a minimizar (recebe o mesmo
+            dicionário nas duas fidelidades)
+        margin: Margem relativa em relação à estimativa do melhor projeto
+        low_fidelity_options: Argumentos extras de estimate_aero_coef
+            (alpha_step, reynolds, mach)
+        **avl_options: Argumentos extras de get_aero_coef_adaptive
+            (coarse_step, tolerance, avl_path, in_memory, cache, ...)
+    """
+
+    def __init__(self, objective: Callable[[dict], float], margin: float = 0.1,
+                 low_fidelity_options: Optional[dict] = None, **avl_options):
+        self.objective = objective
+        self.margin = margin
+        self.low_fidelity_options = low_fidelity_options or {}
+        self.avl_options = avl_options
+        self.best = None
+        self.best_estimate = None
+        self.n_low = 0
+        self.n_avl = 0
+
+    def threshold(self) -> Optional[float]:
+        """Maior objetivo estimado que ainda justifica uma execução do AVL."""
+        if self.best_estimate is None:
+            return None
+        return self.best_estimate + self.margin * abs(self.best_estimate)
+
+    def stats(self) -> Dict[str, float]:
+        total = self.n_low + self.n_avl
+        return {'low': self.n_low, 'avl': self.n_avl,
+                'screened_fraction': self.n_low / total if total else 0.0}
+
+    def evaluate(self, wing, config_file: Union[str, Callable[[], str]], Cl_max_airfoil,
+                 alpha_start, alpha_end) -> dict:
+        """
+        Avalia um projeto.
+
+        Args:
+            wing: BezierAirfoil ou WingGeometry do projeto
+            config_file: Arquivo .avl do projeto, ou função que o grava e
+                retorna o caminho (só chamada se o AVL for executado)
+            Cl_max_airfoil: Cl máximo do perfil
+            alpha_start, alpha_end: Intervalo de alpha
+
+        Returns:
+            Dicionário do resultado, com 'fidelity' e 'objective'
+        """
+        estimate = estimate_aero_coef(wing, Cl_max_airfoil, alpha_start, alpha_end,
+                                      **self.low_fidelity_options)
+        estimate['objective'] = self.objective(estimate)
+
+        threshold = self.threshold()
+        if threshold is not None and estimate['objective'] > threshold:
+            self.n_low += 1
+            return estimate
+
+        if callable(config_file):
+            config_file = config_file()
+        result = get_aero_coef_adaptive(config_file, Cl_max_airfoil, alpha_start, alpha_end,
+                                        **self.avl_options)
+        result['fidelity'] = 'avl'
+        result['objective'] = self.objective(result)
+        result['low_fidelity_objective'] = estimate['objective']
+        self.n_avl += 1
+        if self.best is None or result['objective'] < self.best:
+            self.best = result['objective']
+            self.best_estimate = estimate['objective']
+        return result
@@ -0,0 +1,276 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .bezier_airfoil import BezierAirfoil
+from .doe import apply_variables, evaluate_design, failed_design
+
+# Colunas de cada avaliação guardadas no checkpoint
+_RESULT_KEYS = ('CL_max', 'alpha_stall', 'CL', 'CD', 'Cm')
+_GEOMETRY_KEYS = ('S', 'b', 'MAC', 'AR')
+_RECORD_KEYS = _RESULT_KEYS + _GEOMETRY_KEYS
+
+
+def geometry_summary(properties) -> Dict[str, float]:
+    """
+    Área, envergadura, CMA e alongamento de uma asa Bezier.
+
+    As mesmas grandezas de avl_runner._calculate_geometry, integradas sobre as
+    seções da asa em vez de três seções trapezoidais.
+    """
+    geometry = BezierAirfoil(properties).geometry
+    half_area = np.trapezoid(geometry.chord, geometry.span)
+    S = 2 * half_area
+    b = 2 * geometry.span[-1]
+    MAC = 2 / S * np.trapezoid(geometry.chord**2, geometry.span)
+    return {'S': float(S), 'b': float(b), 'MAC': float(MAC), 'AR': float(b**2 / S)}
+
+
+class Optimizer():
+    """
+    Otimização da asa Bezier com o AVL, avaliando lotes de projetos em paralelo.
+
+    Dois modos: differential_evolution (cada geração inteira vai para o pool
+    de processos num único lote) e slsqp (gradientes por diferenças
+    centrais; os 2n projetos perturbados formam um único lote). O objetivo
+    e as restrições são funções das grandezas de cada projeto: CL_max,
+    alpha_stall, as curvas CL/CD/Cm (em ``alphas``) e S, b, MAC, AR de
+    geometry_summary.
+
+    Cada avaliação é guardada por vetor de projeto e, com ``checkpoint``,
+    gravada em disco após cada lote. Como os dois algoritmos são
+    determinísticos (com a mesma semente), rodar de novo após uma queda
+    repete o caminho já feito a partir do checkpoint, sem chamar o AVL, e
+    continua de onde parou.
+
+    Args:
+        base_properties: Propriedades da asa de referência
+        bounds: Limites (mínimo, máximo) por variável de projeto (nomes como em
+            doe.apply_variables: 'semi_span', 'thicks', 'thicks[2]', ...)
+        objective: Função grandezas -> float a minimizar
+        constraints: Limites (mínimo, máximo) por grandeza, None para sem
+            limite (ex.: {'CL_max': (1.2, None), 'b': (None, 3.0)})
+        Cl_max_airfoil, alpha_start, alpha_end, alpha_step: Como em get_aero_coef
+        max_workers: Número de processos; com 1, tudo roda no processo atual
+        avl_path: Executável do AVL (ou comando completo)
+        checkpoint: Arquivo .npz com as avaliações já feitas
+        work_root: Onde criar os diretórios temporários de cada projeto
+    """
+
+    def __init__(self, base_properties: dict, bounds: Mapping[str, Tuple[float, float]],
+                 objective: Callable[[dict], float], constraints: Optional[Mapping[str, tuple]] = None,
+                 Cl_max_airfoil: float = 1.2, alpha_start: float = -5, alpha_end: float = 20,
+                 alpha_step: float = 1.0, max_workers: Optional[int] = None, avl_path=None,
+                 checkpoint: Optional[str] = None, work_root: Optional[str] = None):
+        self.base_properties = base_properties
+        self.names = list(bounds)
+        self.bounds = np.array(list(bounds.values()), dtype=float)
+        self.objective = objective
+        self.constraints = dict(constraints or {})
+        self.Cl_max_airfoil = Cl_max_airfoil
+        self.alpha_range = (alpha_start, alpha_end, alpha_step)
+        self.alphas = np.arange(*self.alpha_range)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.avl_path = avl_path
+        self.checkpoint = checkpoint
+        self.work_root = work_root
+        self.records: Dict[bytes, dict] = {}
+        self.n_evaluations = 0
+        self._executor = None
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._load_checkpoint()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @staticmethod
+    def _key(x) -> bytes:
+        return np.asarray(x, dtype=float).tobytes()
+
+    # --- Avaliação ---------------------------------------------------------
+
+    def properties(self, x) -> dict:
+        return apply_variables(self.base_properties, self.names, x)
+
+    def evaluate_batch(self, X) -> List[dict]:
+        """
+        Grandezas de um lote de projetos; os ainda não avaliados vão juntos para o pool.
+
+        Projetos que falham (AVL que cai ou não responde) têm as grandezas do
+        AVL iguais a NaN, o que os penaliza no objetivo e nas restrições.
+
+        Returns:
+            Lista de dicionários (CL_max, alpha_stall, CL, CD, Cm, alphas, S, b, MAC, AR)
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        missing = {}
+        for x in X:
+            key = self._key(x)
+            if key not in self.records and key not in missing:
+                missing[key] = x
+
+        if missing:
+            jobs = [(i, self.properties(x), self.Cl_max_airfoil, self.alpha_range, self.avl_path, self.work_root)
+                    for i, x in enumerate(missing.values())]
+            if self.max_workers == 1 or len(jobs) == 1:
+                results = [evaluate_design(*job) for job in jobs]
+            else:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                futures = [self._executor.submit(evaluate_design, *job) for job in jobs]
+                results = []
+                for job, future in zip(jobs, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as error:
+                        # Falha fora de evaluate_design (ex.: processo do pool encerrado):
+                        # o projeto vira NaN e recebe a penalidade, como os demais que falham
+                        results.append(failed_design(job[0], self.alpha_range, error))
+                        self.close()
+            for (key, x), result in zip(missing.items(), results):
+                # Geometria calculada uma única vez por projeto, junto com o resultado do AVL
+                try:
+                    geometry = geometry_summary(self.properties(x))
+                except Exception:
+                    geometry = dict.fromkeys(_GEOMETRY_KEYS, np.nan)
+                self.records[key] = {**{name: result[name] for name in _RESULT_KEYS}, **geometry}
+            self.n_evaluations += len(missing)
+            self._save_checkpoint()
+
+        return [self.quantities(x) for x in X]
+
+    def quantities(self, x) -> dict:
+        return {**self.records[self._key(x)], 'alphas': self.alphas}
+
+    def _objective_value(self, quantities) -> float:
+        value = self.objective(quantities)
+        # Projetos sem nenhum ponto válido (estol já no primeiro alpha)
+        return float(value) if np.isfinite(value) else 1e10
+
+    def _constraint_values(self, quantities) -> np.ndarray:
+        """Restrições na forma g >= 0, uma por limite informado."""
+        values = []
+        for name, (lower, upper) in self.constraints.items():
+            value = quantities[name]
+            if lower is not None:
+                values.append(value - lower)
+            if upper is not None:
+                values.append(upper - value)
+        return np.nan_to_num(np.array(values, dtype=float), nan=-1e10)
+
+    # --- Checkpoint --------------------------------------------------------
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint is None:
+            return
+        keys = list(self.records)
+        columns = {'names': np.array(self.names, dtype=str),
+                   'x': np.array([np.frombuffer(key) for key in keys]).reshape(len(keys), len(self.names))}
+        for name in _RECORD_KEYS:
+            columns[name] = np.array([self.records[key][name] for key in keys])
+        directory = os.path.dirname(os.path.abspath(self.checkpoint))
+        fd, temporary = tempfile.mkstemp(prefix='.tmp_', suffix='.npz', dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **columns)
+            os.replace(temporary, self.checkpoint)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def _load_checkpoint(self) -> None:
+        with np.load(self.checkpoint, allow_pickle=False) as data:
+            if list(data['names']) != self.names:
+                raise ValueError(f"Checkpoint '{self.checkpoint}' tem outras variáveis: {list(data['names'])}")
+            for i, x in enumerate(data['x']):
+                record = {name: data[name][i] for name in _RESULT_KEYS}
+                if all(name in data.files for name in _GEOMETRY_KEYS):
+                    record.update({name: data[name][i] for name in _GEOMETRY_KEYS})
+                else:
+                    # Checkpoints anteriores não guardavam a geometria
+                    record.update(geometry_summary(self.properties(x)))
+                self.records[self._key(x)] = record
+
+    # --- Algoritmos ----------------------------------------------------------
+
+    def differential_evolution(self, maxiter: int = 50, popsize: int = 15, seed=None,
+                               penalty: float = 1e3, **options):
+        """
+        Evolução diferencial (scipy), com cada geração avaliada como um lote.
+
+        As restrições entram como penalidade: penalty * soma das violações.
+
+        Returns:
+            scipy.optimize.OptimizeResult
+        """
+        from scipy.optimize import differential_evolution
+
+        def population_objective(X):
+            # vectorized=True: X tem forma (n_variaveis, n_individuos)
+            values = []
+            for quantities in self.evaluate_batch(X.T):
+                violation = np.minimum(self._constraint_values(quantities), 0.0).sum()
+                values.append(self._objective_value(quantities) - penalty * violation)
+            return np.array(values)
+
+        return differential_evolution(population_objective, self.bounds, maxiter=maxiter, popsize=popsize,
+                                      seed=seed, vectorized=True, updating='deferred', polish=False,
+                                      **options)
+
+    def slsqp(self, x0, step: float = 1e-2, maxiter: int = 50, **options):
+        """
+        SLSQP (scipy) com gradientes por diferenças centrais avaliadas em lote.
+
+        Args:
+            x0: Projeto inicial
+            step: Passo das diferenças, como fração do intervalo de cada variável;
+                variáveis com mínimo igual ao máximo têm derivada nula
+
+        Returns:
+            scipy.optimize.OptimizeResult
+        """
+        from scipy.optimize import minimize
+
+        if step <= 0:
+            raise ValueError(f'step deve ser positivo, não {step}')
+        lower, upper = self.bounds.T
+        h = step * (upper - lower)
+
+        def values(x):
+            quantities = self.evaluate_batch(x)[0]
+            return self._objective_value(quantities), self._constraint_values(quantities)
+
+        def gradients(x):
+            # x e os 2n projetos perturbados num único lote
+            forward = np.minimum(x + np.diag(h), upper)
+            backward = np.maximum(x - np.diag(h), lower)
+            batch = self.evaluate_batch(np.vstack([x[None, :], forward, backward]))
+            f = np.array([self._objective_value(q) for q in batch])
+            g = np.array([self._constraint_values(q) for q in batch])
+            n = len(x)
+            span = np.diag(forward) - np.diag(backward)
+            fixed = span <= 0
+            span = np.where(fixed, 1.0, span)
+            d_objective = np.where(fixed, 0.0, (f[1:n + 1] - f[n + 1:]) / span)
+            d_constraints = np.where(fixed[:, None], 0.0, (g[1:n + 1] - g[n + 1:]) / span[:, None]).T
+            return d_objective, d_constraints
+
+        constraints = []
+        if self.constraints:
+            constraints.append({'type': 'ineq', 'fun': lambda x: values(x)[1],
+                                'jac': lambda x: gradients(x)[1]})
+        return minimize(lambda x: values(x)[0], np.asarray(x0, dtype=float), jac=lambda x: gradients(x)[0],
+                        method='SLSQP', bounds=self.bounds, constraints=constraints,
+                        options={'maxiter': maxiter, **options})
@@ -1,5 +1,4 @@
 import logging
-import matplotlib.pyplot as plt
 def plot_airfoils(file=None, coords=None, airfoil_name=None, figsize=(10, 5)):
     if file:
         with open(file, 'r') as f:
@@ -14,6 +13,8 @@ def plot_airfoils(file=None, coords=None, airfoil_name=None, figsize=(10, 5)):
         logging.info(f'Coordinates provided: {coords}')
         x = coords[0]
         y = coords[1]
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=figsize)
     plt.plot(x, y, label=airfoil_name)
     plt.title(f'Airfoil: {airfoil_name}')
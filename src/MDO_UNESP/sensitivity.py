@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .avl_generator import create_avl_config_from_bezier
+from .avl_runner import get_stability_derivatives
+from .bezier_airfoil import BezierAirfoil
+from .doe import apply_variables
+
+# Grandezas diferenciadas em relação às variáveis de projeto
+QUANTITIES = ('CL', 'CD', 'Cm', 'CL_alpha', 'Cm_alpha', 'Xnp', 'static_margin')
+
+
+def _evaluate_stability(properties, alpha, avl_path, work_root) -> dict:
+    """Geometria, arquivos e solução 'st' de um projeto, num diretório temporário exclusivo."""
+    work_dir = tempfile.mkdtemp(prefix='sens_', dir=work_root)
+    try:
+        wing = BezierAirfoil(properties)
+        wing.properties['airfoil_files'] = wing.write_airfoil_files(os.path.join(work_dir, 'airfoils'))
+        config_file = os.path.join(work_dir, 'design.avl')
+        create_avl_config_from_bezier(config_file, wing)
+        result = get_stability_derivatives(config_file, alpha, avl_path=avl_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {name: result[name] for name in QUANTITIES}
+
+
+def design_sensitivities(base_properties: dict, names: Sequence[str], x0, alpha: float,
+                         step: float = 1e-3, max_workers: Optional[int] = None, avl_path=None,
+                         work_root: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Derivadas dos coeficientes e das derivadas de estabilidade em relação a variáveis geométricas.
+
+    As derivadas em alpha vêm da própria solução do AVL (ver
+    get_stability_derivatives); as derivadas geométricas são diferenças
+    centrais. O projeto base e os 2n projetos perturbados são gerados e
+    resolvidos juntos, um por processo do pool.
+
+    Args:
+        base_properties: Propriedades da asa de referência
+        names: Variáveis de projeto (como em doe.apply_variables)
+        x0: Valores das variáveis no ponto de derivação, na ordem de ``names``
+        alpha: Ângulo de ataque em graus
+        step: Passo relativo; a variável i é perturbada em step * max(|x0[i]|, 1)
+        max_workers: Número de processos; com 1, tudo roda no processo atual
+        avl_path: Executável do AVL (ou comando completo)
+        work_root: Onde criar os diretórios temporários de cada projeto
+
+    Returns:
+        Dicionário com:
+            values: grandezas no ponto base (CL, CD, Cm, CL_alpha, Cm_alpha, Xnp, static_margin)
+            gradients: para cada grandeza, array (n,) com as derivadas em relação a ``names``
+    """
+    x0 = np.asarray(x0, dtype=float)
+    h = step * np.maximum(np.abs(x0), 1.0)
+    designs = np.vstack([x0[None, :], x0 + np.diag(h), x0 - np.diag(h)])
+    jobs = [(apply_variables(base_properties, names, x), alpha, avl_path, work_root) for x in designs]
+
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    if max_workers == 1:
+        results = [_evaluate_stability(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_evaluate_stability, *zip(*jobs)))
+
+    n = len(x0)
+    gradients = {}
+    for name in QUANTITIES:
+        values = np.array([result[name] for result in results], dtype=float)
+        gradients[name] = (values[1:n + 1] - values[n + 1:]) / (2 * h)
+    return {'values': results[0], 'gradients': gradients}
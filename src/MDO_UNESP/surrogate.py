@@ -0,0 +1,243 @@
+import json
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Variáveis de projeto de BezierAirfoil, na ordem do vetor de projeto
+DESIGN_VARIABLES = ("thicks", "cambers", "cambers_pos", "chord_root", "chord_tip", "semi_span")
+
+
+def design_vector(properties) -> np.ndarray:
+    """Vetor de projeto (thicks, cambers, cambers_pos, chord_root, chord_tip, semi_span) de uma asa."""
+    return np.concatenate([np.atleast_1d(np.asarray(properties[name], dtype=float))
+                           for name in DESIGN_VARIABLES])
+
+
+def result_targets(result: dict, alphas: Sequence[float] = ()) -> Dict[str, float]:
+    """
+    Grandezas escalares de um resultado de get_aero_coef_adaptive (ou estimate_aero_coef).
+
+    Returns:
+        Dicionário com CL_max, alpha_stall e, para cada alpha pedido, CL, CD e
+        Cm interpolados nos pontos amostrados ('CL@5.0', 'CD@5.0', ...). Alphas
+        fora do intervalo amostrado (ex.: além do estol), varreduras vazias e
+        valores None viram NaN
+    """
+    targets = {name: np.nan if result[name] is None else result[name] for name in ('CL_max', 'alpha_stall')}
+    sampled = np.array(list(result['CL']), dtype=float)
+    for alpha in alphas:
+        inside = len(sampled) > 0 and sampled.min() <= alpha <= sampled.max()
+        for name in ('CL', 'CD', 'Cm'):
+            targets[f'{name}@{alpha}'] = (float(np.interp(alpha, sampled, list(result[name].values())))
+                                          if inside else np.nan)
+    return targets
+
+
+class GaussianProcessSurrogate():
+    """
+    Regressão por processo gaussiano (núcleo RBF isotrópico), só com NumPy.
+
+    Entradas e saídas são padronizadas; todas as saídas compartilham o
+    núcleo, de modo que o treino é uma única fatoração de Cholesky e a
+    previsão de um ponto custa um produto pelo vetor de núcleos (O(n·d)) e
+    uma forma quadrática para a incerteza (O(n²)). O comprimento de escala
+    e o ruído (relativo) são escolhidos numa grade pela verossimilhança
+    marginal, com a variância de cada saída na sua forma fechada; o ruído
+    absorve, por exemplo, o degrau do alpha de estol amostrado.
+
+    Args:
+        length_scales: Comprimentos de escala candidatos (nas entradas
+            padronizadas); por padrão, uma grade em torno de sqrt(d)
+        noises: Variâncias do ruído candidatas (nas saídas padronizadas)
+    """
+
+    def __init__(self, length_scales: Optional[Sequence[float]] = None,
+                 noises: Sequence[float] = (1e-6, 1e-4, 1e-2)):
+        self.length_scales = length_scales
+        self.noises = noises
+        self.noise = None
+        self.target_names: List[str] = []
+        self.length_scale = None
+
+    def _kernel(self, A, B):
+        squared = (A**2).sum(axis=1)[:, None] + (B**2).sum(axis=1)[None, :] - 2 * A @ B.T
+        return np.exp(-0.5 * np.maximum(squared, 0.0) / self.length_scale**2)
+
+    def fit(self, X, Y, target_names: Sequence[str]) -> 'GaussianProcessSurrogate':
+        """
+        Treina o modelo.
+
+        Linhas com alguma saída NaN (ex.: CL além do estol) são descartadas.
+
+        Args:
+            X: Vetores de projeto (n, d)
+            Y: Saídas (n, n_saidas)
+            target_names: Nome de cada coluna de Y
+        """
+        X = np.asarray(X, dtype=float)
+        Y = np.asarray(Y, dtype=float).reshape(len(X), -1)
+        complete = np.isfinite(Y).all(axis=1)
+        if not complete.any():
+            raise ValueError('Nenhuma amostra com todas as saídas finitas.')
+        X, Y = X[complete], Y[complete]
+        self.target_names = list(target_names)
+
+        self.x_mean = X.mean(axis=0)
+        self.x_std = np.where(X.std(axis=0) > 0, X.std(axis=0), 1.0)
+        self.y_mean = Y.mean(axis=0)
+        self.y_std = np.where(Y.std(axis=0) > 0, Y.std(axis=0), 1.0)
+        self.X = (X - self.x_mean) / self.x_std
+        Z = (Y - self.y_mean) / self.y_std
+
+        n, d = self.X.shape
+        length_scales = self.length_scales
+        if length_scales is None:
+            length_scales = np.sqrt(d) * np.logspace(-1, 1, 9)
+
+        best = None
+        for length_scale in length_scales:
+            self.length_scale = length_scale
+            kernel = self._kernel(self.X, self.X)
+            for noise in self.noises:
+                try:
+                    L = np.linalg.cholesky(kernel + noise * np.eye(n))
+                except np.linalg.LinAlgError:
+                    continue
+                weights = np.linalg.solve(L.T, np.linalg.solve(L, Z))
+                # Log-verossimilhança marginal somada sobre as saídas, com a
+                # variância de cada saída substituída pelo seu ótimo z'K^-1 z / n
+                variances = np.maximum((Z * weights).sum(axis=0) / n, 1e-12)
+                likelihood = -0.5 * n * np.log(variances).sum() - Z.shape[1] * np.log(np.diag(L)).sum()
+                if best is None or likelihood > best[0]:
+                    best = (likelihood, length_scale, noise, L, weights, variances)
+        if best is None:
+            raise np.linalg.LinAlgError('Matriz do núcleo não é definida positiva; aumente o ruído.')
+
+        _, self.length_scale, self.noise, L, self.weights, self.variances = best
+        L_inv = np.linalg.solve(L, np.eye(n))
+        self.K_inv = L_inv.T @ L_inv
+        return self
+
+    def predict(self, x):
+        """
+        Média e desvio padrão previstos.
+
+        Args:
+            x: Vetor de projeto (d,) ou lote (m, d)
+
+        Returns:
+            Tuple (mean, std) com forma (n_saidas,) ou (m, n_saidas)
+        """
+        x = np.asarray(x, dtype=float)
+        single = x.ndim == 1
+        Xs = (np.atleast_2d(x) - self.x_mean) / self.x_std
+        k = self._kernel(Xs, self.X)
+        mean = k @ self.weights * self.y_std + self.y_mean
+        variance = np.maximum(1.0 - ((k @ self.K_inv) * k).sum(axis=1), 0.0)
+        std = np.sqrt(variance[:, None] * self.variances) * self.y_std
+        return (mean[0], std[0]) if single else (mean, std)
+
+    def save(self, file_name: str) -> None:
+        np.savez(file_name, X=self.X, weights=self.weights, K_inv=self.K_inv, variances=self.variances,
+                 x_mean=self.x_mean, x_std=self.x_std, y_mean=self.y_mean, y_std=self.y_std,
+                 meta=np.array(json.dumps({'length_scale': float(self.length_scale), 'noise': self.noise,
+                                           'target_names': self.target_names})))
+
+    @classmethod
+    def load(cls, file_name: str) -> 'GaussianProcessSurrogate':
+        with np.load(file_name, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            model = cls()
+            model.noise = meta['noise']
+            model.length_scale = meta['length_scale']
+            model.target_names = meta['target_names']
+            for name in ('X', 'weights', 'K_inv', 'variances', 'x_mean', 'x_std', 'y_mean', 'y_std'):
+                setattr(model, name, data[name])
+        return model
+
+
+class SurrogateEvaluator():
+    """
+    Usa o substituto quando ele é confiável e o AVL quando não é.
+
+    Cada resultado do AVL é acumulado (vetor de projeto, grandezas de
+    result_targets) e o substituto é retreinado a cada ``refit_every`` novos
+    pontos. Um projeto é respondido pelo substituto quando, para todas as
+    saídas, o desvio padrão previsto é menor que a tolerância.
+
+    Args:
+        evaluate: Função properties -> resultado (ex.: get_aero_coef_adaptive
+            sobre o .avl do projeto); só chamada quando o substituto não basta
+        tolerance: Desvio padrão máximo aceito, um valor para todas as saídas
+            ou um dicionário por saída
+        alphas: Alphas em que CL, CD e Cm entram nas saídas
+        min_samples: Resultados do AVL necessários antes do primeiro treino
+        refit_every: Novos resultados do AVL entre treinos
+    """
+
+    def __init__(self, evaluate: Callable[[dict], dict], tolerance=0.02, alphas: Sequence[float] = (),
+                 min_samples: int = 10, refit_every: int = 10):
+        self.evaluate = evaluate
+        self.tolerance = tolerance
+        self.alphas = tuple(alphas)
+        self.min_samples = min_samples
+        self.refit_every = refit_every
+        self.model: Optional[GaussianProcessSurrogate] = None
+        self.X: List[np.ndarray] = []
+        self.Y: List[List[float]] = []
+        self.target_names: List[str] = []
+        self.n_surrogate = 0
+        self.n_avl = 0
+        self.n_complete = 0
+        self._since_fit = 0
+
+    def add(self, properties, result: dict) -> None:
+        """Acrescenta um resultado já calculado (ex.: de execuções anteriores) aos dados de treino."""
+        targets = result_targets(result, self.alphas)
+        if not self.target_names:
+            self.target_names = list(targets)
+        row = [targets[name] for name in self.target_names]
+        self.X.append(design_vector(properties))
+        self.Y.append(row)
+        # Saídas NaN (estol antes dos alphas pedidos) não entram no treino
+        if np.all(np.isfinite(row)):
+            self.n_complete += 1
+            self._since_fit += 1
+
+    def fit(self) -> None:
+        self.model = GaussianProcessSurrogate().fit(np.array(self.X), np.array(self.Y), self.target_names)
+        self._since_fit = 0
+
+    def _tolerances(self) -> np.ndarray:
+        if isinstance(self.tolerance, dict):
+            return np.array([self.tolerance.get(name, np.inf) for name in self.target_names])
+        return np.full(len(self.target_names), float(self.tolerance))
+
+    def __call__(self, properties) -> dict:
+        """
+        Avalia um projeto.
+
+        Returns:
+            Dicionário com as saídas (CL_max, alpha_stall, ...), 'std' (desvio
+            previsto por saída, ou None) e 'source' ('surrogate' ou 'avl')
+        """
+        if self.model is None and self.n_complete >= self.min_samples:
+            self.fit()
+        elif self.model is not None and self._since_fit >= self.refit_every:
+            self.fit()
+
+        if self.model is not None:
+            mean, std = self.model.predict(design_vector(properties))
+            if np.all(std < self._tolerances()):
+                self.n_surrogate += 1
+                prediction = dict(zip(self.target_names, mean.tolist()))
+                prediction.update(std=dict(zip(self.target_names, std.tolist())), source='surrogate')
+                return prediction
+
+        result = self.evaluate(properties)
+        self.n_avl += 1
+        self.add(properties, result)
+        targets = result_targets(result, self.alphas)
+        targets.update(std=None, source='avl')
+        return targets
@@ -0,0 +1,450 @@
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .avl_generator import AVLSection, AVLSurface, reference_dimensions, surface_from_bezier
+from .avl_output import strip_cl_max
+
+# Palavras-chave do arquivo .avl (o AVL só considera os 4 primeiros caracteres)
+_KEYWORDS = ('SURF', 'SECT', 'AFIL', 'YDUP', 'ANGL', 'TRAN', 'COMP', 'INDE', 'SCAL', 'NACA',
+             'AIRF', 'CONT', 'CLAF', 'CDCL', 'BODY', 'NOWA', 'NOAL', 'NOLO', 'DESI')
+
+
+def spacing(n: int, space: float) -> np.ndarray:
+    """
+    Frações (n + 1,) de 0 a 1 das bordas dos painéis, como Cspace/Sspace do AVL.
+
+    0 (ou ±3) é uniforme, ±1 cosseno, 2 seno (concentra em 0) e -2 -seno
+    (concentra em 1); valores intermediários misturam os dois vizinhos.
+    """
+    f = np.linspace(0.0, 1.0, n + 1)
+    uniform = f
+    cosine = 0.5 * (1 - np.cos(np.pi * f))
+    sine = 1 - np.cos(0.5 * np.pi * f) if space >= 0 else np.sin(0.5 * np.pi * f)
+    bases = (uniform, cosine, sine, uniform)
+    magnitude = min(abs(space), 3.0)
+    k = min(int(magnitude), 2)
+    weight = magnitude - k
+    return (1 - weight) * bases[k] + weight * bases[k + 1]
+
+
+def read_airfoil(file_name: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Coordenadas (x, y) de um arquivo .dat (a primeira linha é o nome do perfil)."""
+    data = np.loadtxt(file_name, skiprows=1, ndmin=2)
+    return data[:, 0], data[:, 1]
+
+
+def camber_slope(x, y, positions) -> np.ndarray:
+    """
+    Inclinação dz/dx da linha média de um perfil nas frações de corda ``positions``.
+
+    As coordenadas seguem a ordem dos arquivos .dat (bordo de fuga ->
+    extradorso -> bordo de ataque -> intradorso -> bordo de fuga) e são
+    normalizadas pela corda.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    leading_edge = np.argmin(x)
+    chord = x.max() - x[leading_edge]
+    x = (x - x[leading_edge]) / chord
+    y = (y - y[leading_edge]) / chord
+
+    grid = 0.5 * (1 - np.cos(np.linspace(0.0, np.pi, 201)))
+    upper = np.interp(grid, x[leading_edge::-1], y[leading_edge::-1])
+    lower = np.interp(grid, x[leading_edge:], y[leading_edge:])
+    camber = 0.5 * (upper + lower)
+    return np.interp(positions, grid, np.gradient(camber, grid))
+
+
+def _resolve_airfoil(file_name: str, base_dir: Optional[str]) -> str:
+    file_name = file_name.replace('\\', os.sep)
+    if os.path.isabs(file_name) or os.path.exists(file_name) or base_dir is None:
+        return file_name
+    return os.path.join(base_dir, file_name)
+
+
+def read_avl_config(config_file: str) -> dict:
+    """
+    Lê um arquivo .avl (como os gerados por avl_generator).
+
+    São lidos o cabeçalho, as superfícies (SURFACE, YDUPLICATE, ANGLE,
+    TRANSLATE, COMPONENT) e as seções (SECTION, AFILE); as demais
+    palavras-chave são ignoradas.
+
+    Returns:
+        Dicionário com title, mach, symmetric (iYsym = 1), reference
+        (Sref, Cref, Bref, Xref) e surfaces (lista de AVLSurface)
+    """
+    with open(config_file) as f:
+        lines = [line.split('!')[0].strip() for line in f]
+    lines = [line for line in lines if line and line[0] not in '#%']
+
+    title = lines[0]
+    mach = float(lines[1].split()[0])
+    symmetric = int(float(lines[2].split()[0])) == 1
+    Sref, Cref, Bref = (float(value) for value in lines[3].split()[:3])
+    Xref = float(lines[4].split()[0])
+
+    surfaces = []
+    surface = None
+    i = 5
+    while i < len(lines):
+        key = lines[i].upper()[:4]
+        i += 1
+        if key not in _KEYWORDS:
+            continue
+        if key == 'SURF':
+            name = lines[i]
+            fields = lines[i + 1].split()
+            i += 2
+            surface = {'name': name, 'sections': [], 'n_chord': int(float(fields[0])),
+                       'c_space': float(fields[1])}
+            if len(fields) >= 4:
+                surface.update(n_span=int(float(fields[2])), s_space=float(fields[3]))
+            surfaces.append(surface)
+        elif key == 'SECT':
+            values = [float(value) for value in lines[i].split()[:5]]
+            i += 1
+            surface['sections'].append(AVLSection(*values))
+        elif key == 'AFIL':
+            surface['sections'][-1] = surface['sections'][-1]._replace(airfoil_file=lines[i])
+            i += 1
+        elif key == 'YDUP':
+            surface['y_duplicate'] = float(lines[i].split()[0])
+            i += 1
+        elif key == 'ANGL':
+            surface['angle'] = float(lines[i].split()[0])
+            i += 1
+        elif key == 'TRAN':
+            surface['translate'] = tuple(float(value) for value in lines[i].split()[:3])
+            i += 1
+        elif key == 'COMP':
+            surface['component'] = int(float(lines[i].split()[0]))
+            i += 1
+
+    return {'title': title, 'mach': mach, 'symmetric': symmetric,
+            'reference': (Sref, Cref, Bref, Xref),
+            'surfaces': [AVLSurface(**surface) for surface in surfaces]}
+
+
+def _segment_velocities(points, A, B, core):
+    """Velocidade induzida (M, N, 3) por segmentos A -> B de circulação unitária."""
+    r1 = points[:, None, :] - A[None, :, :]
+    r2 = points[:, None, :] - B[None, :, :]
+    cross = np.cross(r1, r2)
+    cross2 = (cross**2).sum(axis=-1)
+    n1 = np.linalg.norm(r1, axis=-1)
+    n2 = np.linalg.norm(r2, axis=-1)
+    r0 = (B - A)[None, :, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = (r0 * (r1 / n1[..., None] - r2 / n2[..., None])).sum(axis=-1) / cross2
+    factor = np.where(cross2 > core, factor, 0.0)
+    return cross * (factor / (4 * np.pi))[..., None]
+
+
+def _trailing_velocities(points, A, core):
+    """Velocidade induzida (M, N, 3) por semirretas de A a +infinito em x, circulação unitária."""
+    r = points[:, None, :] - A[None, :, :]
+    norm = np.linalg.norm(r, axis=-1)
+    # x_hat × r = (0, -r_z, r_y)
+    cross = np.stack([np.zeros_like(norm), -r[..., 2], r[..., 1]], axis=-1)
+    denominator = norm * (norm - r[..., 0])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(denominator > core, 1.0 / denominator, 0.0)
+    return cross * (factor / (4 * np.pi))[..., None]
+
+
+def _horseshoe_velocities(points, A, B, core):
+    return (_segment_velocities(points, A, B, core) + _trailing_velocities(points, B, core)
+            - _trailing_velocities(points, A, core))
+
+
+def _mirror_panels(panels: dict, y_duplicate: float) -> dict:
+    """Cópia espelhada em y = y_duplicate dos painéis de uma superfície (YDUPLICATE)."""
+    mirror = np.array([1.0, -1.0, 1.0])
+    offset = np.array([0.0, 2 * y_duplicate, 0.0])
+    strips = panels['strips']
+    return {
+        # A e B trocados: o vórtice ligado continua percorrido de -y para +y
+        'A': panels['B'] * mirror + offset, 'B': panels['A'] * mirror + offset,
+        'control': panels['control'] * mirror + offset, 'normal': panels['normal'] * mirror,
+        'strip_of_panel': panels['strip_of_panel'],
+        'strips': dict(strips, Yle=2 * y_duplicate - strips['Yle'],
+                       y_left=2 * y_duplicate - strips['y_right'], z_left=strips['z_right'],
+                       y_right=2 * y_duplicate - strips['y_left'], z_right=strips['z_left'],
+                       normal_y=-strips['normal_y']),
+    }
+
+
+class VortexLattice():
+    """
+    Método de malha de vórtices (ferraduras), só com NumPy.
+
+    A malha segue as mesmas definições do arquivo .avl: Nchord/Cspace e
+    Nspan/Sspace de cada superfície, seções interpoladas linearmente ao longo
+    da envergadura, incidência (Ainc + ANGLE) e cambra dos perfis aplicadas
+    nas normais, simetria em y = 0 por imagens e Prandtl-Glauert (x / beta)
+    na montagem da matriz de influência.
+
+    A matriz de influência é montada uma única vez, de forma vetorizada, e
+    resolvida (uma fatoração) para os escoamentos unitários em x e em z.
+    Como o problema é linear, a circulação de qualquer alpha é a combinação
+    cos(alpha) * G_x + sin(alpha) * G_z: uma varredura inteira custa um
+    produto de matrizes.
+
+    CL e Cm vêm das forças de Kutta-Joukowski nos vórtices ligados; CD é o
+    arrasto induzido no plano de Trefftz (não há arrasto viscoso, como no AVL
+    sem CDp). Superfícies com YDUPLICATE ganham uma cópia espelhada (só em
+    configurações sem simetria, como no AVL).
+
+    Args:
+        surfaces: Superfícies (AVLSurface)
+        reference: (Sref, Cref, Bref, Xref)
+        mach: Número de Mach
+        symmetric: Simetria em y = 0 (iYsym = 1)
+        coordinates: Coordenadas (x, y) dos perfis de cada seção, por
+            superfície; por padrão, lidas dos arquivos AFILE das seções
+            (seções sem perfil são placas planas)
+        base_dir: Diretório usado para os caminhos AFILE relativos que não
+            existirem a partir do diretório atual
+    """
+
+    def __init__(self, surfaces: Sequence[AVLSurface], reference: Tuple[float, float, float, float],
+                 mach: float = 0.0, symmetric: bool = True,
+                 coordinates: Optional[Sequence[Sequence[tuple]]] = None, base_dir: Optional[str] = None):
+        self.reference = reference
+        self.mach = mach
+        self.symmetric = symmetric
+
+        panels = []
+        for k, surface in enumerate(surfaces):
+            surface_panels = self._surface_panels(surface, None if coordinates is None else coordinates[k],
+                                                  base_dir)
+            panels.append(surface_panels)
+            if surface.y_duplicate is not None:
+                if symmetric:
+                    # Como no AVL, a imagem de y = 0 e a cópia de YDUPLICATE somariam duas vezes
+                    raise ValueError(f"Superfície '{surface.name}' com YDUPLICATE numa configuração "
+                                     f"simétrica (iYsym = 1).")
+                panels.append(_mirror_panels(surface_panels, surface.y_duplicate))
+        self.A, self.B, self.control, self.normals = (np.concatenate([p[n] for p in panels])
+                                                      for n in ('A', 'B', 'control', 'normal'))
+        self.strips = {key: np.concatenate([p['strips'][key] for p in panels])
+                       for key in panels[0]['strips']}
+        self.strip_of_panel = np.concatenate(
+            [p['strip_of_panel'] + sum(len(q['strips']['Chord']) for q in panels[:k])
+             for k, p in enumerate(panels)])
+        self.bound_midpoints = 0.5 * (self.A + self.B)
+
+        beta = np.sqrt(max(1 - mach**2, 0.05))
+        stretch = np.array([1 / beta, 1.0, 1.0])
+        lengths = np.linalg.norm(self.B - self.A, axis=1)
+        self._core = (1e-6 * lengths.mean())**2
+
+        # Pontos de controle e pontos médios dos vórtices ligados numa única avaliação
+        n = len(self.A)
+        points = np.concatenate([self.control, self.bound_midpoints]) * stretch
+        velocities = self._velocities(points, stretch)
+        self.aic = (velocities[:n] * self.normals[:, None, :]).sum(axis=-1)
+        # Uma fatoração, dois lados direitos: escoamentos unitários em x e em z
+        rhs = -np.stack([self.normals[:, 0], self.normals[:, 2]], axis=1)
+        self.unit_circulation = np.linalg.solve(self.aic, rhs)
+        # (3 n, n): velocidades induzidas nos vórtices ligados = matriz @ circulação
+        self._bound_velocities = np.ascontiguousarray(velocities[n:].transpose(0, 2, 1).reshape(3 * n, n))
+        self._trefftz = self._trefftz_matrix()
+
+    @classmethod
+    def from_config(cls, config_file: str) -> 'VortexLattice':
+        """Malha a partir de um arquivo .avl (ver read_avl_config)."""
+        config = read_avl_config(config_file)
+        return cls(config['surfaces'], config['reference'], config['mach'], config['symmetric'],
+                   base_dir=os.path.dirname(os.path.abspath(config_file)))
+
+    @classmethod
+    def from_bezier(cls, bezier_wing, twist=0.0, n_chord=12, c_space=1.0, n_span=40, s_space=-2.0,
+                    mach: float = 0.0) -> 'VortexLattice':
+        """
+        Malha da asa de um BezierAirfoil (ou WingGeometry), com a mesma
+        superfície de create_avl_config_from_bezier e os perfis lidos da
+        memória, sem arquivos.
+        """
+        geometry = getattr(bezier_wing, 'geometry', bezier_wing)
+        n = len(geometry.span)
+        surface = surface_from_bezier(geometry, twist=twist, airfoil_files=[None] * n, n_chord=n_chord,
+                                      c_space=c_space, n_span=n_span, s_space=s_space)
+        coordinates = [[(geometry.xu[i], geometry.yu[i]) for i in range(n)]]
+        return cls([surface], reference_dimensions(surface), mach, coordinates=coordinates)
+
+    def _surface_panels(self, surface: AVLSurface, coordinates, base_dir) -> dict:
+        sections = surface.sections
+        xle, yle, zle, chord, ainc = (np.array(column, dtype=float) for column in zip(*[s[:5] for s in sections]))
+        if surface.translate is not None:
+            dx, dy, dz = surface.translate
+            xle, yle, zle = xle + dx, yle + dy, zle + dz
+        if surface.angle is not None:
+            ainc = ainc + surface.angle
+
+        chord_nodes = spacing(surface.n_chord, surface.c_space)
+        width = np.diff(chord_nodes)
+        vortex_fraction = chord_nodes[:-1] + 0.25 * width
+        control_fraction = chord_nodes[:-1] + 0.75 * width
+
+        if coordinates is None:
+            coordinates = [None if s.airfoil_file is None
+                           else read_airfoil(_resolve_airfoil(s.airfoil_file, base_dir)) for s in sections]
+        slopes = np.array([np.zeros_like(control_fraction) if xy is None
+                           else camber_slope(xy[0], xy[1], control_fraction) for xy in coordinates])
+
+        # Posição ao longo da envergadura (comprimento do bordo de ataque no plano y-z)
+        s = np.concatenate([[0.0], np.cumsum(np.hypot(np.diff(yle), np.diff(zle)))])
+        edges = spacing(surface.n_span, surface.s_space) * s[-1]
+        centers = 0.5 * (edges[:-1] + edges[1:])
+
+        def edge(values):
+            return np.interp(edges, s, values)
+
+        leading = np.stack([edge(xle), edge(yle), edge(zle)], axis=1)
+        edge_chord = edge(chord)
+        center_leading = 0.5 * (leading[:-1] + leading[1:])
+        center_chord = 0.5 * (edge_chord[:-1] + edge_chord[1:])
+        center_ainc = np.radians(np.interp(centers, s, ainc))
+        center_slopes = np.stack([np.interp(centers, s, slopes[:, i]) for i in range(len(control_fraction))],
+                                 axis=1)
+
+        n_strips = len(centers)
+        x_hat = np.array([1.0, 0.0, 0.0])
+        # Painéis ordenados por faixa e, dentro da faixa, do bordo de ataque ao de fuga
+        A = (leading[:-1, None, :] + (edge_chord[:-1, None] * vortex_fraction)[..., None] * x_hat)
+        B = (leading[1:, None, :] + (edge_chord[1:, None] * vortex_fraction)[..., None] * x_hat)
+        control = center_leading[:, None, :] + (center_chord[:, None] * control_fraction)[..., None] * x_hat
+
+        spanwise = leading[1:] - leading[:-1]
+        spanwise[:, 0] = 0.0
+        strip_width = np.linalg.norm(spanwise, axis=1)
+        spanwise /= strip_width[:, None]
+        base_normal = np.cross(x_hat, spanwise)
+        theta = np.arctan(center_slopes) - center_ainc[:, None]
+        normal = np.cos(theta)[..., None] * base_normal[:, None, :] - np.sin(theta)[..., None] * x_hat
+
+        return {
+            'A': A.reshape(-1, 3), 'B': B.reshape(-1, 3), 'control': control.reshape(-1, 3),
+            'normal': normal.reshape(-1, 3),
+            'strip_of_panel': np.repeat(np.arange(n_strips), len(vortex_fraction)),
+            'strips': {'Yle': center_leading[:, 1], 'Chord': center_chord, 'Area': center_chord * strip_width,
+                       'Width': strip_width, 'y_left': leading[:-1, 1], 'z_left': leading[:-1, 2],
+                       'y_right': leading[1:, 1], 'z_right': leading[1:, 2],
+                       'normal_y': base_normal[:, 1], 'normal_z': base_normal[:, 2]},
+        }
+
+    def _velocities(self, points, stretch):
+        """Velocidades (M, N, 3) induzidas nos pontos pelas ferraduras (e imagens) de circulação unitária."""
+        A = self.A * stretch
+        B = self.B * stretch
+        velocities = _horseshoe_velocities(points, A, B, self._core)
+        if self.symmetric:
+            mirror = np.array([1.0, -1.0, 1.0])
+            # A imagem percorre o vórtice ligado no mesmo sentido (de -y para +y)
+            velocities += _horseshoe_velocities(points, B * mirror, A * mirror, self._core)
+        return velocities
+
+    def _trefftz_matrix(self):
+        """Velocidade normal (n_faixas, n_faixas) no plano de Trefftz por unidade de circulação da faixa."""
+        strips = self.strips
+        y = 0.5 * (strips['y_left'] + strips['y_right'])
+        z = 0.5 * (strips['z_left'] + strips['z_right'])
+
+        def point_vortex(y_vortex, z_vortex, sign):
+            # Vórtice 2D ao longo de +x: v = G / (2 pi |d|²) (-d_z, d_y)
+            dy = y[:, None] - y_vortex[None, :]
+            dz = z[:, None] - z_vortex[None, :]
+            d2 = dy**2 + dz**2
+            return sign * (-dz * strips['normal_y'][:, None] + dy * strips['normal_z'][:, None]) / (2 * np.pi * d2)
+
+        matrix = (point_vortex(strips['y_right'], strips['z_right'], 1.0)
+                  - point_vortex(strips['y_left'], strips['z_left'], 1.0))
+        if self.symmetric:
+            matrix += (point_vortex(-strips['y_left'], strips['z_left'], 1.0)
+                       - point_vortex(-strips['y_right'], strips['z_right'], 1.0))
+        return matrix
+
+    def solve(self, alphas) -> Dict[str, np.ndarray]:
+        """
+        Resolve vários ângulos de ataque de uma vez.
+
+        Args:
+            alphas: Ângulos de ataque em graus (escalar ou sequência)
+
+        Returns:
+            Dicionário com alpha, CL, CD, Cm, e (arrays (m,)) e strips
+            (Yle, Chord, Area e cl (n_faixas, m))
+        """
+        alphas = np.atleast_1d(np.asarray(alphas, dtype=float))
+        a = np.radians(alphas)
+        circulation = self.unit_circulation @ np.stack([np.cos(a), np.sin(a)])
+
+        freestream = np.stack([np.cos(a), np.zeros_like(a), np.sin(a)])
+        induced = (self._bound_velocities @ circulation).reshape(len(self.A), 3, len(a))
+        velocity = freestream[None, :, :] + induced
+        bound = (self.B - self.A)[:, :, None]
+        forces = np.cross(velocity, bound, axis=1) * circulation[:, None, :]
+
+        Sref, Cref, Bref, Xref = self.reference
+        q = 0.5
+        halves = 2.0 if self.symmetric else 1.0
+        lift_direction = np.stack([-np.sin(a), np.zeros_like(a), np.cos(a)])
+        panel_lift = (forces * lift_direction[None]).sum(axis=1)
+        CL = halves * panel_lift.sum(axis=0) / (q * Sref)
+
+        arm = self.bound_midpoints - np.array([Xref, 0.0, 0.0])
+        pitch = arm[:, 2, None] * forces[:, 0, :] - arm[:, 0, None] * forces[:, 2, :]
+        Cm = halves * pitch.sum(axis=0) / (q * Sref * Cref)
+
+        n_strips = len(self.strips['Chord'])
+        strip_circulation = np.zeros((n_strips, len(a)))
+        np.add.at(strip_circulation, self.strip_of_panel, circulation)
+        strip_lift = np.zeros_like(strip_circulation)
+        np.add.at(strip_lift, self.strip_of_panel, panel_lift)
+
+        normalwash = self._trefftz @ strip_circulation
+        drag = -0.5 * (strip_circulation * normalwash * self.strips['Width'][:, None]).sum(axis=0)
+        CD = halves * drag / (q * Sref)
+
+        AR = Bref**2 / Sref
+        with np.errstate(divide='ignore', invalid='ignore'):
+            e = np.where(CD > 0, CL**2 / (np.pi * AR * CD), np.nan)
+
+        return {
+            'alpha': alphas, 'CL': CL, 'CD': CD, 'Cm': Cm, 'e': e,
+            'strips': {'j': np.arange(1, n_strips + 1), 'Yle': self.strips['Yle'],
+                       'Chord': self.strips['Chord'], 'Area': self.strips['Area'],
+                       'cl': strip_lift / (q * self.strips['Area'][:, None])},
+        }
+
+
+def get_aero_coef_vlm(config_file, Cl_max_airfoil, alpha_start, alpha_end, alpha_step):
+    """
+    Mesma varredura de avl_runner.get_aero_coef, com o VortexLattice no lugar do AVL.
+
+    Todos os alphas são resolvidos de uma vez; o resultado é cortado no
+    primeiro alpha em que o cl de alguma faixa ultrapassa Cl_max_airfoil,
+    com o mesmo critério do AVL (avl_output.strip_cl_max, sem a primeira faixa).
+
+    Returns:
+        Tuple com os dicionários (CL_dict, CD_dict, Cm_dict) indexados por alpha
+    """
+    lattice = VortexLattice.from_config(config_file)
+    alpha_range = np.arange(alpha_start, alpha_end, alpha_step)
+    result = lattice.solve(alpha_range)
+    cl_max = strip_cl_max(result['strips'])
+
+    CL_dict = {}
+    CD_dict = {}
+    Cm_dict = {}
+    for k, alpha in enumerate(alpha_range):
+        if cl_max[k] > Cl_max_airfoil:
+            break
+        CL_dict[alpha] = float(result['CL'][k])
+        CD_dict[alpha] = float(result['CD'][k])
+        Cm_dict[alpha] = float(result['Cm'][k])
+    return CL_dict, CD_dict, Cm_dict
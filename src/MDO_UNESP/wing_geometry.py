@@ -0,0 +1,183 @@
+import json
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+# Linhas do bloco de arrays ao longo da envergadura
+SPANWISE_ROWS = ("span", "chord", "thickness", "camber", "camber_pos",
+                 "le_x", "le_y", "te_x", "te_y")
+_ROW = {name: i for i, name in enumerate(SPANWISE_ROWS)}
+
+# Constantes dos pontos de controle das curvas de bordo de ataque e de fuga
+_TE_Y = (0.1, 0.15, 0.3)
+_LE_Y = (1.1, 0.9)
+
+
+def _to_json(value):
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    raise TypeError(f"Valor não serializável em inputs: {value!r}")
+
+
+class WingGeometry():
+    """
+    Geometria de uma asa em dois blocos contíguos de float64.
+
+    ``spanwise`` tem forma (9, n_paineis), com uma linha por grandeza
+    (ver SPANWISE_ROWS), e ``sections`` tem forma (2, n_paineis, n_pontos),
+    com as coordenadas x e y dos perfis. Os atributos (span, chord, xu, ...)
+    são views nesses blocos, e as entradas do projeto (semi_span, thicks,
+    airfoil_files, ...) ficam em ``inputs``.
+
+    A serialização envia apenas os dois blocos: com pickle protocolo 5 eles
+    podem ir fora de banda sem cópia, e save/load usam np.savez.
+    """
+
+    __slots__ = ("inputs", "spanwise", "sections")
+
+    def __init__(self, inputs, spanwise, sections):
+        self.inputs = inputs
+        self.spanwise = spanwise
+        self.sections = sections
+
+    def __reduce__(self):
+        return (WingGeometry, (self.inputs, self.spanwise, self.sections))
+
+    @property
+    def number_of_panels(self) -> int:
+        return self.spanwise.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.spanwise.nbytes + self.sections.nbytes
+
+    @property
+    def span(self):
+        return self.spanwise[_ROW["span"]]
+
+    @property
+    def chord(self):
+        return self.spanwise[_ROW["chord"]]
+
+    @property
+    def thickness(self):
+        return self.spanwise[_ROW["thickness"]]
+
+    @property
+    def camber(self):
+        return self.spanwise[_ROW["camber"]]
+
+    @property
+    def camber_pos(self):
+        return self.spanwise[_ROW["camber_pos"]]
+
+    @property
+    def leading_edge(self):
+        """Curva do bordo de ataque, (n_paineis, 2)."""
+        return self.spanwise[_ROW["le_x"]:_ROW["le_y"] + 1].T
+
+    @property
+    def trailing_edge(self):
+        """Curva do bordo de fuga, (n_paineis, 2)."""
+        return self.spanwise[_ROW["te_x"]:_ROW["te_y"] + 1].T
+
+    @property
+    def xu(self):
+        return self.sections[0]
+
+    @property
+    def yu(self):
+        return self.sections[1]
+
+    @property
+    def z(self):
+        """Coordenada de envergadura de cada ponto dos perfis, sem cópia."""
+        return np.broadcast_to(self.span[:, None], self.xu.shape)
+
+    @property
+    def properties(self):
+        """Visão compatível com o antigo dicionário BezierAirfoil.properties."""
+        return PropertiesView(self)
+
+    def save(self, file_name: str) -> None:
+        """Grava os blocos num arquivo .npz (sem compressão)."""
+        np.savez(file_name, spanwise=self.spanwise, sections=self.sections,
+                 inputs=np.array(json.dumps(self.inputs, default=_to_json)))
+
+    @classmethod
+    def load(cls, file_name: str) -> "WingGeometry":
+        with np.load(file_name, allow_pickle=False) as data:
+            return cls(json.loads(str(data["inputs"])), data["spanwise"], data["sections"])
+
+
+class PropertiesView(MutableMapping):
+    """
+    Acesso por chave (como o antigo dicionário ``properties``) a um WingGeometry.
+
+    As grandezas calculadas ('span', 'chord', 'xu_0', 'z_0', 'te_y1', ...)
+    são lidas dos arrays, sem cópia; as demais chaves vêm de
+    ``geometry.inputs``, onde também são gravadas as novas chaves
+    (ex.: 'airfoil_files').
+    """
+
+    def __init__(self, geometry: WingGeometry):
+        self.geometry = geometry
+
+    def _computed(self, key):
+        geometry = self.geometry
+        if key in ("span", "chord", "thickness", "camber", "camber_pos"):
+            return geometry.spanwise[_ROW[key]]
+        if key == "ze_points":
+            return list(geometry.span)
+
+        semi_span = geometry.inputs["semi_span"]
+        constants = {
+            "te_x1": semi_span/3, "te_x2": 2 * semi_span/3,
+            "te_y1": _TE_Y[0], "te_y2": _TE_Y[1], "te_y3": _TE_Y[2],
+            "le_x1": semi_span/3, "le_x2": 2 * semi_span/3,
+            "le_y1": _LE_Y[0], "le_y2": _LE_Y[1],
+            "le_y3": _TE_Y[2] + geometry.inputs["chord_tip"],
+        }
+        if key in constants:
+            return constants[key]
+
+        prefix, _, index = key.rpartition("_")
+        if prefix in ("xu", "yu", "z") and index.isdigit() and int(index) < geometry.number_of_panels:
+            return getattr(geometry, prefix)[int(index)]
+        raise KeyError(key)
+
+    def _computed_keys(self):
+        keys = ["te_x1", "te_x2", "te_y1", "te_y2", "te_y3", "le_x1", "le_x2", "le_y1", "le_y2", "le_y3",
+                "span", "chord", "thickness", "camber", "camber_pos", "ze_points"]
+        for i in range(self.geometry.number_of_panels):
+            keys += [f"xu_{i}", f"yu_{i}", f"z_{i}"]
+        return keys
+
+    def __getitem__(self, key):
+        if key in self.geometry.inputs:
+            return self.geometry.inputs[key]
+        return self._computed(key)
+
+    def __setitem__(self, key, value):
+        self.geometry.inputs[key] = value
+
+    def __delitem__(self, key):
+        del self.geometry.inputs[key]
+
+    def __iter__(self):
+        seen = set(self.geometry.inputs)
+        yield from self.geometry.inputs
+        for key in self._computed_keys():
+            if key not in seen:
+                yield key
+
+    def __len__(self):
+        return len(set(self.geometry.inputs).union(self._computed_keys()))
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
@@ -0,0 +1,19 @@
+import os
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TESTS_DIR)
+
+
+@pytest.fixture
+def fake_avl():
+    """Comando que executa o substituto do AVL (tests/fake_avl.py)."""
+    return [sys.executable, os.path.join(TESTS_DIR, 'fake_avl.py')]
+
+
+@pytest.fixture
+def avl_config():
+    """Configuração .avl de referência gerada a partir da asa Bezier."""
+    return os.path.join(ROOT_DIR, 'bezier_wing.avl')
@@ -0,0 +1,355 @@
+"""
+Substituto do AVL para os testes.
+
+Imita o diálogo do AVL pelo stdin/stdout (prompts, menu OPER, comandos
+'a', 'd1', seleção de caso, 'x', 'ft', 'fs' e 'st', além de 'case' com
+arquivos .run) e grava as saídas no mesmo formato do AVL, usando um
+modelo aerodinâmico analítico e determinístico. Variáveis de ambiente:
+
+    FAKE_AVL_LOG          arquivo onde cada evento ('start', 'load', 'x <alpha>') é registrado
+    FAKE_AVL_CRASH_ALPHA  alpha em que o processo termina abruptamente (uma vez)
+    FAKE_AVL_HANG_ALPHA   alpha em que o processo deixa de responder (uma vez)
+    FAKE_AVL_STATE        arquivo usado para que as falhas ocorram uma única vez
+    FAKE_AVL_LATTICE_ERROR  c: CL e CD passam a depender da malha, com erro relativo
+                            c / (número de vórtices)
+"""
+import math
+import os
+import sys
+import time
+
+N_STRIPS = 20
+# Efeito do profundor 'd1' (por grau) no modelo
+CL_DELTA = 0.005
+CM_DELTA = -0.01
+TOP_PROMPT = '\n AVL   c>  '
+OPER_PROMPT = '\n OPER (AVL)   c>  '
+
+
+def log(event):
+    log_file = os.environ.get('FAKE_AVL_LOG')
+    if log_file:
+        with open(log_file, 'a') as f:
+            f.write(event + '\n')
+
+
+def write(text):
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+def read_line():
+    line = sys.stdin.readline()
+    if not line:
+        sys.exit(0)
+    return line.strip()
+
+
+def should_fail(variable, alpha):
+    value = os.environ.get(variable)
+    if value is None or abs(float(value) - alpha) > 1e-9:
+        return False
+    state = os.environ.get('FAKE_AVL_STATE')
+    if state:
+        if os.path.exists(state):
+            return False
+        open(state, 'w').close()
+    return True
+
+
+def read_config(config_file):
+    with open(config_file) as f:
+        lines = [line.split('!')[0].strip() for line in f]
+    lines = [line for line in lines if line and not line.startswith('#')]
+    mach = float(lines[1].split()[0])
+    sref, cref, bref = (float(value) for value in lines[3].split()[:3])
+    # Nchord * Nspan de cada SURFACE (a linha após o nome da superfície)
+    vortices = 0
+    for i, line in enumerate(lines):
+        if line.upper().startswith('SURF') and i + 2 < len(lines):
+            fields = lines[i + 2].split()
+            vortices += int(float(fields[0])) * int(float(fields[2]))
+    return {'title': lines[0], 'mach': mach, 'Sref': sref, 'Cref': cref, 'Bref': bref,
+            'Xref': float(lines[4].split()[0]), 'vortices': vortices}
+
+
+def solve(config, alpha, delta=0.0, beta=0.0):
+    aspect_ratio = config['Bref'] ** 2 / config['Sref']
+    cla = 2 * math.pi * aspect_ratio / (2 + math.sqrt(aspect_ratio ** 2 + 4))
+    pg = math.sqrt(max(1 - config['mach'] ** 2, 0.05))
+    cl = cla / pg * math.radians(alpha + 2.0) + CL_DELTA * delta
+    cdi = cl ** 2 / (math.pi * 0.95 * aspect_ratio)
+    cd = 0.004 + cdi
+    cl_alpha = cla / pg
+    lattice_error = os.environ.get('FAKE_AVL_LATTICE_ERROR')
+    if lattice_error and config['vortices']:
+        error = float(lattice_error) / config['vortices']
+        cl *= 1 - error
+        cd *= 1 + error
+        cl_alpha *= 1 - error
+    cm = -0.05 - 0.02 * cl + CM_DELTA * delta
+
+    strips = []
+    for j in range(1, N_STRIPS + 1):
+        eta = (j - 0.5) / N_STRIPS
+        chord = config['Cref'] * (1.15 - 0.3 * eta)
+        cl_strip = cl * (1.15 - 0.45 * eta ** 2)
+        strips.append({
+            'j': j, 'Yle': eta * config['Bref'] / 2, 'Chord': chord,
+            'Area': chord * config['Bref'] / 2 / N_STRIPS, 'c cl': cl_strip * chord / config['Cref'],
+            'ai': -cl / (math.pi * aspect_ratio), 'cl_norm': cl_strip, 'cl': cl_strip,
+            'cd': cdi * (1 + eta), 'cdv': 0.0, 'cm_c/4': -0.05, 'cm_LE': -0.05 - cl_strip / 4,
+            'C.P.x/c': 0.25 + 0.05 / max(abs(cl_strip), 1e-3),
+        })
+    alpha_rad = math.radians(alpha)
+    return {
+        'alpha': alpha, 'CL': cl, 'CD': cd, 'CDind': cdi, 'Cm': cm,
+        'CX': cl * math.sin(alpha_rad) - cd * math.cos(alpha_rad),
+        'CZ': -cl * math.cos(alpha_rad) - cd * math.sin(alpha_rad),
+        'e': 0.95, 'CLa': cl_alpha, 'delta': delta, 'strips': strips,
+        'beta': beta, 'CY': -0.01 * beta, 'Cn': 0.001 * beta,
+    }
+
+
+def total_forces(config, result):
+    return '\n'.join([
+        ' ---------------------------------------------------------------',
+        ' Vortex Lattice Output -- Total Forces',
+        '',
+        f' Configuration: {config["title"]}',
+        '     # Surfaces =   1',
+        f'     # Strips   =  {N_STRIPS}',
+        f'     # Vortices = {N_STRIPS * 12}',
+        '',
+        f'  Sref = {config["Sref"]:10.5f}   Cref = {config["Cref"]:10.5f}   Bref = {config["Bref"]:10.5f}',
+        f'  Xref = {config["Xref"]:10.5f}   Yref = {0.0:10.5f}   Zref = {0.0:10.5f}',
+        '',
+        ' Standard axis orientation,  X fwd, Z down',
+        '',
+        ' Run case:  -unnamed-',
+        '',
+        f'  Alpha = {result["alpha"]:10.5f}     pb/2V =  -0.00000     p\'b/2V =  -0.00000',
+        f'  Beta  = {result["beta"]:10.5f}     qc/2V =   0.00000',
+        f'  Mach  = {config["mach"]:9.3f}     rb/2V =  -0.00000     r\'b/2V =  -0.00000',
+        '',
+        f'  CXtot = {result["CX"]:10.5f}     Cltot =  -0.00000     Cl\'tot =  -0.00000',
+        f'  CYtot = {result["CY"]:10.5f}     Cmtot = {result["Cm"]:10.5f}',
+        f'  CZtot = {result["CZ"]:10.5f}     Cntot = {result["Cn"]:10.5f}     Cn\'tot = {result["Cn"]:10.5f}',
+        '',
+        f'  CLtot = {result["CL"]:10.5f}',
+        *([f'  elevator        = {result["delta"]:10.5f}'] if result.get('controls') else []),
+        f'  CDtot = {result["CD"]:10.5f}',
+        f'  CDvis =    0.00000     CDind = {result["CDind"]:10.5f}',
+        f'  CLff  = {result["CL"]:10.5f}     CDff  = {result["CDind"]:10.5f}    | Trefftz',
+        f'  CYff  =  -0.00000         e = {result["e"]:9.4f}    | Plane',
+        '',
+        ' ---------------------------------------------------------------',
+        '',
+    ])
+
+
+def strip_forces(config, result):
+    lines = [
+        ' ---------------------------------------------------------------',
+        ' Surface and Strip Forces by surface',
+        f'  Sref = {config["Sref"]:10.5f}   Cref = {config["Cref"]:10.5f}   Bref = {config["Bref"]:10.5f}',
+        f'  Xref = {config["Xref"]:10.5f}   Yref = {0.0:10.5f}   Zref = {0.0:10.5f}',
+        '',
+        f'  Surface # 1     {config["title"]}',
+        f'     # Chordwise = 12   # Spanwise = {N_STRIPS}     First strip =  1',
+        f'     Surface area Ssurf = {config["Sref"] / 2:11.6f}     Ave. chord Cave = {config["Cref"]:11.6f}',
+        '',
+        ' Forces referred to Sref, Cref, Bref about Xref, Yref, Zref',
+        ' Standard axis orientation,  X fwd, Z down',
+        f'     CLsurf  = {result["CL"]:10.5f}     Clsurf  =  -0.00000',
+        f'     CYsurf  =  -0.00000     Cmsurf  = {result["Cm"]:10.5f}',
+        f'     CDsurf  = {result["CD"]:10.5f}     Cnsurf  =  -0.00000',
+        f'     CDisurf = {result["CDind"]:10.5f}     CDvsurf =   0.00000',
+        '',
+        ' Forces referred to Ssurf, Cave about root LE on hinge axis',
+        f'     CL_srf  = {result["CL"]:10.5f}     CD_srf  = {result["CD"]:10.5f}',
+        ' Strip Forces referred to Strip Area, Chord',
+        '    j     Yle    Chord     Area     c cl      ai      cl_norm  cl       cd       cdv    cm_c/4    cm_LE  C.P.x/c',
+    ]
+    for strip in result['strips']:
+        lines.append(f'  {strip["j"]:3d} {strip["Yle"]:8.4f} {strip["Chord"]:8.4f} {strip["Area"]:8.4f} '
+                     f'{strip["c cl"]:8.4f} {strip["ai"]:8.4f} {strip["cl_norm"]:8.4f} {strip["cl"]:8.4f} '
+                     f'{strip["cd"]:8.4f} {strip["cdv"]:8.4f} {strip["cm_c/4"]:8.4f} {strip["cm_LE"]:8.4f} '
+                     f'{strip["C.P.x/c"]:8.4f}')
+    # Rodapé com o mesmo número de linhas (28) que o get_clmax original descarta.
+    footer = [
+        ' ---------------------------------------------------------------',
+        ' Surface Forces (referred to Sref,Cref,Bref about Xref,Yref,Zref)',
+        ' Standard axis orientation,  X fwd, Z down',
+        '',
+        '   n      Area      CL       CD       Cm       CY       Cn       Cl      CDi      CDv',
+        f'   1 {config["Sref"] / 2:9.4f} {result["CL"]:8.4f} {result["CD"]:8.4f} {result["Cm"]:8.4f}'
+        '   0.0000   0.0000   0.0000 '
+        f'{result["CDind"]:8.4f}   0.0000',
+        '',
+    ]
+    footer += [''] * (27 - len(footer))
+    footer += [' ---------------------------------------------------------------']
+    return '\n'.join(lines + footer) + '\n'
+
+
+def stability_derivatives(config, result):
+    """Saída 'st': forças totais seguidas das derivadas de estabilidade (por radiano)."""
+    cla = result['CLa']
+    cma = -0.02 * cla
+    xnp = config['Xref'] - config['Cref'] * cma / cla
+    return total_forces(config, result) + '\n'.join([
+        ' Stability-axis derivatives...',
+        '',
+        '                             alpha                beta',
+        '                  ----------------       ----------------',
+        f' z\' force CL |    CLa = {cla:10.6f}    CLb =  -0.000000',
+        ' y  force CY |    CYa =   0.000000    CYb =  -0.000000',
+        ' x\' mom.  Cl\'|    Cla =   0.000000    Clb =  -0.000000',
+        f' y  mom.  Cm |    Cma = {cma:10.6f}    Cmb =   0.000000',
+        ' z\' mom.  Cn\'|    Cna =   0.000000    Cnb =   0.000000',
+        '',
+        f' Neutral point  Xnp = {xnp:10.6f}',
+        '',
+    ]) + '\n'
+
+
+def output(command, text):
+    """Grava a saída no arquivo informado (ou na tela, se o nome for vazio)."""
+    parts = command.split(maxsplit=1)
+    write(' Enter filename, or <return> for screen output   s>  ')
+    file_name = parts[1] if len(parts) > 1 else read_line()
+    if not file_name:
+        write('\n' + text)
+        return
+    mode = 'w'
+    if os.path.exists(file_name):
+        write(' File exists.  Append/Overwrite/Cancel  (A/O/C)?  C>  ')
+        answer = read_line().upper()[:1]
+        if answer not in ('A', 'O'):
+            return
+        mode = 'a' if answer == 'A' else 'w'
+    with open(file_name, mode) as f:
+        f.write(text)
+
+
+def read_run_file(run_file):
+    """Casos de um arquivo .run: alpha e beta (restrições '->') e Mach de cada caso."""
+    cases = []
+    with open(run_file) as f:
+        for line in f:
+            text = line.strip()
+            if text.startswith('Run case'):
+                cases.append({'alpha': 0.0, 'beta': 0.0, 'mach': None})
+            elif cases and '->' in text:
+                variable = text.split('->')[0].strip()
+                value = float(text.split('=')[1].split()[0])
+                if variable in ('alpha', 'beta'):
+                    cases[-1][variable] = value
+            elif cases and text.split('=')[0].strip() == 'Mach':
+                cases[-1]['mach'] = float(text.split('=')[1].split()[0])
+    return cases
+
+
+def trim(config, constraints):
+    """
+    Resolve alpha e d1 que satisfazem as restrições ('a a <alpha>', 'a c <CL>',
+    'a pm <Cm>', 'd1 d1 <graus>', 'd1 pm <Cm>'); o modelo é linear, então
+    basta montar o sistema 2x2 a partir de três avaliações.
+    """
+    def residuals(alpha, delta):
+        result = solve(config, alpha, delta)
+        values = {'a': alpha, 'd1': delta, 'c': result['CL'], 'pm': result['Cm']}
+        return [values[constraints['a'][0]] - constraints['a'][1],
+                values[constraints['d1'][0]] - constraints['d1'][1]]
+
+    r0 = residuals(0.0, 0.0)
+    ra = residuals(1.0, 0.0)
+    rd = residuals(0.0, 1.0)
+    j11, j12 = ra[0] - r0[0], rd[0] - r0[0]
+    j21, j22 = ra[1] - r0[1], rd[1] - r0[1]
+    determinant = j11 * j22 - j12 * j21
+    alpha = (-r0[0] * j22 + r0[1] * j12) / determinant
+    delta = (-r0[1] * j11 + r0[0] * j21) / determinant
+    return alpha, delta
+
+
+def oper(base_config, cases=()):
+    alpha = 0.0
+    beta = 0.0
+    config = base_config
+    result = None
+    constraints = {'a': ('a', 0.0), 'd1': ('d1', 0.0)}
+    controls = False
+    write(OPER_PROMPT)
+    while True:
+        command = read_line()
+        tokens = command.split()
+        if not tokens:
+            return
+        key = tokens[0].lower()
+        if key == 'a':
+            tokens = tokens[1:]
+            if not tokens:
+                write(' Select new  constraint,value  for alpha          c>  ')
+                tokens = read_line().split()
+            if len(tokens) < 2:
+                write(' Enter specified alpha:  ')
+                tokens.append(read_line())
+            constraints['a'] = (tokens[0].lower(), float(tokens[1]))
+        elif key.isdigit() and 1 <= int(key) <= len(cases):
+            case = cases[int(key) - 1]
+            constraints['a'] = ('a', case['alpha'])
+            beta = case['beta']
+            config = base_config if case['mach'] is None else dict(base_config, mach=case['mach'])
+        elif key == 'd1':
+            constraints['d1'] = (tokens[1].lower(), float(tokens[2]))
+            controls = True
+        elif key == 'x':
+            alpha, delta = trim(config, constraints)
+            if should_fail('FAKE_AVL_CRASH_ALPHA', alpha):
+                os._exit(3)
+            if should_fail('FAKE_AVL_HANG_ALPHA', alpha):
+                time.sleep(3600)
+            log(f'x {alpha}')
+            result = solve(config, alpha, delta, beta)
+            result['controls'] = controls
+            write(total_forces(config, result))
+        elif key == 'ft' and result is not None:
+            output(command, total_forces(config, result))
+        elif key == 'fs' and result is not None:
+            output(command, strip_forces(config, result))
+        elif key == 'st' and result is not None:
+            output(command, stability_derivatives(config, result))
+        write(OPER_PROMPT)
+
+
+def main():
+    log('start')
+    config = None
+    cases = []
+    write(' ===================================================\n'
+          '  Athena Vortex Lattice  Program      Version  3.35\n'
+          ' ===================================================\n')
+    write(TOP_PROMPT)
+    while True:
+        command = read_line()
+        tokens = command.split()
+        key = tokens[0].lower() if tokens else ''
+        if key == 'load':
+            config_file = tokens[1] if len(tokens) > 1 else read_line()
+            log('load')
+            config = read_config(config_file)
+        elif key == 'case':
+            run_file = tokens[1] if len(tokens) > 1 else read_line()
+            log('case')
+            cases = read_run_file(run_file)
+        elif key == 'oper' and config is not None:
+            oper(config, cases)
+        elif key == 'quit':
+            return
+        write(TOP_PROMPT)
+
+
+if __name__ == '__main__':
+    main()
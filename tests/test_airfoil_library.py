@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+import pytest
+
+from MDO_UNESP.airfoil_library import AirfoilLibrary
+from MDO_UNESP.avl_generator import create_avl_config_from_bezier
+from MDO_UNESP.bezier_airfoil import BezierAirfoil
+
+
+def make_properties(**overrides):
+    properties = {
+        "semi_span": 1,
+        "number_of_panels": 25,
+        "chord_root": 1,
+        "chord_tip": 0.8,
+        "thicks": [0.14, 0.14, 0.14, 0.14],
+        "cambers": [0.02, 0.02, 0.02, 0.02],
+        "cambers_pos": [0.40, 0.40, 0.40, 0.40],
+    }
+    properties.update(overrides)
+    return properties
+
+
+def test_constant_sections_share_one_file(tmp_path):
+    library = AirfoilLibrary(str(tmp_path / 'lib'))
+    wing = BezierAirfoil(make_properties())
+    files = wing.write_airfoil_files(library=library)
+    assert len(files) == 25 and len(set(files)) == 1
+    assert os.listdir(tmp_path / 'lib') == [os.path.basename(files[0])]
+    assert library.stats() == {'hits': 24, 'misses': 1, 'hit_rate': 24 / 25, 'files': 1}
+
+    data = np.loadtxt(files[0], skiprows=1)
+    xu, yu = wing.naca_4digits(0.02, 0.40, 0.14)
+    np.testing.assert_allclose(data[:, 0], xu, atol=5e-7)
+    np.testing.assert_allclose(data[:, 1], yu, atol=5e-7)
+
+    wing.properties["airfoil_files"] = files
+    create_avl_config_from_bezier(str(tmp_path / 'wing.avl'), wing)
+    assert (tmp_path / 'wing.avl').read_text().count(files[0]) == 25
+
+
+def test_files_are_shared_across_designs(tmp_path):
+    library = AirfoilLibrary(str(tmp_path))
+    varying = make_properties(thicks=[0.14, 0.12, 0.11, 0.10])
+    first = BezierAirfoil(varying).write_airfoil_files(library=library)
+    misses = library.misses
+    assert misses == len(set(first))
+
+    # Mesma asa de novo: tudo vem da biblioteca
+    assert BezierAirfoil(dict(varying)).write_airfoil_files(library=library) == first
+    assert library.misses == misses
+
+    # Outra instância no mesmo diretório reaproveita os arquivos em disco
+    other = AirfoilLibrary(str(tmp_path))
+    assert other.wing_files(BezierAirfoil(dict(varying)).geometry) == first
+    assert other.misses == 0 and other.hit_rate == 1.0
+
+
+def test_quantization_merges_close_sections(tmp_path):
+    library = AirfoilLibrary(str(tmp_path), step=1e-3)
+    files = library.airfoil_files([0.02, 0.0201, 0.03], [0.4, 0.4, 0.4], [0.12, 0.12, 0.12], npts=30,
+                                  spacing='cosine')
+    assert files[0] == files[1] != files[2]
+    assert len(np.loadtxt(files[2], skiprows=1)) == 59
+
+
+def test_failed_write_is_retried(tmp_path, monkeypatch):
+    library = AirfoilLibrary(str(tmp_path))
+    # Arquivo deixado por um processo interrompido: é substituído pelo conteúdo correto
+    file_name = library.airfoil_files([0.02], [0.4], [0.12])[0]
+    with open(file_name, 'w') as f:
+        f.write('truncado')
+
+    def fail(path, text):
+        raise OSError('disco cheio')
+
+    monkeypatch.setattr('MDO_UNESP.airfoil_library.write_if_changed', fail)
+    other = AirfoilLibrary(str(tmp_path))
+    with pytest.raises(OSError):
+        other.airfoil_files([0.02], [0.4], [0.12])
+    monkeypatch.undo()
+    assert other.stats()['files'] == 0
+    assert other.airfoil_files([0.02], [0.4], [0.12]) == [file_name]
+    assert other.misses == 1
+    assert len(np.loadtxt(file_name, skiprows=1)) == 199
@@ -0,0 +1,120 @@
+import asyncio
+import sys
+
+import pytest
+
+from MDO_UNESP.avl_async import AsyncAVLEvaluator, AsyncAVLSession, AVLTimeoutError
+from MDO_UNESP.avl_runner import get_aero_coef
+
+
+def test_evaluate_matches_get_aero_coef(fake_avl, avl_config):
+    evaluator = AsyncAVLEvaluator(avl_path=fake_avl)
+    result = asyncio.run(evaluator.evaluate(avl_config, 1.2, -4, 16, 1.0))
+    expected = get_aero_coef(avl_config, 1.2, -4, 16, 1.0, avl_path=fake_avl, in_memory=True)
+    assert result.ok
+    assert (result.CL, result.CD, result.Cm) == expected
+
+
+def test_evaluate_many_bounded_concurrency(fake_avl, avl_config):
+    evaluator = AsyncAVLEvaluator(max_concurrency=3, avl_path=fake_avl)
+    results = asyncio.run(evaluator.evaluate_many([avl_config] * 12, 1.2, 0, 4, 1.0))
+    assert len(results) == 12
+    assert all(result.ok for result in results)
+    assert evaluator.stats() == {'ok': 12, 'timeouts': 0, 'errors': 0, 'peak_running': 3}
+
+
+def test_failures_are_results(fake_avl, avl_config, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_CRASH_ALPHA', '2.0')
+    evaluator = AsyncAVLEvaluator(avl_path=fake_avl)
+    result = asyncio.run(evaluator.evaluate(avl_config, 1.2, 0, 4, 1.0))
+    assert result.status == 'error'
+    assert list(result.CL) == [0.0, 1.0]
+
+    monkeypatch.delenv('FAKE_AVL_CRASH_ALPHA')
+    monkeypatch.setenv('FAKE_AVL_HANG_ALPHA', '1.0')
+    evaluator = AsyncAVLEvaluator(avl_path=fake_avl, solve_timeout=0.5)
+    assert asyncio.run(evaluator.evaluate(avl_config, 1.2, 0, 4, 1.0)).status == 'timeout'
+
+    evaluator = AsyncAVLEvaluator(avl_path=fake_avl, sweep_timeout=0.5)
+    result = asyncio.run(evaluator.evaluate(avl_config, 1.2, 0, 4, 1.0))
+    assert result.status == 'timeout'
+    assert list(result.CL) == [0.0]
+    assert evaluator.stats()['timeouts'] == 1
+
+
+def test_cancellation_kills_process(fake_avl, avl_config, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_HANG_ALPHA', '1.0')
+
+    async def main():
+        session = AsyncAVLSession(avl_config, avl_path=fake_avl)
+
+        async def sweep():
+            async with session:
+                for alpha in (0.0, 1.0):
+                    await session.solve_alpha(alpha)
+
+        task = asyncio.ensure_future(sweep())
+        while session._process is None:
+            await asyncio.sleep(0.05)
+        process = session._process
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return session, process
+
+    session, process = asyncio.run(main())
+    assert not session.is_running
+    assert process.returncode is not None
+
+
+def test_session_timeout(fake_avl, avl_config, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_HANG_ALPHA', '0.0')
+
+    async def main():
+        async with AsyncAVLSession(avl_config, avl_path=fake_avl, timeout=0.5) as session:
+            await session.solve_alpha(0.0)
+
+    with pytest.raises(AVLTimeoutError):
+        asyncio.run(main())
+
+
+def test_solve_alpha_releases_trim(fake_avl, avl_config):
+    async def main():
+        async with AsyncAVLSession(avl_config, avl_path=fake_avl) as session:
+            expected, _ = await session.solve_alpha(4.0)
+            await session.solve_constraints(['a c 0.5', 'd1 pm 0'])
+            totals, _ = await session.solve_alpha(4.0)
+        return expected, totals
+
+    expected, totals = asyncio.run(main())
+    assert totals['Cmtot'] == pytest.approx(expected['Cmtot'])
+    assert totals['elevator'] == pytest.approx(0.0)
+
+
+def test_failed_start_kills_process(avl_config):
+    silent = [sys.executable, '-c', 'import time; time.sleep(60)']
+
+    async def main():
+        session = AsyncAVLSession(avl_config, avl_path=silent, timeout=0.5)
+        task = asyncio.ensure_future(session.start())
+        while session._process is None:
+            await asyncio.sleep(0.01)
+        process = session._process
+        with pytest.raises(AVLTimeoutError):
+            await task
+        return session, process
+
+    session, process = asyncio.run(main())
+    assert session._process is None
+    assert process.returncode is not None
+
+    evaluator = AsyncAVLEvaluator(avl_path=silent, solve_timeout=0.5)
+    assert asyncio.run(evaluator.evaluate(avl_config, 1.2, 0, 4, 1.0)).status == 'timeout'
+
+
+def test_missing_executable_is_error_result(avl_config, tmp_path):
+    evaluator = AsyncAVLEvaluator(avl_path=str(tmp_path / 'nao_existe'))
+    result = asyncio.run(evaluator.evaluate(avl_config, 1.2, 0, 4, 1.0))
+    assert result.status == 'error'
+    assert evaluator.stats()['errors'] == 1
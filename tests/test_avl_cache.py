@@ -0,0 +1,95 @@
+import os
+import shutil
+
+import numpy as np
+
+from MDO_UNESP.avl_cache import AVLResultCache
+from MDO_UNESP.avl_runner import get_aero_coef
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_config(tmp_path):
+    """Cópia da asa de referência com perfis resolvíveis a partir do diretório do .avl."""
+    shutil.copytree(os.path.join(ROOT_DIR, 'airfoils'), tmp_path / 'airfoils')
+    with open(os.path.join(ROOT_DIR, 'bezier_wing.avl')) as f:
+        text = f.read().replace('\\', '/')
+    config_file = tmp_path / 'wing.avl'
+    config_file.write_text(text)
+    return str(config_file)
+
+
+def test_key_ignores_comments_and_tracks_airfoils(tmp_path, monkeypatch):
+    # Os AFILE são resolvidos a partir do diretório de trabalho, como no AVL
+    monkeypatch.chdir(tmp_path)
+    config_file = make_config(tmp_path)
+    cache = AVLResultCache(str(tmp_path / 'cache'))
+    key = cache.key(config_file, 2.0)
+
+    with open(config_file) as f:
+        text = f.read()
+    with open(config_file, 'w') as f:
+        f.write('# comentario\n' + text.replace('  ', '   '))
+    assert cache.key(config_file, 2.0) == key
+    assert cache.key(config_file, 2.5) != key
+    assert cache.key(config_file, 2.0, mach=0.3) != key
+
+    with open(tmp_path / 'airfoils' / 'bezier_section_3.dat', 'a') as f:
+        f.write('1.0 0.0\n')
+    assert cache.key(config_file, 2.0) != key
+
+
+def test_sweep_served_from_cache(fake_avl, tmp_path, monkeypatch):
+    config_file = make_config(tmp_path)
+    log_file = tmp_path / 'avl.log'
+    monkeypatch.setenv('FAKE_AVL_LOG', str(log_file))
+    cache = AVLResultCache(str(tmp_path / 'cache'))
+
+    expected = get_aero_coef(config_file, 1.2, -2, 6, 1.0, avl_path=fake_avl, cache=cache)
+    assert cache.stats() == {'hits': 0, 'misses': 8, 'hit_rate': 0.0}
+    log_file.unlink()
+
+    assert get_aero_coef(config_file, 1.2, -2, 6, 1.0, avl_path=fake_avl, cache=cache) == expected
+    assert cache.hits == 8
+    # Nenhum processo do AVL foi iniciado
+    assert not log_file.exists()
+
+
+def test_lru_eviction_and_atomic_writes(tmp_path):
+    cache = AVLResultCache(str(tmp_path), max_bytes=10**9)
+    strips = {'j': np.arange(1.0, 41.0), 'cl': np.linspace(0.1, 0.9, 40)}
+    cache.put('a', {'CLtot': 0.1}, strips)
+    entry_size = os.path.getsize(tmp_path / 'a.npz')
+    cache.max_bytes = 2 * entry_size
+
+    cache.put('b', {'CLtot': 0.2}, strips)
+    os.utime(tmp_path / 'b.npz', ns=(1, 1))
+    assert cache.get('a')[0] == {'CLtot': 0.1}
+    cache.put('c', {'CLtot': 0.3}, strips)
+
+    # 'b' era a entrada usada há mais tempo
+    assert sorted(os.listdir(tmp_path)) == ['a.npz', 'c.npz']
+    assert cache.get('b') is None
+    totals, cached_strips = cache.get('c')
+    np.testing.assert_array_equal(cached_strips['cl'], strips['cl'])
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_eviction_without_rescanning(tmp_path):
+    cache = AVLResultCache(str(tmp_path), rescan_every=10)
+    strips = {'cl': np.linspace(0.1, 0.9, 40)}
+    cache.put('a', {'CLtot': 0.0}, strips)
+    entry_size = os.path.getsize(tmp_path / 'a.npz')
+    cache.max_bytes = 3 * entry_size
+    for i in range(1, 20):
+        cache.put(f'{i:02d}', {'CLtot': float(i)}, strips)
+        cache.get('a')
+    # Varreduras só na primeira, na décima e na vigésima escrita
+    assert cache.scans == 3
+    assert sorted(os.listdir(tmp_path)) == ['18.npz', '19.npz', 'a.npz']
+
+    # Outro processo no mesmo diretório: entradas aparecem na próxima varredura
+    other = AVLResultCache(str(tmp_path), max_bytes=3 * entry_size)
+    other.put('b', {'CLtot': 0.5}, strips)
+    assert len(os.listdir(tmp_path)) == 3
+
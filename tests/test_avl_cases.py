@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_cases import MAX_CASES, RunCase, envelope, format_run_file, run_cases, run_envelope, write_run_file
+from MDO_UNESP.avl_runner import get_aero_coef
+
+
+def test_envelope_order():
+    cases = envelope([0.0, 2.0], machs=[0.1, 0.3], betas=[0.0, 5.0])
+    assert len(cases) == 8
+    assert cases[0] == RunCase(alpha=0.0, beta=0.0, mach=0.1)
+    assert cases[1] == RunCase(alpha=2.0, beta=0.0, mach=0.1)
+    assert cases[-1] == RunCase(alpha=2.0, beta=5.0, mach=0.3)
+
+
+def test_run_file_format(tmp_path):
+    text = format_run_file([RunCase(alpha=2.0, beta=-1.0, mach=0.2, name='cruzeiro')])
+    assert ' Run case  1:  cruzeiro' in text
+    assert ' alpha        ->  alpha       =    2.00000' in text
+    assert ' beta         ->  beta        =   -1.00000' in text
+    assert ' Mach      =    0.20000' in text
+
+    run_file = tmp_path / 'cases.run'
+    assert write_run_file(run_file, [RunCase()])
+    assert not write_run_file(run_file, [RunCase()])
+    with pytest.raises(ValueError):
+        write_run_file(run_file, [RunCase()] * (MAX_CASES + 1))
+
+
+def test_envelope_single_load(fake_avl, avl_config, tmp_path, monkeypatch):
+    log_file = tmp_path / 'log'
+    monkeypatch.setenv('FAKE_AVL_LOG', str(log_file))
+    alphas = [-2.0, 0.0, 2.0, 4.0]
+    machs = [0.0, 0.3, 0.5]
+    betas = [0.0, 4.0]
+    grid = run_envelope(avl_config, alphas, machs=machs, betas=betas, avl_path=fake_avl)
+
+    events = log_file.read_text().split('\n')
+    assert events.count('start') == 1
+    assert events.count('load') == 1
+    assert events.count('case') == 1
+    assert sum(event.startswith('x ') for event in events) == 24
+
+    assert grid['CL'].shape == (3, 2, 4)
+    assert grid['cl'].shape == (3, 2, 4, len(grid['Yle']))
+    np.testing.assert_allclose(grid['alpha'], np.broadcast_to(alphas, (3, 2, 4)))
+    np.testing.assert_allclose(grid['mach'][:, 0, 0], machs)
+    np.testing.assert_allclose(grid['beta'][0, :, 0], betas)
+    # Prandtl-Glauert: CL cresce com Mach no mesmo alpha
+    assert np.all(np.diff(grid['CL'][:, 0, -1]) > 0)
+    assert np.all(grid['CY'][:, 0, :] == 0.0)
+    assert np.all(grid['CY'][:, 1, :] < 0.0)
+
+    # Mach zero e beta zero reproduzem a varredura em alpha
+    CL, _, _ = get_aero_coef(avl_config, 1.2, -2, 5, 2.0, avl_path=fake_avl, in_memory=True)
+    np.testing.assert_allclose(grid['CL'][0, 0], [CL[alpha] for alpha in alphas], rtol=1e-4)
+
+
+def test_run_cases_many_files(fake_avl, avl_config, tmp_path, monkeypatch):
+    log_file = tmp_path / 'log'
+    monkeypatch.setenv('FAKE_AVL_LOG', str(log_file))
+    alphas = np.linspace(-4.0, 8.0, MAX_CASES + 5)
+    result = run_cases(avl_config, envelope(alphas), avl_path=fake_avl, work_dir=str(tmp_path))
+
+    events = log_file.read_text().split('\n')
+    assert events.count('load') == 1
+    assert events.count('case') == 2
+    np.testing.assert_allclose(result['alpha'], alphas, atol=1e-4)
+    assert np.all(np.diff(result['CL']) > 0)
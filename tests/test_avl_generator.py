@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_generator import (AVLControl, AVLSection, AVLSurface, create_avl_config_from_bezier,
+                                     format_avl_config, reference_dimensions, select_discretization,
+                                     surface_from_bezier)
+from MDO_UNESP.bezier_airfoil import BezierAirfoil
+
+
+def make_wing(number_of_panels=5):
+    wing = BezierAirfoil({
+        "semi_span": 1.3,
+        "number_of_panels": number_of_panels,
+        "chord_root": 1,
+        "chord_tip": 0.8,
+        "thicks": [0.14, 0.12, 0.11, 0.10],
+        "cambers": [0.02, 0.03, 0.025, 0.02],
+        "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+    })
+    wing.properties["airfoil_files"] = [f"s{i}.dat" for i in range(number_of_panels)]
+    return wing
+
+
+def tail_surface():
+    return AVLSurface("eh", [AVLSection(0.0, 0.0, 0.0, 0.3, 0.0, "naca0012.dat"),
+                             AVLSection(0.05, 0.5, 0.0, 0.2, 0.0, "naca0012.dat")],
+                      n_chord=6, n_span=10, translate=(2.0, 0.0, 0.2), angle=-2.0)
+
+
+def test_multi_surface_config(tmp_path):
+    file_name = tmp_path / "aircraft.avl"
+    twist = np.linspace(0.0, -3.0, 5)
+    create_avl_config_from_bezier(str(file_name), make_wing(), surface_name="asa", twist=twist,
+                                  n_chord=8, n_span=24, extra_surfaces=[tail_surface()])
+    lines = file_name.read_text().splitlines()
+
+    assert lines.count("SURFACE") == 2 and lines.count("SECTION") == 7
+    surfaces = [i for i, line in enumerate(lines) if line == "SURFACE"]
+    assert lines[surfaces[0] + 1] == "asa" and lines[surfaces[0] + 3] == "8  1.0  24  -2.0"
+    assert lines[surfaces[1] + 3] == "6  1.0  10  -2.0"
+    assert lines[lines.index("TRANSLATE") + 1] == "2.0 0.0 0.2"
+    assert lines[lines.index("ANGLE") + 1] == "-2.0"
+
+    sections = [i for i, line in enumerate(lines) if line == "SECTION"]
+    ainc = [float(lines[i + 2].split()[4]) for i in sections[:5]]
+    np.testing.assert_allclose(ainc, twist, atol=5e-3)
+
+
+def test_surface_from_bezier_uses_geometry():
+    wing = make_wing()
+    surface = surface_from_bezier(wing.geometry, "asa", twist=1.5)
+    assert [section.ainc for section in surface.sections] == [1.5] * 5
+    np.testing.assert_allclose([section.chord for section in surface.sections], wing.geometry.chord)
+
+
+@pytest.mark.parametrize("tolerance, factor", [(0.01, 1.0), (0.05, 0.5), (0.5, 0.25)])
+def test_discretization_budget(fake_avl, tmp_path, monkeypatch, tolerance, factor):
+    # No substituto, o erro relativo de CL e CD é 5 / (número de vórtices)
+    monkeypatch.setenv("FAKE_AVL_LATTICE_ERROR", "5")
+    wing = surface_from_bezier(make_wing(), "asa")
+    file_name = tmp_path / "wing.avl"
+    surfaces, report = select_discretization(str(file_name), [wing, tail_surface()], title="asa",
+                                             tolerance=tolerance, avl_path=fake_avl)
+
+    assert report["factor"] == factor
+    assert (surfaces[0].n_chord, surfaces[0].n_span) == (round(12 * factor), round(40 * factor))
+    CL_ref, CD_ref = report["reference"]
+    _, CL, CD = report["candidates"][-1]
+    assert abs(CL - CL_ref) <= tolerance * abs(CL_ref)
+    assert file_name.read_text().count("SURFACE") == 2
+    assert [path.name for path in tmp_path.iterdir()] == ["wing.avl"]
+
+
+def test_control_surfaces():
+    elevator = AVLControl("elevator", x_hinge=0.7)
+    tail = tail_surface()
+    tail = tail._replace(sections=[section._replace(controls=[elevator]) for section in tail.sections])
+    lines = format_avl_config([tail], "eh").splitlines()
+    assert lines.count("CONTROL") == 2
+    assert lines[lines.index("CONTROL") + 2] == "elevator  1.0  0.7  0.0 0.0 0.0  1.0"
+
+
+def test_symmetry_header_and_y_duplicate():
+    half = AVLSurface("asa", [AVLSection(0.0, 0.0, 0.0, 1.0), AVLSection(0.2, 2.0, 0.0, 0.5)])
+    full = half._replace(sections=[AVLSection(0.2, -2.0, 0.0, 0.5), *half.sections])
+    duplicated = half._replace(y_duplicate=0.0)
+    expected = reference_dimensions(half)
+    np.testing.assert_allclose(reference_dimensions(full, symmetric=False), expected)
+    np.testing.assert_allclose(reference_dimensions(duplicated, symmetric=False), expected)
+
+    lines = format_avl_config([duplicated, tail_surface()], "aviao", iysym=0).splitlines()
+    assert lines[lines.index("#iYsym  iZsym  Zsym") + 1] == "0  0  0.0"
+    assert lines[lines.index("YDUPLICATE") + 1] == "0.0"
+    assert lines[lines.index("#Sref   Cref   Bref") + 1] == "{:.4f}  {:.4f}  {:.4f}".format(*expected[:3])
+    with pytest.raises(ValueError):
+        format_avl_config([duplicated], "aviao")
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_output import parse_output, read_output, strip_cl_max
+from MDO_UNESP.avl_runner import get_clmax, get_value
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+FT_FILE = os.path.join(TESTS_DIR, 'avl_ft.out')
+FS_FILE = os.path.join(TESTS_DIR, 'avl_fs.out')
+
+
+def test_total_forces_match_get_value():
+    values, strips = read_output(FT_FILE)
+    for name in ('CLtot', 'CDtot', 'Cmtot', 'CXtot', 'CZtot'):
+        assert values[name] == get_value(FT_FILE, name)
+    assert values['Alpha'] == 5.0
+    assert values['e'] == pytest.approx(0.95)
+    assert values["Cl'tot"] == 0.0
+    assert values['CDff'] == pytest.approx(0.019)
+    assert strips == {}
+
+
+def test_strip_table_columns():
+    values, strips = read_output(FS_FILE)
+    assert list(strips) == ['j', 'Yle', 'Chord', 'Area', 'c cl', 'ai', 'cl_norm', 'cl',
+                            'cd', 'cdv', 'cm_c/4', 'cm_LE', 'C.P.x/c']
+    np.testing.assert_array_equal(strips['j'], np.arange(1, 21))
+    assert strips['cl'].max() == pytest.approx(0.5150)
+    # get_clmax começa a ler numa linha fixa e descarta a primeira faixa
+    assert strips['cl'][1:].max() == get_clmax(FS_FILE)
+    assert strip_cl_max(strips) == get_clmax(FS_FILE)
+    # A primeira faixa fica fora do critério de estol mesmo com o maior cl
+    assert strip_cl_max({'cl': np.array([2.0, 0.5, 0.7])}) == 0.7
+    assert values['CLsurf'] == pytest.approx(0.44797)
+    assert values['Cave'] == pytest.approx(0.8938)
+
+
+def test_sections_found_from_header_text():
+    with open(FS_FILE) as f:
+        text = f.read()
+    # Linhas extras no início deslocam a tabela sem afetar o parser
+    shifted = ' Extra header line\n\n' + text
+    _, strips = parse_output(shifted)
+    _, reference = parse_output(text)
+    np.testing.assert_array_equal(strips['cl'], reference['cl'])
+
+    # Uma segunda superfície tem sua tabela concatenada
+    _, strips = parse_output(text + text)
+    assert len(strips['j']) == 2 * len(reference['j'])
+
+
+def test_malformed_strip_table():
+    with open(FS_FILE) as f:
+        lines = f.read().splitlines()
+    header = next(i for i, line in enumerate(lines) if line.split()[:1] == ['j'])
+    fields = lines[header + 2].split()
+    fields[7] = '********'
+    lines[header + 2] = ' '.join(fields)
+    with pytest.raises(ValueError, match='malformada') as error:
+        parse_output('\n'.join(lines))
+    assert isinstance(error.value.__cause__, ValueError)
@@ -0,0 +1,26 @@
+import os
+
+from MDO_UNESP.avl_parallel import SweepJob, run_sweeps
+from MDO_UNESP.avl_runner import get_aero_coef
+
+
+def test_run_sweeps_matches_serial_results_in_order(fake_avl, avl_config, tmp_path):
+    jobs = [
+        SweepJob(avl_config, 1.2, -2, 6, 1.0),
+        (avl_config, 1.2, 0, 3, 0.5),
+        SweepJob(avl_config, 1.2, 4, 8, 2.0),
+    ]
+    results = run_sweeps(jobs, max_workers=3, avl_path=fake_avl, work_root=str(tmp_path))
+
+    expected = [get_aero_coef(*job, avl_path=fake_avl) for job in jobs]
+    assert results == expected
+    assert list(results[1][0]) == [0.0, 0.5, 1.0, 1.5, 2.0, 2.5]
+    # Os diretórios de trabalho foram removidos
+    assert os.listdir(tmp_path) == []
+
+
+def test_run_sweeps_serial_worker(fake_avl, avl_config, tmp_path):
+    results = run_sweeps([(avl_config, 1.2, 0, 2, 1.0)], max_workers=1, avl_path=fake_avl,
+                         work_root=str(tmp_path))
+    assert list(results[0][0]) == [0.0, 1.0]
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,57 @@
+import pytest
+
+from MDO_UNESP.avl_runner import get_value
+from MDO_UNESP.avl_session import AVLSession, AVLSessionError
+
+
+def run(session, alpha, tmp_path):
+    forces_file = str(tmp_path / 'ft')
+    session.run_alpha(alpha, forces_file, str(tmp_path / 'fs'))
+    return get_value(forces_file, 'CLtot')
+
+
+def test_session_reuses_process(fake_avl, avl_config, tmp_path):
+    with AVLSession(avl_config, avl_path=fake_avl) as session:
+        first = run(session, 0.0, tmp_path)
+        pid = session._process.pid
+        second = run(session, 4.0, tmp_path)
+        assert session._process.pid == pid
+    assert second > first
+    assert not session.is_running
+
+
+def test_session_restarts_after_crash(fake_avl, avl_config, tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_CRASH_ALPHA', '2.0')
+    monkeypatch.setenv('FAKE_AVL_STATE', str(tmp_path / 'state'))
+    with AVLSession(avl_config, avl_path=fake_avl) as expected_session:
+        expected = run(expected_session, 2.0, tmp_path)
+    assert expected_session.restarts == 1
+
+    with AVLSession(avl_config, avl_path=fake_avl) as session:
+        assert run(session, 2.0, tmp_path) == expected
+        assert session.restarts == 0
+
+
+def test_session_restarts_after_hang(fake_avl, avl_config, tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_HANG_ALPHA', '3.0')
+    monkeypatch.setenv('FAKE_AVL_STATE', str(tmp_path / 'state'))
+    with AVLSession(avl_config, avl_path=fake_avl, timeout=2.0) as session:
+        assert run(session, 3.0, tmp_path) is not None
+        assert session.restarts == 1
+
+
+def test_session_gives_up(fake_avl, avl_config, tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_AVL_CRASH_ALPHA', '1.0')
+    with AVLSession(avl_config, avl_path=fake_avl, max_restarts=1) as session:
+        with pytest.raises(AVLSessionError):
+            run(session, 1.0, tmp_path)
+
+
+def test_solve_alpha_reads_stdout(fake_avl, avl_config, tmp_path):
+    with AVLSession(avl_config, avl_path=fake_avl, cwd=str(tmp_path)) as session:
+        totals, strips = session.solve_alpha(5.0)
+        expected = run(session, 5.0, tmp_path)
+    assert totals['CLtot'] == expected
+    assert totals['Alpha'] == 5.0
+    assert len(strips['cl']) == 20
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['fs', 'ft']
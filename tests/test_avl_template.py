@@ -0,0 +1,48 @@
+import os
+import shutil
+
+import pytest
+
+from MDO_UNESP.avl_runner import set_dimensions
+from MDO_UNESP.avl_template import ConfigTemplate
+
+MARKER_CONFIG = os.path.join(os.path.dirname(__file__), 'marker_config.avl')
+
+WING = dict(airfoil1_file='raiz.dat', airfoil2_file='meio.dat', airfoil3_file='ponta.dat',
+            x=0.0, y1=0.0, y2=0.8, y3=1.6, z=0.0, c1=0.45, c2=0.4, c3=0.22,
+            angle_incidence=2.5, twist1=0.0, twist2=-1.0, twist3=-2.0)
+TAIL = dict(airfoil1_file='naca0012.dat', airfoil2_file='naca0012.dat', airfoil3_file='naca0012.dat',
+            x=0.0, y1=0.0, y2=0.25, y3=0.45, z=0.0, c1=0.22, c2=0.2, c3=0.16,
+            angle_incidence=-3.0, twist1=0.0, twist2=0.0, twist3=0.0)
+
+
+def test_template_finds_surfaces_and_slots():
+    template = ConfigTemplate.from_file(MARKER_CONFIG)
+    assert template.surfaces == ['asa', 'eh']
+    assert len(template.markers) == 16
+    assert template.render_values({}) == open(MARKER_CONFIG).read()
+
+
+def test_render_matches_set_dimensions(tmp_path):
+    legacy = tmp_path / 'legacy.avl'
+    shutil.copy(MARKER_CONFIG, legacy)
+    set_dimensions(str(legacy), surface_name='asa', **WING)
+    set_dimensions(str(legacy), surface_name='eh', **TAIL)
+
+    template = ConfigTemplate.from_file(MARKER_CONFIG)
+    rendered = tmp_path / 'template.avl'
+    assert template.write(str(rendered), {'asa': WING, 'eh': TAIL})
+    assert rendered.read_text() == legacy.read_text()
+    assert not template.write(str(rendered), {'asa': WING, 'eh': TAIL})
+
+    # Só uma superfície: os campos da outra ficam com os valores do modelo
+    only_wing = tmp_path / 'only_wing.avl'
+    shutil.copy(MARKER_CONFIG, only_wing)
+    set_dimensions(str(only_wing), surface_name='asa', **WING)
+    assert template.render({'asa': WING}) == only_wing.read_text()
+
+
+def test_unknown_surface():
+    template = ConfigTemplate.from_file(MARKER_CONFIG)
+    with pytest.raises(ValueError):
+        template.render({'ev': TAIL})
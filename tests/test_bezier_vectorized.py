@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+
+from MDO_UNESP.bezier_airfoil import BezierAirfoil, bernstein_matrix, lagrange_matrix, naca_4digits_batch
+
+
+def make_properties(**overrides):
+    properties = {
+        "semi_span": 1.3,
+        "number_of_panels": 25,
+        "chord_root": 1,
+        "chord_tip": 0.8,
+        "thicks": [0.14, 0.12, 0.11, 0.10],
+        "cambers": [0.02, 0.03, 0.025, 0.02],
+        "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+    }
+    properties.update(overrides)
+    return properties
+
+
+def test_sections_match_scalar_naca():
+    wing = BezierAirfoil(make_properties())
+    assert wing.xu.shape == (25, 199)
+    for i in (0, 7, 24):
+        xu, yu = wing.naca_4digits(wing.properties["camber"][i], wing.properties["camber_pos"][i],
+                                   wing.properties["thickness"][i])
+        np.testing.assert_array_equal(wing.properties[f"xu_{i}"], xu)
+        np.testing.assert_array_equal(wing.properties[f"yu_{i}"], yu)
+        assert np.all(wing.properties[f"z_{i}"] == wing.properties["span"][i])
+
+
+def test_section_accessors_are_views():
+    wing = BezierAirfoil(make_properties())
+    assert np.shares_memory(wing.properties["xu_3"], wing.xu)
+    assert np.shares_memory(wing.properties["yu_3"], wing.yu)
+
+
+def test_batch_matches_individual_construction():
+    population = [make_properties(semi_span=s, chord_tip=c, thicks=[t] * 4)
+                  for s, c, t in ((1.0, 0.8, 0.12), (1.5, 0.6, 0.15), (2.0, 0.7, 0.10))]
+    wings = BezierAirfoil.batch([dict(p) for p in population])
+    assert wings[0].xu.base is wings[2].xu.base
+    for wing, properties in zip(wings, population):
+        single = BezierAirfoil(dict(properties))
+        for key in ("span", "chord", "thickness", "camber", "camber_pos"):
+            np.testing.assert_allclose(wing.properties[key], single.properties[key], rtol=0, atol=1e-14)
+        np.testing.assert_allclose(wing.leading_edge, single.leading_edge, rtol=0, atol=1e-14)
+        np.testing.assert_allclose(wing.xu, single.xu, rtol=0, atol=1e-14)
+
+
+def test_batch_requires_same_number_of_panels():
+    with pytest.raises(ValueError):
+        BezierAirfoil.batch([make_properties(), make_properties(number_of_panels=10)])
+
+
+def test_basis_matrices():
+    t = np.linspace(0, 1, 11)
+    np.testing.assert_allclose(bernstein_matrix(3, t).sum(axis=1), 1.0)
+    nodes = np.array([0, 1/3, 2/3, 1.])
+    np.testing.assert_allclose(lagrange_matrix(nodes, nodes), np.eye(4), atol=1e-15)
+
+
+def test_basis_matrices_are_memoized():
+    t = np.linspace(0, 1, 25)
+    first = bernstein_matrix(3, t)
+    assert bernstein_matrix(3, t.copy()) is first
+    assert bernstein_matrix(3, t[:-1]) is not first
+    assert not first.flags.writeable
+
+    nodes = np.array([0, 1/3, 2/3, 1.])
+    assert lagrange_matrix(nodes, t) is lagrange_matrix(list(nodes), list(t))
+
+
+def test_lagrange_curve_accepts_nodes():
+    wing = BezierAirfoil(make_properties())
+    x = np.linspace(0, 2.0, 25)
+    nodes = np.array([0, 1/3, 2/3, 1.]) * 2.0
+    y = [0.14, 0.12, 0.11, 0.10]
+    np.testing.assert_allclose(wing.lagrange_curve(nodes, x, y),
+                               wing.lagrange_curve(wing.lagrange_polynomials(nodes), x, y), atol=1e-14)
+
+
+def reference_naca(camber, camber_pos, thickness, x):
+    """Algoritmo original (máscaras + concatenação) para um único perfil."""
+    x_start = x[x <= camber_pos]
+    x_finish = x[x > camber_pos]
+    yt = 5 * thickness * (0.2969 * np.sqrt(x) - 0.1260*x - 0.3516*x**2 + 0.2843*x**3 - 0.1015*x**4)
+    mid = np.concatenate([camber / camber_pos**2 * (2 * camber_pos * x_start - x_start**2.),
+                          camber / (1 - camber_pos)**2 * ((1 - 2*camber_pos) + 2 * camber_pos * x_finish - x_finish**2.)])
+    dmid = np.concatenate([2 * camber / camber_pos**2 * (camber_pos - x_start),
+                           2 * camber / (1 - camber_pos)**2 * (camber_pos - x_finish)])
+    theta = np.arctan(dmid)
+    xu, xl = x - yt * np.sin(theta), x + yt * np.sin(theta)
+    yu, yl = mid + yt * np.cos(theta), mid - yt * np.cos(theta)
+    return np.concatenate([xu[::-1], xl[1:]]), np.concatenate([yu[::-1], yl[1:]])
+
+
+@pytest.mark.parametrize("npts, spacing", [(100, "uniform"), (41, "cosine")])
+def test_naca_batch_matches_reference(npts, spacing):
+    rng = np.random.default_rng(0)
+    camber = rng.uniform(0.0, 0.06, 50)
+    camber_pos = rng.uniform(0.2, 0.6, 50)
+    thickness = rng.uniform(0.08, 0.18, 50)
+    sections = naca_4digits_batch(camber, camber_pos, thickness, npts=npts, spacing=spacing)
+    assert sections.shape == (2, 50, 2 * npts - 1)
+
+    half = np.pi * np.linspace(0, 1, npts)
+    x = np.linspace(0, 1., npts) if spacing == "uniform" else 0.5 * (1 - np.cos(half))
+    for i in (0, 17, 49):
+        xu, yu = reference_naca(camber[i], camber_pos[i], thickness[i], x)
+        np.testing.assert_allclose(sections[0, i], xu, rtol=0, atol=1e-15)
+        np.testing.assert_allclose(sections[1, i], yu, rtol=0, atol=1e-15)
+
+
+def test_naca_batch_cosine_clusters_at_edges():
+    x = naca_4digits_batch([0.0], [0.4], [0.0], npts=21, spacing="cosine")[0, 0, :21][::-1]
+    steps = np.diff(x)
+    assert steps[0] < steps[10] and steps[-1] < steps[10]
+    with pytest.raises(ValueError):
+        naca_4digits_batch([0.0], [0.4], [0.1], spacing="chebyshev")
+
+
+def test_wing_with_cosine_sections():
+    wing = BezierAirfoil(make_properties(airfoil_points=60, airfoil_spacing="cosine"))
+    assert wing.xu.shape == (25, 119)
+    xu, yu = wing.naca_4digits(wing.properties["camber"][5], wing.properties["camber_pos"][5],
+                               wing.properties["thickness"][5])
+    np.testing.assert_array_equal(wing.xu[5], xu)
+    with pytest.raises(ValueError):
+        BezierAirfoil.batch([make_properties(), make_properties(airfoil_points=60)])
@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+
+from MDO_UNESP import bulk_writer
+from MDO_UNESP.avl_generator import create_avl_config_from_bezier
+from MDO_UNESP.bezier_airfoil import BezierAirfoil
+from MDO_UNESP.bulk_writer import format_coordinates, write_if_changed
+
+
+def make_properties(**overrides):
+    properties = {
+        "semi_span": 1.0,
+        "number_of_panels": 6,
+        "chord_root": 1,
+        "chord_tip": 0.8,
+        "thicks": [0.14, 0.12, 0.11, 0.10],
+        "cambers": [0.02, 0.03, 0.025, 0.02],
+        "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+    }
+    properties.update(overrides)
+    return properties
+
+
+def test_format_coordinates_matches_line_by_line():
+    x = np.array([1.0, 0.5, 1e-9, 0.0])
+    y = np.array([0.0, -0.0312345678, -1e-9, 0.25])
+    expected = 'perfil\n' + ''.join(f'{a:.6f} {b:.6f}\n' for a, b in zip(x, y))
+    assert format_coordinates('perfil', x, y) == expected
+
+
+def test_write_if_changed(tmp_path):
+    path = str(tmp_path / 'a.txt')
+    assert write_if_changed(path, 'um\n')
+    assert not write_if_changed(path, 'um\n')
+    assert write_if_changed(path, 'dois\n')
+    with open(path) as f:
+        assert f.read() == 'dois\n'
+
+    # Alteração externa é detectada
+    with open(path, 'w') as f:
+        f.write('externo\n')
+    assert write_if_changed(path, 'dois\n')
+
+    # Sem o registro em memória (novo processo), o conteúdo em disco é comparado
+    bulk_writer._written.clear()
+    assert not write_if_changed(path, 'dois\n')
+
+
+def test_unchanged_airfoil_files_are_not_rewritten(tmp_path):
+    output_dir = str(tmp_path / 'airfoils')
+    wing = BezierAirfoil(make_properties())
+    files = wing.write_airfoil_files(output_dir=output_dir)
+    with open(files[2]) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == 'bezier_section_2'
+    assert lines[1] == f'{wing.xu[2, 0]:.6f} {wing.yu[2, 0]:.6f}'
+
+    os.utime(files[0], ns=(0, 0))
+    for path in files:
+        bulk_writer._written.pop(os.path.abspath(path), None)
+    mtimes = [os.stat(path).st_mtime_ns for path in files]
+    assert BezierAirfoil(make_properties()).write_airfoil_files(output_dir=output_dir) == files
+    assert [os.stat(path).st_mtime_ns for path in files] == mtimes
+
+    # Só a ponta muda: a raiz (Lagrange vale 1 no primeiro nó) não é reescrita
+    changed = BezierAirfoil(make_properties(thicks=[0.14, 0.12, 0.11, 0.16]))
+    changed.write_airfoil_files(output_dir=output_dir)
+    assert os.stat(files[0]).st_mtime_ns == mtimes[0]
+    assert os.stat(files[-1]).st_mtime_ns != mtimes[-1]
+
+
+def test_avl_config_written_once(tmp_path):
+    wing = BezierAirfoil(make_properties())
+    wing.properties["airfoil_files"] = [f"s{i}.dat" for i in range(6)]
+    file_name = str(tmp_path / 'wing.avl')
+    assert create_avl_config_from_bezier(file_name, wing)
+    assert not create_avl_config_from_bezier(file_name, wing)
+
+
+def test_write_if_changed_is_atomic(tmp_path):
+    path = str(tmp_path / 'perfil.dat')
+    write_if_changed(path, 'antigo\n' * 100)
+    # Um leitor que já abriu o arquivo continua vendo o conteúdo antigo inteiro
+    with open(path) as reader:
+        write_if_changed(path, 'novo\n')
+        assert reader.read() == 'antigo\n' * 100
+    with open(path) as f:
+        assert f.read() == 'novo\n'
+    assert os.listdir(tmp_path) == ['perfil.dat']
+
+
+def test_write_if_changed_keeps_permissions(tmp_path):
+    path = str(tmp_path / 'perfil.dat')
+    assert write_if_changed(path, 'antigo\n')
+    # Arquivo novo: permissões padrão da umask, como com open()
+    assert os.stat(path).st_mode & 0o777 == bulk_writer._NEW_FILE_MODE
+
+    os.chmod(path, 0o640)
+    assert write_if_changed(path, 'novo\n')
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    # O registro em memória corresponde ao arquivo final
+    assert not write_if_changed(path, 'novo\n')
+
@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pytest
+
+from MDO_UNESP.doe import apply_variables, full_factorial, latin_hypercube, load_results, run_doe, sobol
+
+BASE = {
+    "semi_span": 1.3,
+    "number_of_panels": 7,
+    "chord_root": 1,
+    "chord_tip": 0.8,
+    "thicks": [0.14, 0.12, 0.11, 0.10],
+    "cambers": [0.02, 0.03, 0.025, 0.02],
+    "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+}
+BOUNDS = {"semi_span": (1.0, 2.0), "chord_tip": (0.5, 0.9)}
+
+
+def test_samplers():
+    samples = latin_hypercube(8, BOUNDS, seed=1)
+    assert samples.shape == (8, 2)
+    # Um ponto por estrato em cada variável
+    strata = np.floor((samples - [1.0, 0.5]) / [1.0 / 8, 0.4 / 8]).astype(int)
+    assert sorted(strata[:, 0]) == list(range(8)) and sorted(strata[:, 1]) == list(range(8))
+    np.testing.assert_array_equal(samples, latin_hypercube(8, BOUNDS, seed=1))
+
+    points = np.array(list(sobol(16, BOUNDS, seed=0, block_size=4)))
+    assert points.shape == (16, 2) and np.all((points >= [1.0, 0.5]) & (points <= [2.0, 0.9]))
+
+    assert len(list(full_factorial({"semi_span": [1, 2, 3], "chord_tip": [0.5, 0.8]}))) == 6
+
+
+def test_apply_variables():
+    properties = apply_variables(BASE, ["thicks", "cambers[1]", "number_of_panels"], [0.15, 0.04, 9.0])
+    assert properties["thicks"] == [0.15] * 4
+    assert properties["cambers"] == [0.02, 0.04, 0.025, 0.02]
+    assert properties["number_of_panels"] == 9
+    assert BASE["cambers"][1] == 0.03
+    with pytest.raises(KeyError):
+        apply_variables(BASE, ["sweep"], [1.0])
+
+
+def test_run_doe_streams_chunks_and_resumes(fake_avl, tmp_path, monkeypatch):
+    log_file = tmp_path / "avl.log"
+    monkeypatch.setenv("FAKE_AVL_LOG", str(log_file))
+    output_dir = str(tmp_path / "study")
+    names = list(BOUNDS)
+    samples = latin_hypercube(7, BOUNDS, seed=3)
+    arguments = dict(Cl_max_airfoil=1.2, alpha_start=-2, alpha_end=24, alpha_step=1.0,
+                     max_workers=2, chunk_size=3, avl_path=fake_avl, work_root=str(tmp_path))
+
+    assert run_doe(BASE, names, samples, output_dir, **arguments) == {"evaluated": 7, "failed": 0, "skipped": 0}
+    chunks = sorted(os.listdir(output_dir))
+    assert chunks == ["chunk_000000.npz", "chunk_000001.npz", "chunk_000002.npz"]
+
+    results = load_results(output_dir)
+    np.testing.assert_array_equal(results["index"], np.arange(7))
+    np.testing.assert_allclose(results["x"], samples)
+    assert list(results["variables"]) == names
+    assert results["CL"].shape == (7, 26)
+    valid = ~np.isnan(results["CL"])
+    np.testing.assert_allclose(results["CL_max"], np.nanmax(results["CL"], axis=1))
+    assert np.all(valid.sum(axis=1) < 26)
+
+    # Perda de um bloco: só os projetos dele são refeitos
+    lost = np.load(os.path.join(output_dir, chunks[1]))["index"].tolist()
+    os.remove(os.path.join(output_dir, chunks[1]))
+    starts = log_file.read_text().split().count("start")
+    assert run_doe(BASE, names, samples, output_dir, **arguments) == {"evaluated": len(lost), "failed": 0,
+                                                                      "skipped": 7 - len(lost)}
+    assert log_file.read_text().split().count("start") == starts + len(lost)
+
+    resumed = load_results(output_dir)
+    # Os projetos refeitos recebem índices novos, depois dos já gravados
+    kept = sorted(set(range(7)) - set(lost))
+    assert resumed["index"].tolist() == kept + list(range(kept[-1] + 1, kept[-1] + 1 + len(lost)))
+    positions = [samples.tolist().index(x) for x in resumed["x"].tolist()]
+    assert sorted(positions[-len(lost):]) == sorted(lost)
+    np.testing.assert_allclose(resumed["CL"], results["CL"][positions])
+    assert [name for name in os.listdir(tmp_path) if name.startswith("doe_")] == []
+
+
+def test_run_doe_resumes_by_design_vector(fake_avl, tmp_path):
+    output_dir = str(tmp_path / "study")
+    names = list(BOUNDS)
+    samples = latin_hypercube(6, BOUNDS, seed=4)
+    arguments = dict(Cl_max_airfoil=1.2, alpha_start=0, alpha_end=4, alpha_step=1.0,
+                     max_workers=2, chunk_size=2, avl_path=fake_avl, work_root=str(tmp_path))
+    assert run_doe(BASE, names, samples[:3], output_dir, **arguments)["evaluated"] == 3
+    # Outra ordem e novos projetos: só os vetores ainda não gravados são avaliados
+    reordered = samples[[4, 2, 0, 5]]
+    assert run_doe(BASE, names, reordered, output_dir, **arguments) == {"evaluated": 2, "failed": 0, "skipped": 2}
+    results = load_results(output_dir)
+    assert len(results["x"]) == 5
+    assert sorted(results["index"].tolist()) == list(range(5))
+
+    with pytest.raises(ValueError):
+        run_doe(BASE, ["semi_span", "chord_root"], samples, output_dir, **arguments)
+
+
+def test_run_doe_records_failed_designs(fake_avl, tmp_path, monkeypatch):
+    # O substituto cai em alpha = 2 em todo processo: todos os projetos falham
+    monkeypatch.setenv("FAKE_AVL_CRASH_ALPHA", "2.0")
+    output_dir = str(tmp_path / "study")
+    samples = latin_hypercube(3, BOUNDS, seed=5)
+    summary = run_doe(BASE, list(BOUNDS), samples, output_dir, Cl_max_airfoil=1.2, alpha_start=0,
+                      alpha_end=4, alpha_step=1.0, max_workers=2, avl_path=fake_avl, work_root=str(tmp_path))
+    assert summary == {"evaluated": 3, "failed": 3, "skipped": 0}
+    results = load_results(output_dir)
+    assert np.all(np.isnan(results["CL"])) and np.all(np.isnan(results["CL_max"]))
+    assert all(error.startswith("AVLSessionError") for error in results["error"])
+
+    arguments = dict(Cl_max_airfoil=1.2, alpha_start=0, alpha_end=4, alpha_step=1.0, max_workers=2,
+                     avl_path=fake_avl, work_root=str(tmp_path))
+    assert run_doe(BASE, list(BOUNDS), samples, output_dir, retry_failed=False,
+                   **arguments) == {"evaluated": 0, "failed": 0, "skipped": 3}
+    # Falha passageira: ao retomar, os projetos com erro são avaliados de novo
+    monkeypatch.delenv("FAKE_AVL_CRASH_ALPHA")
+    assert run_doe(BASE, list(BOUNDS), samples, output_dir, **arguments) == {"evaluated": 3, "failed": 0,
+                                                                            "skipped": 0}
+    results = load_results(output_dir)
+    assert results["index"].tolist() == [3, 4, 5]
+    assert list(results["error"]) == ["", "", ""]
+    np.testing.assert_allclose(results["x"], samples)
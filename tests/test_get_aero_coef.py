@@ -0,0 +1,141 @@
+import os
+import subprocess
+
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_runner import (get_aero_coef, get_aero_coef_adaptive, get_clmax, get_operating_points,
+                                  get_value)
+from MDO_UNESP.avl_output import read_output
+from MDO_UNESP.avl_session import AVLSession
+
+
+def legacy_aero_coef(fake_avl, config_file, Cl_max_airfoil, alpha_range, outputs_path):
+    """Reproduz o laço antigo: um processo do AVL por alpha."""
+    output_file = os.path.join(outputs_path, 'coeficients')
+    output2_file = os.path.join(outputs_path, 'coeficients_along_span')
+    CL_dict, CD_dict, Cm_dict = {}, {}, {}
+    for alpha in alpha_range:
+        for file_path in (output_file, output2_file):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+        comm_string = f'load {config_file}\n oper\n a\n a\n {alpha}\n x\n ft\n{output_file}\nfs\n{output2_file}\n'
+        subprocess.run(fake_avl, input=bytes(comm_string, encoding='utf8'), stdout=subprocess.DEVNULL)
+        if get_clmax(output2_file) > Cl_max_airfoil:
+            break
+        CL_dict[alpha] = get_value(output_file, 'CLtot')
+        CD_dict[alpha] = get_value(output_file, 'CDtot')
+        Cm_dict[alpha] = get_value(output_file, 'Cmtot')
+    return CL_dict, CD_dict, Cm_dict
+
+
+def test_session_sweep_matches_one_process_per_alpha(fake_avl, avl_config, tmp_path, monkeypatch):
+    log_file = tmp_path / 'avl.log'
+    monkeypatch.setenv('FAKE_AVL_LOG', str(log_file))
+
+    CL, CD, Cm = get_aero_coef(avl_config, 1.2, alpha_start=-4, alpha_end=16, alpha_step=1.0,
+                               avl_path=fake_avl)
+    events = log_file.read_text().split()
+    assert events.count('start') == 1
+    assert events.count('load') == 1
+
+    reference = legacy_aero_coef(fake_avl, avl_config, 1.2, np.arange(-4, 16, 1.0), str(tmp_path))
+    assert (CL, CD, Cm) == reference
+    # A varredura parou no estol, antes do fim do intervalo
+    assert 0 < len(CL) < 20
+
+
+def test_adaptive_stall_search_brackets_linear_sweep(fake_avl, avl_config, tmp_path, monkeypatch):
+    log_file = tmp_path / 'avl.log'
+    monkeypatch.setenv('FAKE_AVL_LOG', str(log_file))
+    CL, _, _ = get_aero_coef(avl_config, 1.2, alpha_start=-9, alpha_end=25, alpha_step=0.25,
+                             avl_path=fake_avl)
+    linear_runs = log_file.read_text().count('x ')
+    log_file.unlink()
+
+    result = get_aero_coef_adaptive(avl_config, 1.2, alpha_start=-9, alpha_end=25, coarse_step=2.0,
+                                    tolerance=0.25, avl_path=fake_avl)
+    assert result['n_runs'] == log_file.read_text().count('x ')
+    assert 3 * result['n_runs'] < linear_runs
+
+    last_alpha = max(CL)
+    lower, upper = result['bracket']
+    assert upper - lower <= 0.25
+    assert lower <= last_alpha + 0.25 and last_alpha < upper
+    assert result['alpha_stall'] == lower
+    assert result['CL_max'] == result['CL'][lower]
+    assert list(result['CL']) == sorted(result['CL'])
+
+
+def test_adaptive_stall_search_without_stall(fake_avl, avl_config):
+    result = get_aero_coef_adaptive(avl_config, 5.0, alpha_start=0, alpha_end=4, coarse_step=1.0,
+                                    avl_path=fake_avl)
+    assert result['bracket'] == (3.0, None)
+    assert result['n_runs'] == 4
+
+
+def test_in_memory_sweep_matches_file_sweep(fake_avl, avl_config, monkeypatch):
+    expected = get_aero_coef(avl_config, 1.2, alpha_start=-2, alpha_end=18, alpha_step=2.0,
+                             avl_path=fake_avl)
+
+    def no_temporary_directory(*args, **kwargs):
+        raise AssertionError('o modo em memória não deve criar diretórios')
+
+    monkeypatch.setattr('MDO_UNESP.avl_runner.tempfile.TemporaryDirectory', no_temporary_directory)
+    result = get_aero_coef(avl_config, 1.2, alpha_start=-2, alpha_end=18, alpha_step=2.0,
+                           avl_path=fake_avl, in_memory=True)
+    assert result == expected
+
+
+def test_operating_points_solve_target_CL_in_one_session(fake_avl, avl_config, tmp_path, monkeypatch):
+    log_file = tmp_path / 'avl.log'
+    monkeypatch.setenv('FAKE_AVL_LOG', str(log_file))
+    points = get_operating_points(avl_config, [0.2, 0.4, 0.6], avl_path=fake_avl)
+    events = log_file.read_text().split()
+    assert events.count('start') == 1
+    assert events.count('x') == 3
+
+    CL, _, _ = get_aero_coef(avl_config, 1.2, -4, 16, 1.0, avl_path=fake_avl, in_memory=True)
+    alphas = np.array(list(CL))
+    for point, target in zip(points, [0.2, 0.4, 0.6]):
+        assert point['converged']
+        assert point['CL'] == pytest.approx(target, abs=1e-5)
+        assert point['alpha'] == pytest.approx(np.interp(target, list(CL.values()), alphas), abs=1e-4)
+        assert len(point['strips']['cl']) == 20
+
+
+def test_operating_points_trimmed(fake_avl, avl_config):
+    untrimmed, = get_operating_points(avl_config, 0.5, avl_path=fake_avl)
+    trimmed, = get_operating_points(avl_config, 0.5, trim_control='d1', avl_path=fake_avl)
+    assert untrimmed['Cm'] < -0.01
+    assert trimmed['converged']
+    assert trimmed['Cm'] == pytest.approx(0.0, abs=1e-5)
+    assert trimmed['CL'] == pytest.approx(0.5, abs=1e-5)
+    # Profundor para cima (deflexão negativa) e mais alpha para manter o CL
+    assert trimmed['totals']['elevator'] < 0
+    assert trimmed['alpha'] > untrimmed['alpha']
+
+
+def test_solve_alpha_releases_trim(fake_avl, avl_config):
+    with AVLSession(avl_config, avl_path=fake_avl) as session:
+        expected, _ = session.solve_alpha(4.0)
+        trimmed, _ = session.solve_constraints(['a c 0.5', 'd1 pm 0'])
+        assert trimmed['Cmtot'] == pytest.approx(0.0, abs=1e-5)
+        totals, _ = session.solve_alpha(4.0)
+        assert session.solve_stability(4.0)['CLtot'] == pytest.approx(expected['CLtot'])
+    assert totals['CLtot'] == pytest.approx(expected['CLtot'])
+    assert totals['Cmtot'] == pytest.approx(expected['Cmtot'])
+    assert totals['elevator'] == pytest.approx(0.0)
+
+
+def test_run_alpha_releases_trim(fake_avl, avl_config, tmp_path):
+    forces_file = str(tmp_path / 'ft')
+    strip_forces_file = str(tmp_path / 'fs')
+    with AVLSession(avl_config, avl_path=fake_avl) as session:
+        expected, _ = session.solve_alpha(4.0)
+        session.solve_constraints(['a c 0.5', 'd1 pm 0'])
+        session.run_alpha(4.0, forces_file, strip_forces_file)
+    totals, _ = read_output(forces_file)
+    assert totals['CLtot'] == pytest.approx(expected['CLtot'])
+    assert totals['Cmtot'] == pytest.approx(expected['Cmtot'])
+    assert totals['elevator'] == pytest.approx(0.0)
@@ -0,0 +1,15 @@
+import subprocess
+import sys
+
+# Importar estes módulos não deve carregar matplotlib, scipy nem pandas (só as funções que os usam)
+WORKER_MODULES = ('MDO_UNESP.avl_async', 'MDO_UNESP.avl_cases', 'MDO_UNESP.bezier_airfoil',
+                  'MDO_UNESP.doe', 'MDO_UNESP.get_cl_max', 'MDO_UNESP.optimizer', 'MDO_UNESP.plot_airfoils',
+                  'MDO_UNESP.sensitivity', 'MDO_UNESP.vlm')
+
+
+def test_worker_imports_are_lightweight():
+    code = (f'import sys\n'
+            f'import {", ".join(WORKER_MODULES)}\n'
+            f'print(" ".join(m for m in ("matplotlib", "scipy", "pandas", "tqdm") if m in sys.modules))')
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.split() == []
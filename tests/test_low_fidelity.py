@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_generator import create_avl_config_from_bezier
+from MDO_UNESP.bezier_airfoil import BezierAirfoil
+from MDO_UNESP.low_fidelity import MultiFidelityScreen, estimate_aero_coef, thin_airfoil_coefficients
+
+
+def make_wing(semi_span=1.3, number_of_panels=9):
+    wing = BezierAirfoil({
+        "semi_span": semi_span,
+        "number_of_panels": number_of_panels,
+        "chord_root": 1,
+        "chord_tip": 0.8,
+        "thicks": [0.12] * 4,
+        "cambers": [0.02] * 4,
+        "cambers_pos": [0.40] * 4,
+    })
+    wing.properties["airfoil_files"] = [f"s{i}.dat" for i in range(number_of_panels)]
+    return wing
+
+
+def test_thin_airfoil_naca_2412():
+    alpha_0, cm = thin_airfoil_coefficients([0.02, 0.0], [0.4, 0.4])
+    assert np.degrees(alpha_0[0]) == pytest.approx(-2.08, abs=0.01)
+    assert cm[0] == pytest.approx(-0.053, abs=1e-3)
+    assert alpha_0[1] == 0 and cm[1] == 0
+
+
+def test_estimate_is_linear_up_to_stall():
+    result = estimate_aero_coef(make_wing(), Cl_max_airfoil=1.4, alpha_start=-4, alpha_end=20)
+    assert result["fidelity"] == "low" and result["n_runs"] == 0
+    assert result["alpha_0"] == pytest.approx(-2.08, abs=0.01)
+
+    alphas = np.array(list(result["CL"]))
+    CL = np.array(list(result["CL"].values()))
+    np.testing.assert_allclose(np.diff(CL) / np.radians(np.diff(alphas)), result["CL_alpha"])
+    assert alphas[-1] == result["alpha_stall"] and result["bracket"][1] == alphas[-1] + 0.25
+    assert result["CL_max"] < 1.4
+    assert min(result["CD"].values()) == pytest.approx(result["CD0"], rel=0.05)
+
+    # Maior alongamento: CLa maior
+    assert estimate_aero_coef(make_wing(semi_span=3.0), 1.4, -4, 20)["CL_alpha"] > result["CL_alpha"]
+
+
+def max_lift_to_drag(result):
+    return -max(CL / CD for CL, CD in zip(result["CL"].values(), result["CD"].values()))
+
+
+def test_screen_runs_avl_only_near_the_best(fake_avl, tmp_path):
+    screen = MultiFidelityScreen(max_lift_to_drag, margin=0.1, avl_path=fake_avl, in_memory=True)
+    written = []
+
+    def config_writer(wing, name):
+        def write():
+            file_name = str(tmp_path / f"{name}.avl")
+            create_avl_config_from_bezier(file_name, wing)
+            written.append(name)
+            return file_name
+        return write
+
+    results = [screen.evaluate(make_wing(semi_span), config_writer(make_wing(semi_span), name), 1.4, -4, 20)
+               for name, semi_span in (("base", 2.0), ("short", 0.5), ("long", 2.5))]
+
+    assert [result["fidelity"] for result in results] == ["avl", "low", "avl"]
+    assert written == ["base", "long"]
+    assert results[0]["n_runs"] > 0 and "low_fidelity_objective" in results[0]
+    assert screen.best == results[2]["objective"]
+    assert screen.stats() == {"low": 1, "avl": 2, "screened_fraction": 1 / 3}
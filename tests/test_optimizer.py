@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from MDO_UNESP.optimizer import Optimizer, geometry_summary
+
+BASE = {
+    "semi_span": 1.3,
+    "number_of_panels": 7,
+    "chord_root": 1,
+    "chord_tip": 0.8,
+    "thicks": [0.12] * 4,
+    "cambers": [0.02] * 4,
+    "cambers_pos": [0.40] * 4,
+}
+AREA_LIMIT = 3.0
+BOUNDS = {"semi_span": (0.8, 2.0), "chord_tip": (0.4, 1.0)}
+
+
+def lift_at_4_degrees(quantities):
+    return -quantities["CL"][list(quantities["alphas"]).index(4.0)]
+
+
+def make_optimizer(fake_avl, tmp_path, **options):
+    arguments = dict(objective=lift_at_4_degrees, constraints={"S": (None, AREA_LIMIT)}, Cl_max_airfoil=1.3,
+                     alpha_start=-2, alpha_end=8, alpha_step=1.0, max_workers=2, avl_path=fake_avl,
+                     work_root=str(tmp_path))
+    arguments.update(options)
+    return Optimizer(BASE, BOUNDS, **arguments)
+
+
+def test_geometry_summary():
+    summary = geometry_summary(BASE)
+    assert summary["b"] == pytest.approx(2 * 1.3 * np.pi / 2)
+    assert summary["AR"] == pytest.approx(summary["b"]**2 / summary["S"])
+
+
+def test_batch_evaluation_is_cached(fake_avl, tmp_path, monkeypatch):
+    log_file = tmp_path / "avl.log"
+    monkeypatch.setenv("FAKE_AVL_LOG", str(log_file))
+    with make_optimizer(fake_avl, tmp_path) as optimizer:
+        X = np.array([[1.0, 0.5], [1.5, 0.8], [1.0, 0.5]])
+        quantities = optimizer.evaluate_batch(X)
+        assert optimizer.n_evaluations == 2
+        assert quantities[0]["CL_max"] == quantities[2]["CL_max"]
+        optimizer.evaluate_batch(X[:2])
+        assert optimizer.n_evaluations == 2
+    assert log_file.read_text().split().count("start") == 2
+
+
+def test_slsqp_respects_area_constraint(fake_avl, tmp_path):
+    with make_optimizer(fake_avl, tmp_path) as optimizer:
+        result = optimizer.slsqp([1.0, 0.6], maxiter=20)
+        quantities = optimizer.quantities(result.x)
+    # O CL cresce com o alongamento: a área fica no limite
+    assert quantities["S"] == pytest.approx(AREA_LIMIT, rel=1e-3)
+    assert -result.fun > -lift_at_4_degrees(optimizer.quantities(np.array([1.0, 0.6])))
+
+
+def test_slsqp_with_fixed_variable(fake_avl, tmp_path):
+    with make_optimizer(fake_avl, tmp_path) as optimizer:
+        optimizer.bounds[1] = (0.6, 0.6)
+        with pytest.raises(ValueError):
+            optimizer.slsqp([1.0, 0.6], step=0.0)
+        result = optimizer.slsqp([1.0, 0.6], maxiter=5)
+    assert result.x[1] == 0.6
+    assert np.all(np.isfinite(result.jac))
+    assert result.jac[1] == 0.0
+
+
+def test_differential_evolution_resumes_from_checkpoint(fake_avl, tmp_path, monkeypatch):
+    checkpoint = str(tmp_path / "opt.npz")
+    with make_optimizer(fake_avl, tmp_path, checkpoint=checkpoint) as optimizer:
+        first = optimizer.differential_evolution(maxiter=3, popsize=4, seed=7)
+        n_evaluations = optimizer.n_evaluations
+    assert n_evaluations > 0
+
+    # Uma nova execução com a mesma semente refaz o caminho só com o checkpoint
+    monkeypatch.setenv("FAKE_AVL_CRASH_ALPHA", "-2.0")
+    with make_optimizer(fake_avl, tmp_path, checkpoint=checkpoint) as optimizer:
+        second = optimizer.differential_evolution(maxiter=3, popsize=4, seed=7)
+        assert optimizer.n_evaluations == 0
+    np.testing.assert_array_equal(first.x, second.x)
+    assert geometry_summary(optimizer.properties(first.x))["S"] <= AREA_LIMIT + 1e-6
+
+
+def test_failed_designs_are_penalized_and_geometry_cached(fake_avl, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_AVL_CRASH_ALPHA", "2.0")
+    calls = []
+    monkeypatch.setattr("MDO_UNESP.optimizer.geometry_summary",
+                        lambda properties: calls.append(1) or geometry_summary(properties))
+    with make_optimizer(fake_avl, tmp_path) as optimizer:
+        X = np.array([[1.0, 0.5], [1.5, 0.8]])
+        quantities = optimizer.evaluate_batch(X)
+        assert np.isnan(quantities[0]["CL_max"]) and np.all(np.isnan(quantities[1]["CL"]))
+        assert optimizer._objective_value(quantities[0]) == 1e10
+        assert quantities[0]["S"] > 0
+        for _ in range(3):
+            optimizer.evaluate_batch(X)
+    assert len(calls) == 2
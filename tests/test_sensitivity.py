@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_runner import get_stability_derivatives
+from MDO_UNESP.avl_session import AVLSession
+from MDO_UNESP.sensitivity import design_sensitivities
+
+BASE = {
+    "semi_span": 1.3,
+    "number_of_panels": 7,
+    "chord_root": 1,
+    "chord_tip": 0.8,
+    "thicks": [0.12] * 4,
+    "cambers": [0.02] * 4,
+    "cambers_pos": [0.40] * 4,
+}
+
+
+def test_stability_derivatives_single_solve(fake_avl, avl_config, tmp_path, monkeypatch):
+    log_file = tmp_path / "avl.log"
+    monkeypatch.setenv("FAKE_AVL_LOG", str(log_file))
+    result = get_stability_derivatives(avl_config, 4.0, avl_path=fake_avl)
+    assert log_file.read_text().split().count("x") == 1
+
+    with AVLSession(avl_config, avl_path=fake_avl) as session:
+        below, _ = session.solve_alpha(3.0)
+        above, _ = session.solve_alpha(5.0)
+    CL_alpha = (above["CLtot"] - below["CLtot"]) / np.radians(2.0)
+    assert result["CL_alpha"] == pytest.approx(CL_alpha, rel=1e-3)
+    assert result["Cm_alpha"] == pytest.approx(-0.02 * result["CL_alpha"], rel=1e-4)
+    assert result["static_margin"] == pytest.approx(0.02, abs=1e-5)
+    assert "CYb" in result["derivatives"]
+
+
+def test_stability_derivatives_require_reference(fake_avl, avl_config, monkeypatch):
+    solve_stability = AVLSession.solve_stability
+
+    def without_xref(self, alpha):
+        values = solve_stability(self, alpha)
+        del values["Xref"]
+        return values
+
+    monkeypatch.setattr(AVLSession, "solve_stability", without_xref)
+    with pytest.raises(ValueError, match="Xref"):
+        get_stability_derivatives(avl_config, 4.0, avl_path=fake_avl)
+
+
+def test_design_sensitivities_batch(fake_avl, tmp_path, monkeypatch):
+    log_file = tmp_path / "avl.log"
+    monkeypatch.setenv("FAKE_AVL_LOG", str(log_file))
+    names = ["semi_span", "chord_tip"]
+    x0 = [1.3, 0.8]
+    sensitivities = design_sensitivities(BASE, names, x0, 4.0, step=1e-2, max_workers=2,
+                                         avl_path=fake_avl, work_root=str(tmp_path))
+    # Projeto base e 2n perturbações, uma solução cada
+    assert log_file.read_text().split().count("x") == 5
+
+    # Mais envergadura (maior alongamento): mais CL; mais corda na ponta: menos
+    gradients = sensitivities["gradients"]
+    assert gradients["CL"][0] > 0
+    assert gradients["CL"][1] < 0
+    assert gradients["CL_alpha"][0] > 0
+
+    serial = design_sensitivities(BASE, names, x0, 4.0, step=1e-2, max_workers=1,
+                                  avl_path=fake_avl, work_root=str(tmp_path))
+    for name, values in gradients.items():
+        np.testing.assert_allclose(serial["gradients"][name], values)
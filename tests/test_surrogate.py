@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from MDO_UNESP.bezier_airfoil import BezierAirfoil
+from MDO_UNESP.low_fidelity import estimate_aero_coef
+from MDO_UNESP.surrogate import (GaussianProcessSurrogate, SurrogateEvaluator, design_vector,
+                                 result_targets)
+
+
+def make_properties(semi_span=1.3, chord_tip=0.8, thickness=0.12):
+    return {
+        "semi_span": semi_span,
+        "number_of_panels": 9,
+        "chord_root": 1,
+        "chord_tip": chord_tip,
+        "thicks": [thickness] * 4,
+        "cambers": [0.02] * 4,
+        "cambers_pos": [0.40] * 4,
+    }
+
+
+def analytic(properties):
+    return estimate_aero_coef(BezierAirfoil(properties), 1.4, -4, 20)
+
+
+def test_gaussian_process_interpolates_smooth_function(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.uniform(-1, 1, (60, 2))
+    Y = np.column_stack([np.sin(2 * X[:, 0]) + X[:, 1]**2, 3 * X[:, 0] - X[:, 1]])
+    model = GaussianProcessSurrogate().fit(X, Y, ["a", "b"])
+
+    mean, std = model.predict(X[:5])
+    np.testing.assert_allclose(mean, Y[:5], atol=1e-3)
+    assert np.all(std < 1e-2)
+
+    x = np.array([0.1, -0.2])
+    mean, std = model.predict(x)
+    np.testing.assert_allclose(mean, [np.sin(0.2) + 0.04, 0.5], atol=2e-2)
+    assert model.predict(np.array([5.0, 5.0]))[1][0] > 10 * std[0]
+
+    model.save(tmp_path / "gp.npz")
+    loaded = GaussianProcessSurrogate.load(tmp_path / "gp.npz")
+    np.testing.assert_allclose(loaded.predict(x)[0], mean)
+    assert loaded.target_names == ["a", "b"]
+
+
+def test_result_targets_interpolates_curves():
+    result = analytic(make_properties())
+    targets = result_targets(result, alphas=(2.1,))
+    assert targets["CL_max"] == result["CL_max"]
+    assert result["CL"][2.0] < targets["CL@2.1"] < result["CL"][2.25]
+    assert design_vector(make_properties()).shape == (15,)
+
+
+def test_evaluator_falls_back_to_avl_when_uncertain():
+    calls = []
+
+    def evaluate(properties):
+        calls.append(properties)
+        return analytic(properties)
+
+    evaluator = SurrogateEvaluator(evaluate, tolerance={"CL_max": 0.01, "CL@4.0": 0.01}, alphas=(4.0,),
+                                   min_samples=12)
+    for semi_span in np.linspace(1.0, 2.0, 6):
+        for chord_tip in (0.6, 0.9):
+            assert evaluator(make_properties(semi_span, chord_tip))["source"] == "avl"
+    assert len(calls) == 12
+
+    inside = evaluator(make_properties(1.45, 0.75))
+    assert inside["source"] == "surrogate"
+    exact = result_targets(analytic(make_properties(1.45, 0.75)), (4.0,))
+    assert inside["CL@4.0"] == pytest.approx(exact["CL@4.0"], abs=0.01)
+
+    outside = evaluator(make_properties(4.0, 0.3))
+    assert outside["source"] == "avl" and outside["std"] is None
+    assert (evaluator.n_surrogate, evaluator.n_avl) == (1, 13)
+
+
+def test_result_targets_outside_sampled_range():
+    result = {"CL_max": 0.6, "alpha_stall": 2.0, "CL": {0.0: 0.2, 2.0: 0.4},
+              "CD": {0.0: 0.01, 2.0: 0.02}, "Cm": {0.0: -0.1, 2.0: -0.12}}
+    targets = result_targets(result, alphas=(1.0, 10.0, -5.0))
+    assert targets["CL@1.0"] == pytest.approx(0.3)
+    assert np.isnan(targets["CL@10.0"]) and np.isnan(targets["Cm@-5.0"])
+
+    stalled = {"CL_max": None, "alpha_stall": None, "CL": {}, "CD": {}, "Cm": {}}
+    targets = result_targets(stalled, alphas=(4.0,))
+    assert all(np.isnan(value) for value in targets.values())
+
+
+def test_surrogate_masks_nan_targets():
+    X = np.linspace(0, 1, 8)[:, None]
+    Y = np.column_stack([X[:, 0], 2 * X[:, 0]])
+    Y[3, 1] = np.nan
+    model = GaussianProcessSurrogate().fit(X, Y, ["a", "b"])
+    assert model.X.shape == (7, 1)
+    assert np.all(np.isfinite(model.predict(np.array([0.5]))[0]))
+
+    stalled = {"CL_max": None, "alpha_stall": None, "CL": {}, "CD": {}, "Cm": {}}
+    evaluator = SurrogateEvaluator(lambda properties: stalled, alphas=(4.0,), min_samples=1)
+    assert np.isnan(evaluator(make_properties())["CL@4.0"])
+    assert evaluator(make_properties())["source"] == "avl"
+    assert evaluator.n_complete == 0
@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_generator import AVLSection, AVLSurface, create_avl_config_from_bezier, write_avl_config
+from MDO_UNESP.avl_output import strip_cl_max
+from MDO_UNESP.avl_runner import get_aero_coef
+from MDO_UNESP.bezier_airfoil import BezierAirfoil, naca_4digits_batch
+from MDO_UNESP.vlm import VortexLattice, camber_slope, get_aero_coef_vlm, spacing
+
+PROPERTIES = {
+    "semi_span": 1.3,
+    "number_of_panels": 9,
+    "chord_root": 1,
+    "chord_tip": 0.8,
+    "thicks": [0.14, 0.12, 0.11, 0.10],
+    "cambers": [0.02, 0.03, 0.025, 0.02],
+    "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+}
+
+
+def rectangular_wing(aspect_ratio, **options):
+    half_span = aspect_ratio / 2
+    sections = [AVLSection(0.0, 0.0, 0.0, 1.0), AVLSection(0.0, half_span, 0.0, 1.0)]
+    surface = AVLSurface("wing", sections, n_chord=8, c_space=1.0, n_span=30, s_space=1.0)
+    return VortexLattice([surface], (aspect_ratio, 1.0, aspect_ratio, 0.0), **options)
+
+
+def test_spacing():
+    for space in (0.0, 1.0, 2.0, -2.0, 1.5, -2.5, 3.0):
+        nodes = spacing(10, space)
+        assert nodes[0] == pytest.approx(0.0) and nodes[-1] == pytest.approx(1.0)
+        assert np.all(np.diff(nodes) > 0)
+    # -seno concentra as faixas na ponta
+    nodes = spacing(10, -2.0)
+    assert np.diff(nodes)[-1] < np.diff(nodes)[0]
+
+
+def test_camber_slope_of_naca_section():
+    points = naca_4digits_batch(np.array([0.04]), np.array([0.4]), np.array([0.12]), npts=100,
+                                spacing="cosine")
+    x = np.array([0.2, 0.3, 0.6, 0.9])
+    expected = np.where(x <= 0.4, 2 * 0.04 / 0.4**2 * (0.4 - x), 2 * 0.04 / 0.6**2 * (0.4 - x))
+    np.testing.assert_allclose(camber_slope(points[0, 0], points[1, 0], x), expected, atol=1e-2)
+
+
+def test_flat_rectangular_wing():
+    lattice = rectangular_wing(6.0)
+    result = lattice.solve([-4.0, 0.0, 4.0])
+    CL_alpha = result["CL"][2] / np.radians(4.0)
+    # Teoria da superfície sustentadora para asa retangular de alongamento 6: ~4.2/rad
+    assert 4.0 < CL_alpha < 4.4
+    assert result["CL"][1] == pytest.approx(0.0, abs=1e-12)
+    assert result["CL"][0] == pytest.approx(-result["CL"][2])
+    assert 0.9 < result["e"][2] < 1.02
+    # Centro de pressão perto de c/4 (Xref no bordo de ataque)
+    assert result["Cm"][2] / result["CL"][2] == pytest.approx(-0.25, abs=0.02)
+
+
+def test_symmetry_images_match_full_span():
+    sections = [AVLSection(0.0, -3.0, 0.0, 1.0), AVLSection(0.0, 3.0, 0.0, 1.0)]
+    surface = AVLSurface("wing", sections, n_chord=8, c_space=1.0, n_span=60, s_space=0.0)
+    full = VortexLattice([surface], (6.0, 1.0, 6.0, 0.0), symmetric=False)
+    half = VortexLattice([surface._replace(sections=[sections[0]._replace(yle=0.0), sections[1]],
+                                           n_span=30)], (6.0, 1.0, 6.0, 0.0))
+    for name in ("CL", "CD", "Cm"):
+        assert half.solve(5.0)[name][0] == pytest.approx(full.solve(5.0)[name][0], rel=1e-9)
+
+
+def test_config_backend_matches_in_memory_geometry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    wing = BezierAirfoil(dict(PROPERTIES))
+    wing.properties["airfoil_files"] = wing.write_airfoil_files("airfoils")
+    create_avl_config_from_bezier("wing.avl", wing)
+
+    from_config = VortexLattice.from_config("wing.avl").solve([0.0, 6.0])
+    from_memory = VortexLattice.from_bezier(wing).solve([0.0, 6.0])
+    # O .avl arredonda a geometria em 4 casas e os .dat em 6
+    np.testing.assert_allclose(from_config["CL"], from_memory["CL"], rtol=1e-3)
+    # Cambra positiva: sustentação em alpha = 0
+    assert from_config["CL"][0] > 0
+
+    CL, CD, Cm = get_aero_coef("wing.avl", 1.0, -4, 20, 1.0, backend="vlm")
+    alphas = list(CL)
+    assert alphas == list(np.arange(-4, 20, 1.0))[:len(alphas)]
+    assert 0 < len(alphas) < 24
+    assert list(CD) == alphas and list(Cm) == alphas
+    result = VortexLattice.from_config("wing.avl").solve(alphas[-1] + 1.0)
+    assert result["strips"]["cl"].max() > 1.0
+
+
+def test_y_duplicate_matches_symmetry():
+    sections = [AVLSection(0.0, 0.0, 0.0, 1.0, 2.0), AVLSection(0.3, 3.0, 0.2, 0.6, -1.0)]
+    surface = AVLSurface("wing", sections, n_chord=8, c_space=1.0, n_span=30, s_space=-2.0)
+    reference = (4.8, 0.8, 6.0, 0.2)
+    symmetric = VortexLattice([surface], reference).solve([0.0, 4.0])
+    duplicated = VortexLattice([surface._replace(y_duplicate=0.0)], reference, symmetric=False).solve([0.0, 4.0])
+    for name in ("CL", "CD", "Cm"):
+        np.testing.assert_allclose(duplicated[name], symmetric[name], rtol=1e-9)
+    assert len(duplicated["strips"]["cl"]) == 2 * len(symmetric["strips"]["cl"])
+
+    with pytest.raises(ValueError):
+        VortexLattice([surface._replace(y_duplicate=0.0)], reference)
+
+
+def test_stall_cut_skips_first_strip_like_avl(tmp_path):
+    # Torção forte na raiz: a faixa 1 tem o maior cl em todos os alphas
+    sections = [AVLSection(0.0, 0.0, 0.0, 1.0, 8.0), AVLSection(0.0, 3.0, 0.0, 1.0, -4.0)]
+    surface = AVLSurface("wing", sections, n_chord=8, c_space=1.0, n_span=12, s_space=0.0)
+    config_file = str(tmp_path / "wing.avl")
+    write_avl_config(config_file, [surface], "wing")
+    alphas = np.arange(0.0, 12.0, 1.0)
+    cl = VortexLattice.from_config(config_file).solve(alphas)["strips"]["cl"]
+    assert np.all(cl[0] > cl[1:].max(axis=0))
+
+    Cl_max_airfoil = cl[1:, 6].max() + 1e-9
+    assert cl[0, 6] > Cl_max_airfoil
+    CL, _, _ = get_aero_coef_vlm(config_file, Cl_max_airfoil, 0.0, 12.0, 1.0)
+    # Corte do caminho do AVL (_run_point): strip_cl_max das faixas de cada alpha
+    stall = next(k for k in range(len(alphas)) if strip_cl_max({"cl": cl[:, k]}) > Cl_max_airfoil)
+    assert list(CL) == list(alphas[:stall])
+    assert stall == 7
+
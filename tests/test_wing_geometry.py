@@ -0,0 +1,79 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from MDO_UNESP.avl_generator import create_avl_config_from_bezier
+from MDO_UNESP.bezier_airfoil import BezierAirfoil
+from MDO_UNESP.wing_geometry import WingGeometry
+
+
+def make_properties(**overrides):
+    properties = {
+        "semi_span": 1.3,
+        "number_of_panels": 25,
+        "chord_root": 1,
+        "chord_tip": 0.8,
+        "thicks": [0.14, 0.12, 0.11, 0.10],
+        "cambers": [0.02, 0.03, 0.025, 0.02],
+        "cambers_pos": [0.40, 0.35, 0.45, 0.40],
+    }
+    properties.update(overrides)
+    return properties
+
+
+def test_geometry_is_compact():
+    geometry = BezierAirfoil(make_properties()).geometry
+    with pytest.raises(AttributeError):
+        geometry.extra = 1
+    assert geometry.spanwise.flags.c_contiguous and geometry.sections.flags.c_contiguous
+    assert np.shares_memory(geometry.xu, geometry.sections)
+    assert np.shares_memory(geometry.leading_edge, geometry.spanwise)
+    # z não é mais uma cópia por seção
+    assert geometry.z.strides[1] == 0
+    assert geometry.nbytes == (9 * 25 + 2 * 25 * 199) * 8
+
+
+def test_properties_view_matches_dict_layout():
+    wing = BezierAirfoil(make_properties())
+    properties = wing.properties
+    assert len(properties) == len(list(properties))
+    assert {"te_y3", "le_y3", "ze_points", "xu_24", "z_0"} <= set(properties)
+    assert "xu_25" not in properties
+    assert properties["le_y3"] == pytest.approx(0.3 + 0.8)
+    np.testing.assert_array_equal(properties["z_3"], np.full(199, properties["span"][3]))
+
+    properties["airfoil_files"] = ["a.dat"] * 25
+    assert wing.geometry.inputs["airfoil_files"] == ["a.dat"] * 25
+    del properties["airfoil_files"]
+    with pytest.raises(KeyError):
+        properties["airfoil_files"]
+
+
+def test_pickle_and_npz_round_trip(tmp_path):
+    wing = BezierAirfoil(make_properties())
+    wing.properties["airfoil_files"] = [f"s{i}.dat" for i in range(25)]
+
+    restored = pickle.loads(pickle.dumps(wing, protocol=5))
+    np.testing.assert_array_equal(restored.xu, wing.xu)
+    np.testing.assert_array_equal(restored.leading_edge, wing.leading_edge)
+    assert restored.properties["airfoil_files"] == wing.properties["airfoil_files"]
+
+    file_name = tmp_path / "wing.npz"
+    wing.geometry.save(file_name)
+    loaded = WingGeometry.load(file_name)
+    np.testing.assert_array_equal(loaded.spanwise, wing.geometry.spanwise)
+    np.testing.assert_array_equal(loaded.sections, wing.geometry.sections)
+    assert loaded.inputs == wing.geometry.inputs
+
+
+def test_avl_config_from_geometry(tmp_path):
+    wing = BezierAirfoil(make_properties(number_of_panels=5))
+    wing.properties["airfoil_files"] = [f"s{i}.dat" for i in range(5)]
+
+    from_wing = tmp_path / "wing.avl"
+    from_geometry = tmp_path / "geometry.avl"
+    create_avl_config_from_bezier(str(from_wing), wing)
+    create_avl_config_from_bezier(str(from_geometry), wing.geometry)
+    assert from_wing.read_text() == from_geometry.read_text()
+    assert from_wing.read_text().count("SECTION") == 5